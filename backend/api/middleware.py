@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from fastapi.responses import JSONResponse
+
+
+class RequestSizeLimitMiddleware:
+    """
+    Reject oversized uploads from the Content-Length header before the
+    multipart body is received and parsed.
+
+    limits maps a path to the largest request body (in bytes) accepted on it.
+    Bodies without a Content-Length are still capped by spool_upload.
+    """
+
+    def __init__(self, app, *, limits: dict[str, int]) -> None:
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "POST":
+            limit = self.limits.get(scope["path"])
+            if limit is not None:
+                length = dict(scope["headers"]).get(b"content-length")
+                if length is not None and length.isdigit() and int(length) > limit:
+                    response = JSONResponse(
+                        status_code=413,
+                        content={"detail": f"File too large (max {limit // (1024 * 1024)}MB)"},
+                    )
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
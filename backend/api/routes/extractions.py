@@ -1,17 +1,48 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import time
 import uuid
-from tempfile import NamedTemporaryFile
+import zipfile
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, List, Type, Union
 
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
+from backend.core.executor import EXECUTOR, ExecutorSaturated
+from backend.core.config import (
+    BATCH_CONCURRENCY,
+    BATCH_MAX_DOCUMENTS,
+    IN_MEMORY_UPLOAD_MAX_MB,
+    JOB_EVENTS_HEARTBEAT_SECONDS,
+    JOB_MAX_WAIT_SECONDS,
+    MAX_UPLOAD_MB,
+)
+from backend.core.document_source import InMemoryDocument
+from backend.core.jobs.queue import JOB_QUEUE, QueueFull
+from backend.core.jobs.runner import run_extraction_job
 from backend.core.jobs.store import JOB_STORE
 from backend.core.llm.factory import get_llm_client
-from backend.core.pipeline.bol_extract import extract_bol_sync
-from backend.schemas.api_models import ExtractionResponse, APIValidation, APIMeta
-from backend.schemas.job_models import JobCreateResponse, JobGetResponse
+from backend.core.pipeline.bol_extract import PIPELINE_CACHE_VERSION, extract_bol_async, extract_packet_async
+from backend.core.pipeline.responses import (
+    is_valid_response,
+    store_in_cache,
+    to_extraction_response,
+    to_packet_response,
+)
+from backend.core.result_cache import RESULT_CACHE, make_cache_key
+from backend.core.uploads import EmptyUpload, UploadTooLarge, discard, read_upload, spool_stream, spool_upload
+from backend.schemas.api_models import BatchItemResult, ExtractionResponse, PacketExtractionResponse
+from backend.schemas.job_models import (
+    BatchCreateResponse,
+    BatchGetResponse,
+    BatchJobStatus,
+    JobCreateResponse,
+    JobGetResponse,
+)
 
 router = APIRouter(prefix="/v1", tags=["extractions"])
 
@@ -23,7 +54,10 @@ ALLOWED_CONTENT_TYPES = {
     "image/jpeg",
 }
 
-MAX_UPLOAD_MB = 10
+ZIP_CONTENT_TYPES = {
+    "application/zip",
+    "application/x-zip-compressed",
+}
 
 
 def _safe_suffix(filename: str | None, content_type: str) -> str:
@@ -33,44 +67,95 @@ def _safe_suffix(filename: str | None, content_type: str) -> str:
     return ".pdf" if content_type == "application/pdf" else ".jpg"
 
 
-def _to_extraction_response(result) -> ExtractionResponse:
-    return ExtractionResponse(
-        status=result.status,
-        job_id=result.job_id,
-        data=result.data,
-        validation=APIValidation(
-            is_valid=result.validation.is_valid,
-            errors=result.validation.errors,
-            warnings=result.validation.warnings,
-        ),
-        meta=APIMeta(
-            request_id=result.meta.request_id,
-            method=result.meta.method,
-            page_count=result.meta.page_count,
-            timings_ms=result.meta.timings_ms,
-        ),
+def _busy(e: ExecutorSaturated | QueueFull) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Server is busy, retry later",
+        headers={"Retry-After": str(e.retry_after_seconds)},
+    )
+
+
+def _cache_key(content_sha256: str, split_packets: bool = False) -> str:
+    return make_cache_key(
+        content_sha256=content_sha256,
+        # A packet response has a different shape from a single-document one
+        schema="bol_v1+packets" if split_packets else "bol_v1",
+        model=LLM.model_name,
+        pipeline_version=PIPELINE_CACHE_VERSION,
     )
 
 
-async def _run_job(job_id: str, schema: str, file_path: str) -> None:
-    await JOB_STORE.set_status(job_id, "running")
+def _cached_response(
+    cache_key: str, model: Type[Union[ExtractionResponse, PacketExtractionResponse]] = ExtractionResponse
+) -> ExtractionResponse | PacketExtractionResponse | None:
+    t0 = time.perf_counter()
+    cached = RESULT_CACHE.get(cache_key)
+    if cached is None:
+        return None
+
+    resp = model.model_validate(cached)
+    resp.meta.request_id = uuid.uuid4().hex
+    resp.meta.timings_ms = {
+        "cache_hit": 1,
+        "cache_lookup_ms": int((time.perf_counter() - t0) * 1000),
+    }
+    return resp
+
+
+async def _run_job(
+    job_id: str,
+    schema: str,
+    file_path: str,
+    cache_key: str | None = None,
+    split_packets: bool = False,
+    page_cache: bool = True,
+) -> None:
+    # The executor slot was reserved by create_extraction before returning 202.
     try:
-        result = extract_bol_sync(schema=schema, file_path=file_path, llm=LLM)
-        resp = _to_extraction_response(result)
-        await JOB_STORE.set_result(job_id, resp.model_dump())
-    except Exception as e:
-        await JOB_STORE.set_error(job_id, str(e))
+        await run_extraction_job(
+            store=JOB_STORE,
+            job_id=job_id,
+            schema=schema,
+            file_path=file_path,
+            llm=LLM,
+            cache_key=cache_key,
+            split_packets=split_packets,
+            page_cache=page_cache,
+        )
     finally:
-        try:
-            os.unlink(file_path)
-        except OSError:
-            pass
+        EXECUTOR.release()
+
+
+async def _respond_from_cache(resp: ExtractionResponse | PacketExtractionResponse, async_mode: bool) -> JSONResponse:
+    if async_mode:
+        # Keep the async contract: the job exists and is already completed.
+        job_id = uuid.uuid4().hex
+        await JOB_STORE.create(job_id)
+        await JOB_STORE.set_result(job_id, resp.model_dump(mode="json"))
+        return JSONResponse(
+            status_code=202,
+            content=JobCreateResponse(job_id=job_id, status="completed").model_dump(),
+            headers={"X-Job-Id": job_id, "X-Cache": "HIT"},
+        )
+
+    return JSONResponse(
+        status_code=200,
+        content=resp.model_dump(mode="json"),
+        headers={"X-Request-Id": resp.meta.request_id, "X-Cache": "HIT"},
+    )
 
 
 @router.post("/extractions", response_model=ExtractionResponse)
 async def create_extraction(
     background_tasks: BackgroundTasks,
     async_mode: bool = Query(False, description="If true, returns 202 + job_id and runs extraction in background"),
+    no_cache: bool = Query(False, description="If true, neither read nor write the result or page cache"),
+    refresh_cache: bool = Query(
+        False, description="If true, drop any cached result for this file and re-extract every page"
+    ),
+    split_packets: bool = Query(
+        False, description="If true, split a multi-shipment PDF and return one result per document"
+    ),
     schema_name: str = Form("bol_v1"),
     file: UploadFile = File(...),
     ):
@@ -80,25 +165,77 @@ async def create_extraction(
     if file.content_type not in ALLOWED_CONTENT_TYPES:
         raise HTTPException(status_code=400, detail="Only PDF, PNG, or JPG images are supported")
 
-    content = await file.read()
-    if not content:
-        raise HTTPException(status_code=400, detail="Empty file")
-
-    if len(content) > MAX_UPLOAD_MB * 1024 * 1024:
-        raise HTTPException(status_code=413, detail="File too large (max 10MB)")
+    max_bytes = MAX_UPLOAD_MB * 1024 * 1024
+    suffix = _safe_suffix(file.filename, file.content_type)
+    # Small sync uploads never touch the disk: the pipeline parses/OCRs the bytes directly.
+    in_memory = (
+        not async_mode
+        and file.size is not None
+        and file.size <= min(IN_MEMORY_UPLOAD_MAX_MB * 1024 * 1024, max_bytes)
+    )
+    try:
+        if in_memory:
+            upload = await read_upload(file, max_bytes=max_bytes)
+        else:
+            upload = await spool_upload(file, suffix=suffix, max_bytes=max_bytes)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except EmptyUpload as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    tmp_path = None
+    tmp_path = None if in_memory else upload.path
+    source = InMemoryDocument(data=upload.data, suffix=suffix) if in_memory else upload.path
+    queued = False
+    # Per-page OCR/LLM reuse; a refresh redoes every page too
+    page_cache = not (no_cache or refresh_cache)
     try:
-        suffix = _safe_suffix(file.filename, file.content_type)
-        with NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
+        cache_key = None
+        if not no_cache:
+            cache_key = _cache_key(upload.sha256, split_packets)
+            if refresh_cache:
+                RESULT_CACHE.invalidate(cache_key)
+            else:
+                cached = _cached_response(
+                    cache_key, PacketExtractionResponse if split_packets else ExtractionResponse
+                )
+                if cached is not None:
+                    return await _respond_from_cache(cached, async_mode)
 
         # ---- ASYNC MODE ----
         if async_mode:
             job_id = uuid.uuid4().hex
-            await JOB_STORE.create(job_id)
-            background_tasks.add_task(_run_job, job_id, "bol_v1", tmp_path)
+            if JOB_QUEUE is not None:
+                # Durable queue: a worker process picks the job up; nothing runs here.
+                await JOB_STORE.create(job_id)
+                try:
+                    await JOB_QUEUE.enqueue(
+                        job_id,
+                        {
+                            "schema": "bol_v1",
+                            "file_path": tmp_path,
+                            "cache_key": cache_key,
+                            "split_packets": split_packets,
+                            "page_cache": page_cache,
+                        },
+                    )
+                except QueueFull as e:
+                    await JOB_STORE.set_error(job_id, "Queue is full")
+                    raise _busy(e)
+            else:
+                try:
+                    EXECUTOR.reserve()
+                except ExecutorSaturated as e:
+                    raise _busy(e)
+                try:
+                    await JOB_STORE.create(job_id)
+                    background_tasks.add_task(
+                        _run_job, job_id, "bol_v1", tmp_path, cache_key, split_packets, page_cache
+                    )
+                except BaseException:
+                    # _run_job won't run, so it can't give the slot back
+                    EXECUTOR.release()
+                    raise
+            queued = True
 
             return JSONResponse(
                 status_code=202,
@@ -107,34 +244,381 @@ async def create_extraction(
             )
 
         # ---- SYNC MODE ----
-        result = extract_bol_sync(schema="bol_v1", file_path=tmp_path, llm=LLM)
-        resp = _to_extraction_response(result)
+        try:
+            EXECUTOR.reserve()
+        except ExecutorSaturated as e:
+            raise _busy(e)
+        try:
+            if split_packets:
+                result = await extract_packet_async(schema="bol_v1", source=source, llm=LLM, page_cache=page_cache)
+                resp = to_packet_response(result)
+            else:
+                result = await extract_bol_async(schema="bol_v1", source=source, llm=LLM, page_cache=page_cache)
+                resp = to_extraction_response(result)
+        finally:
+            EXECUTOR.release()
+        store_in_cache(cache_key, resp)
 
-        status_code = 200 if result.validation.is_valid else 422
+        status_code = 200 if is_valid_response(resp) else 422
         return JSONResponse(
             status_code=status_code,
-            content=resp.model_dump(),
-            headers={"X-Request-Id": result.meta.request_id},
+            content=resp.model_dump(mode="json"),
+            headers={"X-Request-Id": resp.meta.request_id, "X-Cache": "MISS"},
         )
 
     finally:
-        # In async mode, _run_job cleans up the file.
-        if tmp_path and not async_mode:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
+        # Once queued, the job runner cleans up the file.
+        if not queued:
+            discard(tmp_path)
 
 
-@router.get("/extractions/{job_id}", response_model=JobGetResponse)
-async def get_extraction_job(job_id: str):
-    rec = await JOB_STORE.get(job_id)
-    if not rec:
-        raise HTTPException(status_code=404, detail="Job not found")
+# ---- BATCH ----
+
+@dataclass(frozen=True)
+class _BatchDoc:
+    index: int
+    filename: str
+    path: str
+    sha256: str
+
+
+def _is_zip(upload: UploadFile) -> bool:
+    return upload.content_type in ZIP_CONTENT_TYPES or (upload.filename or "").lower().endswith(".zip")
 
+
+async def _expand_batch(uploads: List[UploadFile]) -> List[_BatchDoc]:
+    """
+    Spool every document of a batch to disk (reads and writes on worker threads).
+
+    Uploads are PDFs/images or zip archives of them; zip members are streamed
+    out one by one, and anything that is not a PDF/PNG/JPG is skipped.
+    """
+    docs: List[_BatchDoc] = []
+
+    async def add(src: BinaryIO, suffix: str, filename: str) -> None:
+        if len(docs) >= BATCH_MAX_DOCUMENTS:
+            raise HTTPException(status_code=413, detail=f"Too many documents (max {BATCH_MAX_DOCUMENTS})")
+        try:
+            upload = await spool_stream(src, suffix=suffix, max_bytes=MAX_UPLOAD_MB * 1024 * 1024)
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=f"{filename}: {e}")
+        except EmptyUpload as e:
+            raise HTTPException(status_code=400, detail=f"{filename}: {e}")
+        docs.append(_BatchDoc(index=len(docs), filename=filename, path=upload.path, sha256=upload.sha256))
+
+    try:
+        for upload in uploads:
+            name = upload.filename or "upload"
+            if _is_zip(upload):
+                try:
+                    archive = await asyncio.to_thread(zipfile.ZipFile, upload.file)
+                except zipfile.BadZipFile:
+                    raise HTTPException(status_code=400, detail=f"{name}: not a valid zip archive")
+                with archive:
+                    for info in archive.infolist():
+                        member = os.path.basename(info.filename)
+                        suffix = os.path.splitext(member)[1].lower()
+                        if info.is_dir() or member.startswith(".") or suffix not in {".pdf", ".png", ".jpg", ".jpeg"}:
+                            continue
+                        with archive.open(info) as src:
+                            await add(src, suffix, f"{name}/{info.filename}")
+            elif upload.content_type in ALLOWED_CONTENT_TYPES:
+                await upload.seek(0)
+                await add(upload.file, _safe_suffix(upload.filename, upload.content_type), name)
+            else:
+                raise HTTPException(status_code=400, detail=f"{name}: only PDF, PNG, JPG or zip files are supported")
+    except BaseException:
+        for doc in docs:
+            discard(doc.path)
+        raise
+
+    if not docs:
+        raise HTTPException(status_code=400, detail="No PDF, PNG or JPG documents in batch")
+    return docs
+
+
+async def _extract_document(doc: _BatchDoc, use_cache: bool) -> BatchItemResult:
+    try:
+        cache_key = _cache_key(doc.sha256) if use_cache else None
+        resp = _cached_response(cache_key) if cache_key else None
+        if resp is None:
+            result = await extract_bol_async(schema="bol_v1", file_path=doc.path, llm=LLM, page_cache=use_cache)
+            resp = to_extraction_response(result)
+            store_in_cache(cache_key, resp)
+        return BatchItemResult(index=doc.index, filename=doc.filename, status="completed", result=resp)
+    except Exception as e:
+        return BatchItemResult(index=doc.index, filename=doc.filename, status="failed", error=str(e))
+    finally:
+        discard(doc.path)
+
+
+class _BatchStream:
+    """
+    NDJSON lines of a streamed batch, one per document as soon as it finishes
+    (completion order).
+
+    The batch's executor slots are reserved before the response starts, so
+    they and the spooled files are released exactly once, by whichever comes
+    first: the stream ending or being closed, or close() from the response's
+    background task, which also covers a client that left before the first
+    line (the stream never started, so its own cleanup never runs).
+    """
+
+    def __init__(self, docs: List[_BatchDoc], use_cache: bool, slots: int) -> None:
+        self.docs = docs
+        self.use_cache = use_cache
+        self.slots = slots
+        self.lines = self._lines()
+        self._released = False
+
+    async def _lines(self) -> AsyncIterator[str]:
+        limit = asyncio.Semaphore(self.slots)
+
+        async def run(doc: _BatchDoc) -> BatchItemResult:
+            async with limit:
+                return await _extract_document(doc, self.use_cache)
+
+        tasks = [asyncio.create_task(run(doc)) for doc in self.docs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                yield item.model_dump_json() + "\n"
+        finally:
+            # Client went away or we're done: stop pending work and drop leftover files.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._release()
+
+    def _release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        EXECUTOR.release(self.slots)
+        for doc in self.docs:
+            discard(doc.path)
+
+    async def close(self) -> None:
+        await self.lines.aclose()
+        self._release()
+
+
+async def _run_batch(docs: List[_BatchDoc], job_ids: List[str], cache_keys: List[str | None], slots: int) -> None:
+    # The executor slots were reserved by create_batch_extraction before returning 202.
+    limit = asyncio.Semaphore(slots)
+
+    async def run(doc: _BatchDoc, job_id: str, cache_key: str | None) -> None:
+        async with limit:
+            await run_extraction_job(
+                store=JOB_STORE, job_id=job_id, schema="bol_v1", file_path=doc.path, llm=LLM, cache_key=cache_key
+            )
+
+    try:
+        await asyncio.gather(*(run(*args) for args in zip(docs, job_ids, cache_keys)))
+    finally:
+        EXECUTOR.release(slots)
+
+
+async def _create_batch_jobs(
+    docs: List[_BatchDoc], use_cache: bool, background_tasks: BackgroundTasks
+) -> JSONResponse:
+    batch_id = uuid.uuid4().hex
+    job_ids = [uuid.uuid4().hex for _ in docs]
+    for job_id in job_ids:
+        await JOB_STORE.create(job_id)
+    await JOB_STORE.create_batch(batch_id, [(job_id, doc.filename) for job_id, doc in zip(job_ids, docs)])
+
+    # Cache hits complete right away; only misses are scheduled.
+    pending: list[tuple[_BatchDoc, str, str | None]] = []
+    for doc, job_id in zip(docs, job_ids):
+        cache_key = _cache_key(doc.sha256) if use_cache else None
+        cached = _cached_response(cache_key) if cache_key else None
+        if cached is not None:
+            await JOB_STORE.set_result(job_id, cached.model_dump(mode="json"))
+            discard(doc.path)
+        else:
+            pending.append((doc, job_id, cache_key))
+
+    try:
+        if pending and JOB_QUEUE is not None:
+            await JOB_QUEUE.enqueue_many(
+                [(job_id, {"schema": "bol_v1", "file_path": doc.path, "cache_key": key}) for doc, job_id, key in pending]
+            )
+        elif pending:
+            slots = min(BATCH_CONCURRENCY, len(pending))
+            EXECUTOR.reserve_many(slots)
+            background_tasks.add_task(
+                _run_batch,
+                [doc for doc, _, _ in pending],
+                [job_id for _, job_id, _ in pending],
+                [key for _, _, key in pending],
+                slots,
+            )
+    except (ExecutorSaturated, QueueFull) as e:
+        for doc, job_id, _ in pending:
+            await JOB_STORE.set_error(job_id, "Server is busy")
+            discard(doc.path)
+        raise _busy(e)
+
+    return JSONResponse(
+        status_code=202,
+        content=BatchCreateResponse(
+            batch_id=batch_id,
+            status="queued" if pending else "completed",
+            total=len(docs),
+            job_ids=job_ids,
+        ).model_dump(),
+        headers={"X-Batch-Id": batch_id},
+    )
+
+
+@router.post("/extractions/batch")
+async def create_batch_extraction(
+    background_tasks: BackgroundTasks,
+    async_mode: bool = Query(False, description="If true, returns 202 + batch_id; poll /v1/extractions/batches/{batch_id}"),
+    no_cache: bool = Query(False, description="If true, neither read nor write the result cache"),
+    schema_name: str = Form("bol_v1"),
+    files: List[UploadFile] = File(..., description="PDF/PNG/JPG files and/or zip archives of them"),
+    ):
+    """
+    Extract many documents in one request.
+
+    By default the response is NDJSON (application/x-ndjson): one BatchItemResult
+    line per document, written as soon as that document finishes, so order
+    follows completion, not upload (use `index`). Up to BATCH_CONCURRENCY
+    documents of the batch are in the pipeline at once.
+    """
+    if schema_name != "bol_v1":
+        raise HTTPException(status_code=400, detail="Unsupported schema")
+
+    docs = await _expand_batch(files)
+    use_cache = not no_cache
+
+    if async_mode:
+        return await _create_batch_jobs(docs, use_cache, background_tasks)
+
+    slots = min(BATCH_CONCURRENCY, len(docs))
+    try:
+        EXECUTOR.reserve_many(slots)
+    except ExecutorSaturated as e:
+        for doc in docs:
+            discard(doc.path)
+        raise _busy(e)
+
+    stream = _BatchStream(docs, use_cache, slots)
+    return StreamingResponse(
+        stream.lines,
+        media_type="application/x-ndjson",
+        headers={"X-Batch-Size": str(len(docs))},
+        background=BackgroundTask(stream.close),
+    )
+
+
+@router.get("/extractions/batches/{batch_id}", response_model=BatchGetResponse)
+async def get_batch_extraction(batch_id: str):
+    batch = await JOB_STORE.get_batch(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    counts = {"queued": 0, "running": 0, "completed": 0, "failed": 0, "expired": 0}
+    for item in batch.items:
+        counts[item.status or "expired"] += 1
+
+    total = len(batch.items)
+    finished = counts["completed"] + counts["failed"] + counts["expired"]
+    if finished == total:
+        status = "completed"
+    elif counts["queued"] == total:
+        status = "queued"
+    else:
+        status = "running"
+
+    return BatchGetResponse(
+        batch_id=batch.batch_id,
+        status=status,
+        total=total,
+        counts=counts,
+        progress=round(finished / total, 3) if total else 1.0,
+        jobs=[BatchJobStatus(job_id=i.job_id, filename=i.filename, status=i.status) for i in batch.items],
+    )
+
+
+_TERMINAL_STATUSES = ("completed", "failed")
+
+
+def _job_response(rec) -> JobGetResponse:
     return JobGetResponse(
         job_id=rec.job_id,
         status=rec.status,
         result=rec.result,
         error=rec.error,
     )
+
+
+@router.get("/extractions/{job_id}", response_model=JobGetResponse)
+async def get_extraction_job(
+    job_id: str,
+    wait: float = Query(
+        0,
+        ge=0,
+        description=f"Long-poll: hold the request up to this many seconds (max {JOB_MAX_WAIT_SECONDS}) "
+        "until the job completes or fails",
+    ),
+):
+    rec = await JOB_STORE.get(job_id)
+    if not rec:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if wait > 0:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + min(wait, JOB_MAX_WAIT_SECONDS)
+        while rec.status not in _TERMINAL_STATUSES:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            latest = await JOB_STORE.wait_for(job_id, known_status=rec.status, timeout=remaining)
+            if latest is None:
+                raise HTTPException(status_code=404, detail="Job not found")
+            rec = latest
+
+    return _job_response(rec)
+
+
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def _job_events(job_id: str, rec) -> AsyncIterator[str]:
+    """One event per status change (named after the status); ends after completed/failed."""
+    while True:
+        yield _sse(rec.status, _job_response(rec).model_dump_json())
+        if rec.status in _TERMINAL_STATUSES:
+            return
+
+        status = rec.status
+        while rec is not None and rec.status == status:
+            rec = await JOB_STORE.wait_for(job_id, known_status=status, timeout=JOB_EVENTS_HEARTBEAT_SECONDS)
+            if rec is not None and rec.status == status:
+                yield ": keep-alive\n\n"
+
+        if rec is None:
+            yield _sse("error", '{"detail": "Job not found"}')
+            return
+
+
+@router.get("/extractions/{job_id}/events")
+async def stream_extraction_job(job_id: str):
+    """
+    Server-Sent Events for one job: a `queued`/`running` event on each status
+    change, then a final `completed` or `failed` event carrying the same body
+    as GET /v1/extractions/{job_id}.
+    """
+    rec = await JOB_STORE.get(job_id)
+    if not rec:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return StreamingResponse(
+        _job_events(job_id, rec),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -12,11 +12,163 @@ def _int_env(name: str, default: int) -> int:
         return default
 
 
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
 # ---- LLM config ----
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 USE_MOCK_LLM = os.getenv("USE_MOCK_LLM", "1") == "1"
 
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# Comma-separated models tried cheapest first, e.g. "gpt-4o-mini,gpt-4o" (empty = OPENAI_MODEL only).
+# A tier's answer is kept unless it fails BolV1 validation or its confidence is below the threshold
+LLM_CASCADE_MODELS = tuple(m.strip() for m in os.getenv("LLM_CASCADE_MODELS", "").split(",") if m.strip())
+LLM_CASCADE_MIN_CONFIDENCE = _float_env("LLM_CASCADE_MIN_CONFIDENCE", 0.7)
+
+# Async OpenAI calls in flight per process, and pooled HTTP connections behind them
+OPENAI_MAX_CONCURRENCY = _int_env("OPENAI_MAX_CONCURRENCY", 64)
+OPENAI_MAX_CONNECTIONS = _int_env("OPENAI_MAX_CONNECTIONS", 64)
+
 
 # ---- Job / async config ----
 JOB_TTL_SECONDS = _int_env("JOB_TTL_SECONDS", 60)
+# "memory" (single process) or "sqlite" (shared by all processes on the host)
+JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "memory").strip().lower()
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "jobs.sqlite")
+JOB_SWEEP_INTERVAL_SECONDS = _int_env("JOB_SWEEP_INTERVAL_SECONDS", 5)
+# Longest ?wait= long-poll on GET /v1/extractions/{job_id}
+JOB_MAX_WAIT_SECONDS = _int_env("JOB_MAX_WAIT_SECONDS", 30)
+# Keep-alive comment interval on /v1/extractions/{job_id}/events
+JOB_EVENTS_HEARTBEAT_SECONDS = _int_env("JOB_EVENTS_HEARTBEAT_SECONDS", 15)
+# In-memory store bounds; least recently used finished jobs are evicted beyond them (0 = unbounded)
+JOB_MAX_ENTRIES = _int_env("JOB_MAX_ENTRIES", 10_000)
+JOB_MAX_RESULT_MB = _int_env("JOB_MAX_RESULT_MB", 256)
+
+
+# ---- Job queue ----
+# "background" runs async jobs inside the API process; "sqlite" only enqueues them
+# for `python -m backend.worker` processes (requires JOB_STORE_BACKEND=sqlite)
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "background").strip().lower()
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "queue.sqlite")
+# A worker that stops renewing its lease for this long is presumed dead; the job is retried
+JOB_QUEUE_LEASE_SECONDS = _int_env("JOB_QUEUE_LEASE_SECONDS", 60)
+JOB_QUEUE_MAX_ATTEMPTS = _int_env("JOB_QUEUE_MAX_ATTEMPTS", 3)
+# Jobs allowed to wait in the queue before uploads get 503 (0 = unbounded)
+JOB_QUEUE_MAX_PENDING = _int_env("JOB_QUEUE_MAX_PENDING", 1000)
+
+
+# ---- Uploads ----
+# Largest accepted document; uploads are streamed to disk, so this costs no memory
+MAX_UPLOAD_MB = _int_env("MAX_UPLOAD_MB", 10)
+# Sync uploads up to this size are processed straight from memory, with no spool file (0 = always spool)
+IN_MEMORY_UPLOAD_MAX_MB = _int_env("IN_MEMORY_UPLOAD_MAX_MB", 2)
+# Directory uploads are spooled to (empty = system temp dir; a tmpfs mount avoids disk I/O).
+# With JOB_QUEUE_BACKEND=sqlite it must be visible to every worker process
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", "")
+
+
+# ---- Pipeline executor ----
+# Threads for I/O-bound work (LLM calls, PDF parsing)
+PIPELINE_IO_WORKERS = _int_env("PIPELINE_IO_WORKERS", 8)
+# Processes for CPU-bound work (OCR); 0 runs it inline in the calling thread
+PIPELINE_CPU_WORKERS = _int_env("PIPELINE_CPU_WORKERS", os.cpu_count() or 1)
+# Recycle each OCR process after this many pages to contain Tesseract memory growth
+PIPELINE_CPU_MAX_TASKS_PER_CHILD = _int_env("PIPELINE_CPU_MAX_TASKS_PER_CHILD", 50)
+# Runs allowed to wait for a free thread before new requests are rejected
+PIPELINE_MAX_QUEUE = _int_env("PIPELINE_MAX_QUEUE", 32)
+PIPELINE_RETRY_AFTER_SECONDS = _int_env("PIPELINE_RETRY_AFTER_SECONDS", 5)
+
+
+# ---- Batch extraction ----
+# Documents per batch (files plus zip members)
+BATCH_MAX_DOCUMENTS = _int_env("BATCH_MAX_DOCUMENTS", 500)
+# Documents of one batch in the pipeline at once
+BATCH_CONCURRENCY = _int_env("BATCH_CONCURRENCY", PIPELINE_IO_WORKERS)
+
+
+# ---- Result cache ----
+# In-memory LRU tier, bounded by serialized size (0 disables it)
+RESULT_CACHE_MAX_MB = _int_env("RESULT_CACHE_MAX_MB", 64)
+# Optional SQLite file for a persistent tier (empty = memory only)
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "")
+RESULT_CACHE_TTL_SECONDS = _int_env("RESULT_CACHE_TTL_SECONDS", 7 * 24 * 3600)
+
+
+# ---- Page cache ----
+# OCR text per PDF page and LLM answers per page group, keyed by page content, so a
+# corrected resubmission only redoes the pages that changed
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "1") == "1"
+PAGE_CACHE_MAX_MB = _int_env("PAGE_CACHE_MAX_MB", 32)
+# SQLite file for the persistent tier (defaults to RESULT_CACHE_PATH, in its own table; empty = memory only)
+PAGE_CACHE_PATH = os.getenv("PAGE_CACHE_PATH", RESULT_CACHE_PATH)
+
+
+# ---- OCR fallback ----
+# PDF pages whose text layer scores below this (0..1) or has fewer chars are OCR'd
+PAGE_QUALITY_THRESHOLD = _float_env("PAGE_QUALITY_THRESHOLD", 0.6)
+PAGE_QUALITY_MIN_CHARS = _int_env("PAGE_QUALITY_MIN_CHARS", 40)
+# "tesserocr" keeps initialized Tesseract handles in-process, "pytesseract" runs the tesseract
+# binary per page, "auto" uses tesserocr when it loads and falls back to pytesseract
+OCR_ENGINE = os.getenv("OCR_ENGINE", "auto").strip().lower()
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+# Tesseract handles per process (tesserocr only); callers beyond this wait for a free one
+OCR_ENGINE_POOL_SIZE = _int_env("OCR_ENGINE_POOL_SIZE", 2)
+# Grayscale, binarize, deskew, crop and downscale every image before OCR (see backend.core.ocr_preprocess)
+OCR_PREPROCESS = os.getenv("OCR_PREPROCESS", "1") == "1"
+# Images whose text x-height is well above this many pixels are downscaled to it
+OCR_TARGET_X_HEIGHT_PX = _int_env("OCR_TARGET_X_HEIGHT_PX", 24)
+# Render each PDF page at the lowest DPI on the ladder that makes its text legible: a low-DPI probe
+# estimates glyph size, and pages whose OCR confidence (0..100) stays below the minimum are retried one
+# step higher. OCR_DEFAULT_DPI is used when this is off or the probe finds no text lines
+OCR_ADAPTIVE_DPI = os.getenv("OCR_ADAPTIVE_DPI", "1") == "1"
+OCR_DEFAULT_DPI = _int_env("OCR_DEFAULT_DPI", 300)
+OCR_DPI_LADDER = tuple(
+    sorted({int(d) for d in os.getenv("OCR_DPI_LADDER", "150,200,250,300,400,600").split(",") if d.strip().isdigit()})
+) or (OCR_DEFAULT_DPI,)
+# x-height (pixels) the planned DPI should give the page's text
+OCR_PLAN_X_HEIGHT_PX = _int_env("OCR_PLAN_X_HEIGHT_PX", 18)
+OCR_MIN_CONFIDENCE = _float_env("OCR_MIN_CONFIDENCE", 70.0)
+OCR_DPI_MAX_RETRIES = _int_env("OCR_DPI_MAX_RETRIES", 1)
+
+
+# ---- Form mapping ----
+# JSON form template (or a directory of them) mapping AcroForm widgets straight to BolV1 fields;
+# documents a template fully resolves skip the LLM (see backend.core.form_mapping)
+FORM_TEMPLATES_PATH = os.getenv("FORM_TEMPLATES_PATH", "")
+
+
+# ---- Layout templates ----
+# JSON layout template (or a directory of them) for known printed/scanned carrier forms: a page whose
+# fingerprint matches has only its field zones read and mapped to BolV1 (see backend.core.layout_templates)
+LAYOUT_TEMPLATES_PATH = os.getenv("LAYOUT_TEMPLATES_PATH", "")
+# Render resolution for zones without a text layer
+LAYOUT_ZONE_DPI = _int_env("LAYOUT_ZONE_DPI", 300)
+
+
+# ---- Rule pre-extraction ----
+# Pattern rules fill identifiers, dates and locations before the LLM runs (see backend.core.rules)
+RULES_ENABLED = os.getenv("RULES_ENABLED", "1") == "1"
+# Rule values below this confidence (0..1) are left to the LLM
+RULES_MIN_CONFIDENCE = _float_env("RULES_MIN_CONFIDENCE", 0.8)
+# Comma-separated BolV1 fields; when rules cover all of them the LLM is skipped (empty = always call it)
+RULES_REQUIRED_FIELDS = tuple(f.strip() for f in os.getenv("RULES_REQUIRED_FIELDS", "").split(",") if f.strip())
+
+
+# ---- Prompt compaction ----
+# Normalize, dedupe and strip boilerplate from document text before the LLM call
+PROMPT_COMPACTION_ENABLED = os.getenv("PROMPT_COMPACTION_ENABLED", "1") == "1"
+# Token budget for the document text in the prompt; least relevant blocks (possibly line item
+# rows) are dropped beyond it, with a validation warning (0 = unbounded)
+PROMPT_MAX_TOKENS = _int_env("PROMPT_MAX_TOKENS", 0)
+
+
+# ---- Chunked extraction ----
+# Documents with at least this many pages are extracted as page groups in parallel:
+# header fields from the first group, line items from every group (0 = never chunk)
+CHUNKED_MIN_PAGES = _int_env("CHUNKED_MIN_PAGES", 6)
+CHUNK_PAGES = _int_env("CHUNK_PAGES", 3)
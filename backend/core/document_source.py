@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Union
+
+import fitz
+from PIL import Image
+
+
+@dataclass(frozen=True)
+class InMemoryDocument:
+    """An uploaded document held in memory; suffix (".pdf", ".png", ...) stands in for the filename."""
+    data: Union[bytes, bytearray, memoryview]
+    suffix: str
+
+
+# Everything the pipeline accepts: a file path, or the bytes themselves
+DocumentSource = Union[str, InMemoryDocument]
+
+
+def source_suffix(source: DocumentSource) -> str:
+    if isinstance(source, InMemoryDocument):
+        return source.suffix.lower()
+    return Path(source).suffix.lower()
+
+
+def open_pdf(source: DocumentSource) -> fitz.Document:
+    if isinstance(source, InMemoryDocument):
+        return fitz.open(stream=source.data, filetype="pdf")
+    return fitz.open(source)
+
+
+def open_image(source: DocumentSource) -> Image.Image:
+    if isinstance(source, InMemoryDocument):
+        return Image.open(io.BytesIO(source.data))
+    return Image.open(source)
+
+
+def for_worker_process(source: DocumentSource) -> DocumentSource:
+    """A copy of source that can be pickled to an OCR process (memoryviews can't)."""
+    if isinstance(source, InMemoryDocument) and not isinstance(source.data, bytes):
+        return InMemoryDocument(data=bytes(source.data), suffix=source.suffix)
+    return source
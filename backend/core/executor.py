@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Iterable, List, Optional
+
+from backend.core.config import (
+    PIPELINE_CPU_MAX_TASKS_PER_CHILD,
+    PIPELINE_CPU_WORKERS,
+    PIPELINE_IO_WORKERS,
+    PIPELINE_MAX_QUEUE,
+    PIPELINE_RETRY_AFTER_SECONDS,
+)
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when the pipeline queue is full; the caller should retry later."""
+
+    def __init__(self, retry_after_seconds: int) -> None:
+        super().__init__("Pipeline queue is full")
+        self.retry_after_seconds = retry_after_seconds
+
+
+class PipelineExecutor:
+    """
+    Runs blocking pipeline work off the event loop.
+
+    - I/O-bound work (PDF parsing, sync LLM calls) runs on a thread pool.
+    - CPU-bound work (OCR) runs on a process pool, or inline when cpu_workers=0.
+      Worker processes are recycled after max_tasks_per_child tasks.
+    - Admission control: at most io_workers + max_queue runs are accepted at
+      once. Beyond that, reserve() raises ExecutorSaturated instead of letting
+      the backlog grow without bound.
+
+    Pools are created lazily so importing this module stays cheap.
+    """
+
+    def __init__(
+        self,
+        *,
+        io_workers: int,
+        cpu_workers: int,
+        max_queue: int,
+        retry_after_seconds: int,
+        max_tasks_per_child: Optional[int] = None,
+    ) -> None:
+        self._io_workers = max(1, io_workers)
+        self._cpu_workers = max(0, cpu_workers)
+        self._max_tasks_per_child = max_tasks_per_child or None
+        self._capacity = self._io_workers + max(0, max_queue)
+        self._retry_after_seconds = retry_after_seconds
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._cpu_pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def reserve(self) -> None:
+        """Claim a slot for one pipeline run, or raise ExecutorSaturated."""
+        with self._lock:
+            if self._in_flight >= self._capacity:
+                raise ExecutorSaturated(self._retry_after_seconds)
+            self._in_flight += 1
+
+    def reserve_many(self, n: int) -> None:
+        """Claim n slots at once (all or none), e.g. for a batch's concurrent runs."""
+        with self._lock:
+            if self._in_flight + n > self._capacity:
+                raise ExecutorSaturated(self._retry_after_seconds)
+            self._in_flight += n
+
+    def release(self, n: int = 1) -> None:
+        """Give back slots claimed with reserve()/reserve_many() once the runs have finished."""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - n)
+
+    def _io(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(
+                    max_workers=self._io_workers,
+                    thread_name_prefix="pipeline-io",
+                )
+            return self._io_pool
+
+    def _cpu(self) -> Optional[ProcessPoolExecutor]:
+        if self._cpu_workers == 0:
+            return None
+        with self._lock:
+            if self._cpu_pool is None:
+                # spawn: forking a process that runs an event loop + threads is unsafe
+                self._cpu_pool = ProcessPoolExecutor(
+                    max_workers=self._cpu_workers,
+                    mp_context=get_context("spawn"),
+                    max_tasks_per_child=self._max_tasks_per_child,
+                )
+            return self._cpu_pool
+
+    async def run_io(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking call on the I/O thread pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io(), functools.partial(fn, *args, **kwargs))
+
+    def run_cpu(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """
+        Blocking call that runs fn on the process pool.
+
+        Meant to be called from pipeline code already running on the I/O pool.
+        fn and its arguments must be picklable.
+        """
+        pool = self._cpu()
+        if pool is None:
+            return fn(*args, **kwargs)
+        return pool.submit(fn, *args, **kwargs).result()
+
+    def map_cpu(self, fn: Callable[..., Any], arg_tuples: Iterable[tuple]) -> List[Any]:
+        """
+        Blocking fan-out of fn(*args) over the process pool.
+
+        Results come back in input order regardless of completion order.
+        """
+        pool = self._cpu()
+        if pool is None:
+            return [fn(*args) for args in arg_tuples]
+        futures = [pool.submit(fn, *args) for args in arg_tuples]
+        return [f.result() for f in futures]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            io_pool, self._io_pool = self._io_pool, None
+            cpu_pool, self._cpu_pool = self._cpu_pool, None
+        if io_pool is not None:
+            io_pool.shutdown(wait=False, cancel_futures=True)
+        if cpu_pool is not None:
+            cpu_pool.shutdown(wait=False, cancel_futures=True)
+
+
+EXECUTOR = PipelineExecutor(
+    io_workers=PIPELINE_IO_WORKERS,
+    cpu_workers=PIPELINE_CPU_WORKERS,
+    max_queue=PIPELINE_MAX_QUEUE,
+    retry_after_seconds=PIPELINE_RETRY_AFTER_SECONDS,
+    max_tasks_per_child=PIPELINE_CPU_MAX_TASKS_PER_CHILD,
+)
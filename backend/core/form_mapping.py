@@ -0,0 +1,255 @@
+"""
+Deterministic AcroForm -> BolV1 mapping.
+
+A form template is a JSON file:
+
+    {
+      "name": "acme_bol_2023",
+      "fingerprint": ["BOL_NO", "SHIP_FROM_NAME", "SHIP_TO_NAME", "CARRIER"],
+      "min_match": 0.8,                 # share of fingerprint fields that must be present
+      "required": ["bol_number"],       # must resolve to skip the LLM (default: bol_number)
+      "llm_fields": [],                 # always left to the LLM (e.g. free-text areas)
+      "confidence": 0.95,
+      "fields": {
+        "bol_number": "BOL_NO",
+        "shipper.name": "SHIP_FROM_NAME",
+        "shipper.address": {"fields": ["SHIP_FROM_ADDR1", "SHIP_FROM_ADDR2"], "join": ", "},
+        "shipment_date": {"fields": ["SHIP_DATE"], "type": "date", "formats": ["%m/%d/%Y"]},
+        "total_weight_lb": {"fields": ["TOTAL_WT"], "type": "float"},
+        "po_numbers": {"fields": ["PO1", "PO2", "PO3"], "list": true},
+        "line_items": {"rows": [
+          {"description": "DESC_1", "pieces": {"fields": ["PCS_1"], "type": "int"}},
+          {"description": "DESC_2", "pieces": {"fields": ["PCS_2"], "type": "int"}}
+        ]}
+      }
+    }
+
+A field spec is a widget name, a list of names (joined with a space), or an
+object with fields / join / type (str|int|float|date) / formats / list.
+Targets are BolV1 paths ("carrier_name", "consignee.name", "origin.postal_code").
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, TypeVar
+
+from pydantic import ValidationError
+
+from backend.core.config import FORM_TEMPLATES_PATH
+from backend.schemas.bol_v1 import BolV1
+
+
+_DEFAULT_DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d", "%m-%d-%Y", "%d-%b-%Y")
+_NUMBER_RE = re.compile(r"-?\d[\d,]*(?:\.\d+)?|-?\.\d+")
+_EMPTY_VALUES = {"", "off", "n/a", "na", "none", "-"}
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class FormTemplate:
+    name: str
+    fingerprint: FrozenSet[str]
+    fields: Dict[str, Any]
+    min_match: float = 0.8
+    required: Tuple[str, ...] = ("bol_number",)
+    llm_fields: Tuple[str, ...] = ()
+    confidence: float = 0.95
+
+
+@dataclass(frozen=True)
+class FormMapping:
+    template: str
+    values: Dict[str, Any]  # BolV1-shaped, only resolved fields
+    resolved: List[str]  # target paths that got a value
+    unresolved: List[str]  # target paths left for the LLM
+
+    @property
+    def complete(self) -> bool:
+        return not self.unresolved
+
+
+def _template_from_dict(raw: Dict[str, Any]) -> FormTemplate:
+    try:
+        return FormTemplate(
+            name=str(raw["name"]),
+            fingerprint=frozenset(raw["fingerprint"]),
+            fields=dict(raw["fields"]),
+            min_match=float(raw.get("min_match", 0.8)),
+            required=tuple(raw.get("required", ("bol_number",))),
+            llm_fields=tuple(raw.get("llm_fields", ())),
+            confidence=float(raw.get("confidence", 0.95)),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid form template {raw.get('name', '?')!r}: {e}") from e
+
+
+def load_templates(path: str, parse: Callable[[Dict[str, Any]], T] = _template_from_dict) -> List[T]:
+    """Load templates from a JSON file (one template or a list) or a directory of them."""
+    if not path:
+        return []
+    p = Path(path)
+    files = sorted(p.glob("*.json")) if p.is_dir() else [p]
+
+    templates: List[T] = []
+    for f in files:
+        raw = json.loads(f.read_text(encoding="utf-8"))
+        for item in raw if isinstance(raw, list) else [raw]:
+            templates.append(parse(item))
+    return templates
+
+
+def _clean(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    value = " ".join(str(value).split())
+    return None if value.lower() in _EMPTY_VALUES else value
+
+
+def _convert(value: str, kind: str, formats: Tuple[str, ...]) -> Any:
+    if kind == "str":
+        return value
+    if kind in ("int", "float"):
+        m = _NUMBER_RE.search(value)
+        if not m:
+            return None
+        number = float(m.group().replace(",", ""))
+        return int(number) if kind == "int" else number
+    if kind == "date":
+        for fmt in formats:
+            try:
+                return datetime.strptime(value, fmt).date().isoformat()
+            except ValueError:
+                continue
+        return None
+    raise ValueError(f"Unknown field type: {kind}")
+
+
+def _resolve(spec: Any, form_fields: Dict[str, str]) -> Any:
+    if isinstance(spec, str):
+        spec = {"fields": [spec]}
+    elif isinstance(spec, list):
+        spec = {"fields": spec}
+
+    kind = spec.get("type", "str")
+    formats = tuple(spec.get("formats", _DEFAULT_DATE_FORMATS))
+    values = [v for v in (_clean(form_fields.get(name)) for name in spec["fields"]) if v]
+
+    if spec.get("list"):
+        converted = [_convert(v, kind, formats) for v in values]
+        return [v for v in converted if v is not None] or None
+    if not values:
+        return None
+    return _convert(spec.get("join", " ").join(values), kind, formats)
+
+
+def _set_path(target: Dict[str, Any], path: str, value: Any) -> None:
+    head, _, rest = path.partition(".")
+    if rest:
+        _set_path(target.setdefault(head, {}), rest, value)
+    else:
+        target[head] = value
+
+
+def apply_template(template: FormTemplate, form_fields: Dict[str, str]) -> FormMapping:
+    values: Dict[str, Any] = {}
+    resolved: List[str] = []
+
+    for path, spec in template.fields.items():
+        if isinstance(spec, dict) and "rows" in spec:
+            rows = []
+            for row in spec["rows"]:
+                item = {col: _resolve(col_spec, form_fields) for col, col_spec in row.items()}
+                if item.get("description"):  # LineItem requires one
+                    rows.append(item)
+            value = rows or None
+        else:
+            value = _resolve(spec, form_fields)
+
+        if value is not None:
+            _set_path(values, path, value)
+            resolved.append(path)
+
+    # A party without a name is not a valid Party; leave it to the LLM instead
+    for party in ("shipper", "consignee"):
+        if party in values and not values[party].get("name"):
+            del values[party]
+            resolved = [p for p in resolved if not p.startswith(party + ".")]
+
+    def is_resolved(path: str) -> bool:
+        return any(r == path or r.startswith(path + ".") for r in resolved)
+
+    unresolved = [p for p in template.required if not is_resolved(p)]
+    unresolved += [p for p in template.llm_fields if p not in unresolved]
+
+    if unresolved:
+        return FormMapping(template=template.name, values=values, resolved=resolved, unresolved=unresolved)
+
+    complete = {"document_type": "BOL", "warnings": [], **values, "confidence": template.confidence}
+    try:
+        BolV1.model_validate(complete)
+    except ValidationError as e:
+        # Hand fields with unusable widget values (e.g. a freight class of "72") to the LLM
+        bad = sorted({str(err["loc"][0]) for err in e.errors() if err["loc"]})
+        return FormMapping(
+            template=template.name,
+            values={k: v for k, v in values.items() if k not in bad},
+            resolved=[r for r in resolved if r.split(".")[0] not in bad],
+            unresolved=bad,
+        )
+    return FormMapping(template=template.name, values=complete, resolved=resolved, unresolved=[])
+
+
+class FormTemplateRegistry:
+    """Picks the template whose fingerprint best matches a form's field names."""
+
+    def __init__(self, templates: List[FormTemplate]) -> None:
+        self._templates = list(templates)
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def match(self, field_names: FrozenSet[str]) -> Optional[FormTemplate]:
+        best: Optional[FormTemplate] = None
+        best_score = 0.0
+        for t in self._templates:
+            if not t.fingerprint:
+                continue
+            score = len(t.fingerprint & field_names) / len(t.fingerprint)
+            if score >= t.min_match and score > best_score:
+                best, best_score = t, score
+        return best
+
+    def map_form(
+        self, form_fields: Dict[str, str], field_names: Optional[List[str]] = None
+    ) -> Optional[FormMapping]:
+        """
+        Map widget values with the matching template; None if no template matches.
+
+        field_names lists every widget on the form, filled or not, so blank
+        fields still count towards the fingerprint.
+        """
+        if not form_fields or not self._templates:
+            return None
+        template = self.match(frozenset(field_names or ()) | frozenset(form_fields))
+        if template is None:
+            return None
+        return apply_template(template, form_fields)
+
+
+def merge_mapped(llm_json: Dict[str, Any], mapped: Dict[str, Any]) -> Dict[str, Any]:
+    """LLM output with every form-mapped value laid over it (widget values win)."""
+    merged = dict(llm_json)
+    for key, value in mapped.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_mapped(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+FORM_TEMPLATES = FormTemplateRegistry(load_templates(FORM_TEMPLATES_PATH))
@@ -14,3 +14,16 @@ class JobRecord:
     error: Optional[str] = None
     created_at: float = 0.0
     updated_at: float = 0.0
+
+
+@dataclass
+class BatchItem:
+    job_id: str
+    filename: str
+    status: Optional[JobStatus] = None  # None once the job has expired
+
+
+@dataclass
+class BatchRecord:
+    batch_id: str
+    items: list[BatchItem]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+
+
+class JobNotifier:
+    """
+    Per-job asyncio events, set whenever the job changes in this process.
+
+    An event only exists while someone waits on it, so jobs nobody watches
+    cost nothing. notify() wakes every current waiter at once.
+    """
+
+    def __init__(self) -> None:
+        self._events: dict[str, tuple[asyncio.Event, int]] = {}  # job_id -> (event, waiters)
+
+    def notify(self, job_id: str) -> None:
+        entry = self._events.pop(job_id, None)
+        if entry is not None:
+            entry[0].set()
+
+    async def wait(self, job_id: str, timeout: float) -> bool:
+        """Wait up to timeout seconds for the next notify(job_id); False on timeout."""
+        event, waiters = self._events.get(job_id, (None, 0))
+        if event is None:
+            event = asyncio.Event()
+        self._events[job_id] = (event, waiters + 1)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            entry = self._events.get(job_id)
+            if entry is not None and entry[0] is event:
+                if entry[1] <= 1:
+                    del self._events[job_id]
+                else:
+                    self._events[job_id] = (event, entry[1] - 1)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from backend.core.config import (
+    JOB_QUEUE_BACKEND,
+    JOB_QUEUE_LEASE_SECONDS,
+    JOB_QUEUE_MAX_ATTEMPTS,
+    JOB_QUEUE_MAX_PENDING,
+    JOB_QUEUE_PATH,
+    JOB_STORE_BACKEND,
+    PIPELINE_RETRY_AFTER_SECONDS,
+)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    job_id      TEXT PRIMARY KEY,
+    payload     TEXT NOT NULL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_until REAL NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS queue_lease_until ON queue (lease_until, enqueued_at);
+"""
+
+
+class QueueFull(RuntimeError):
+    """Raised when max_pending jobs are already waiting; the caller should retry later."""
+
+    def __init__(self, retry_after_seconds: int) -> None:
+        super().__init__("Job queue is full")
+        self.retry_after_seconds = retry_after_seconds
+
+
+@dataclass(frozen=True)
+class QueuedJob:
+    job_id: str
+    payload: dict[str, Any]
+    attempts: int  # including the current claim
+    lease_owner: str
+
+
+class SQLiteJobQueue:
+    """
+    Durable FIFO of pending jobs in a local SQLite file.
+
+    The API enqueues; any number of worker processes (python -m backend.worker)
+    claim jobs under a lease. A job stays in the table until its worker acks it,
+    so if that worker dies the lease runs out and another worker claims it again.
+    Each claim counts as an attempt; the worker gives up past max_attempts.
+
+    A row with lease_until <= now is claimable: new rows start at 0, and
+    running workers keep pushing lease_until forward with extend().
+    """
+
+    def __init__(
+        self,
+        *,
+        path: str,
+        lease_seconds: int,
+        max_attempts: int,
+        max_pending: int = 0,
+        retry_after_seconds: int = 5,
+    ) -> None:
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._max_pending = max_pending
+        self._retry_after_seconds = retry_after_seconds
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def _now(self) -> float:
+        return time.time()
+
+    # ---- blocking implementations (run via asyncio.to_thread) ----
+
+    def _enqueue_many(self, jobs: list[tuple[str, dict[str, Any]]]) -> None:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                if self._max_pending > 0:
+                    (pending,) = self._db.execute("SELECT COUNT(*) FROM queue").fetchone()
+                    if pending + len(jobs) > self._max_pending:
+                        raise QueueFull(self._retry_after_seconds)
+                now = self._now()
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO queue (job_id, payload, enqueued_at) VALUES (?, ?, ?)",
+                    [(job_id, json.dumps(payload), now) for job_id, payload in jobs],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _claim(self, owner: str) -> Optional[QueuedJob]:
+        with self._lock:
+            now = self._now()
+            # BEGIN IMMEDIATE takes the write lock up front, so two workers
+            # can never select the same row.
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT job_id, payload, attempts FROM queue"
+                    " WHERE lease_until <= ? ORDER BY enqueued_at LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    self._db.execute("COMMIT")
+                    return None
+
+                job_id, payload, attempts = row
+                self._db.execute(
+                    "UPDATE queue SET attempts = ?, lease_owner = ?, lease_until = ? WHERE job_id = ?",
+                    (attempts + 1, owner, now + self.lease_seconds, job_id),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+        return QueuedJob(job_id=job_id, payload=json.loads(payload), attempts=attempts + 1, lease_owner=owner)
+
+    def _extend(self, job_id: str, owner: str) -> bool:
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE queue SET lease_until = ? WHERE job_id = ? AND lease_owner = ?",
+                (self._now() + self.lease_seconds, job_id, owner),
+            )
+            return cur.rowcount == 1
+
+    def _ack(self, job_id: str, owner: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM queue WHERE job_id = ? AND lease_owner = ?", (job_id, owner))
+
+    def _depth(self) -> int:
+        with self._lock:
+            (n,) = self._db.execute("SELECT COUNT(*) FROM queue").fetchone()
+            return n
+
+    # ---- async API ----
+
+    async def enqueue(self, job_id: str, payload: dict[str, Any]) -> None:
+        """Add a job; raises QueueFull if max_pending jobs are already waiting."""
+        await asyncio.to_thread(self._enqueue_many, [(job_id, payload)])
+
+    async def enqueue_many(self, jobs: list[tuple[str, dict[str, Any]]]) -> None:
+        """Add several (job_id, payload) jobs, all or none."""
+        await asyncio.to_thread(self._enqueue_many, jobs)
+
+    async def claim(self, owner: str) -> Optional[QueuedJob]:
+        """Lease the oldest claimable job to owner, or return None if there is none."""
+        return await asyncio.to_thread(self._claim, owner)
+
+    async def extend(self, job_id: str, owner: str) -> bool:
+        """Renew owner's lease; False if the lease was lost to another worker."""
+        return await asyncio.to_thread(self._extend, job_id, owner)
+
+    async def ack(self, job_id: str, owner: str) -> None:
+        """Remove a finished job (completed or failed for good)."""
+        await asyncio.to_thread(self._ack, job_id, owner)
+
+    async def depth(self) -> int:
+        return await asyncio.to_thread(self._depth)
+
+
+def _make_job_queue() -> Optional[SQLiteJobQueue]:
+    if JOB_QUEUE_BACKEND == "background":
+        return None
+    if JOB_QUEUE_BACKEND == "sqlite":
+        if JOB_STORE_BACKEND != "sqlite":
+            raise ValueError("JOB_QUEUE_BACKEND=sqlite requires JOB_STORE_BACKEND=sqlite so workers can report results")
+        return SQLiteJobQueue(
+            path=JOB_QUEUE_PATH,
+            lease_seconds=JOB_QUEUE_LEASE_SECONDS,
+            max_attempts=JOB_QUEUE_MAX_ATTEMPTS,
+            max_pending=JOB_QUEUE_MAX_PENDING,
+            retry_after_seconds=PIPELINE_RETRY_AFTER_SECONDS,
+        )
+    raise ValueError(f"Unknown JOB_QUEUE_BACKEND: {JOB_QUEUE_BACKEND!r} (expected 'background' or 'sqlite')")
+
+
+# None => async jobs run as in-process background tasks
+JOB_QUEUE: Optional[SQLiteJobQueue] = _make_job_queue()
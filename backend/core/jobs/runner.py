@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+from typing import Awaitable, Callable, Optional
+
+from backend.core.jobs.store import JobStore
+from backend.core.llm.base import LLMClient
+from backend.core.pipeline.bol_extract import extract_bol_async, extract_packet_async
+from backend.core.pipeline.responses import store_in_cache, to_extraction_response, to_packet_response
+
+
+async def run_extraction_job(
+    *,
+    store: JobStore,
+    job_id: str,
+    schema: str,
+    file_path: str,
+    llm: LLMClient,
+    cache_key: Optional[str] = None,
+    split_packets: bool = False,
+    page_cache: bool = True,
+    still_leased: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> bool:
+    """
+    Run one async extraction job to completion and record the outcome.
+
+    Shared by the in-process background task and the standalone worker.
+    Pipeline errors mark the job failed; the upload is removed once the
+    outcome is recorded. With split_packets the result is a
+    PacketExtractionResponse; page_cache=False keeps the job from reusing or
+    storing per-page work.
+
+    still_leased is asked right before recording: when it says False (a
+    worker's lease ran out and another worker claimed the job), the run is
+    abandoned without touching the job or its upload, and False is returned.
+    """
+    await store.set_status(job_id, "running")
+    abandoned = False
+    try:
+        try:
+            kwargs = dict(schema=schema, file_path=file_path, llm=llm, page_cache=page_cache)
+            if split_packets:
+                resp = to_packet_response(await extract_packet_async(**kwargs))
+            else:
+                resp = to_extraction_response(await extract_bol_async(**kwargs))
+            error = None
+        except Exception as e:
+            resp, error = None, str(e)
+
+        if still_leased is not None and not await still_leased():
+            abandoned = True
+            return False
+        if resp is None:
+            await store.set_error(job_id, error)
+        else:
+            store_in_cache(cache_key, resp)
+            await store.set_result(job_id, resp.model_dump(mode="json"))
+        return True
+    finally:
+        if not abandoned:
+            try:
+                os.unlink(file_path)
+            except OSError:
+                pass
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Optional
+
+from backend.core.jobs.models import BatchItem, BatchRecord, JobRecord, JobStatus
+from backend.core.jobs.notify import JobNotifier
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id     TEXT PRIMARY KEY,
+    status     TEXT NOT NULL,
+    result     BLOB,
+    error      TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at);
+CREATE TABLE IF NOT EXISTS batch_items (
+    batch_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    job_id   TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    PRIMARY KEY (batch_id, position)
+);
+"""
+
+
+# Backoff bounds for wait_for() polling of changes made by other processes
+_WAIT_POLL_MIN_SECONDS = 0.05
+_WAIT_POLL_MAX_SECONDS = 1.0
+
+
+def _pack(result: dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(result, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def _unpack(blob: Optional[bytes]) -> Optional[dict[str, Any]]:
+    if blob is None:
+        return None
+    return json.loads(zlib.decompress(blob))
+
+
+class SQLiteJobStore:
+    """
+    Job store in a local SQLite file, shared by every process on the host
+    (e.g. `uvicorn --workers N`) and kept across restarts.
+
+    - WAL mode: readers never block the writer.
+    - Expiry deletes at most cleanup_batch rows per pass through the
+      updated_at index, so no request pays for a full table scan. The
+      background sweeper runs passes until nothing is left to expire.
+    - Results are stored as zlib-compressed compact JSON.
+    - Batches are rows of (batch_id, job_id); the sweeper drops a batch once
+      none of its jobs are left.
+    - wait_for() wakes at once on updates made through this instance and
+      polls with backoff (up to _WAIT_POLL_MAX_SECONDS) for other processes.
+
+    Calls run in a worker thread so the event loop never waits on disk.
+    """
+
+    def __init__(self, *, path: str, ttl_seconds: int, cleanup_batch: int = 500) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._cleanup_batch = cleanup_batch
+        self._last_cleanup_at = 0.0
+        self._lock = threading.Lock()
+        self._notifier = JobNotifier()
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def _now(self) -> float:
+        return time.time()
+
+    def _cutoff(self) -> float:
+        return self._now() - self._ttl_seconds
+
+    def _should_cleanup(self) -> bool:
+        # Avoid cleaning too often
+        return (self._now() - self._last_cleanup_at) >= 5
+
+    def _cleanup_expired_locked(self) -> int:
+        cur = self._db.execute(
+            "DELETE FROM jobs WHERE job_id IN ("
+            " SELECT job_id FROM jobs WHERE updated_at < ? ORDER BY updated_at LIMIT ?)",
+            (self._cutoff(), self._cleanup_batch),
+        )
+        self._last_cleanup_at = self._now()
+        return cur.rowcount
+
+    def _row_to_record(self, row: tuple) -> JobRecord:
+        job_id, status, result, error, created_at, updated_at = row
+        return JobRecord(
+            job_id=job_id,
+            status=status,
+            result=_unpack(result),
+            error=error,
+            created_at=created_at,
+            updated_at=updated_at,
+        )
+
+    # ---- blocking implementations (run via asyncio.to_thread) ----
+
+    def _create(self, job_id: str) -> JobRecord:
+        with self._lock:
+            if self._should_cleanup():
+                self._cleanup_expired_locked()
+
+            now = self._now()
+            self._db.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, result, error, created_at, updated_at)"
+                " VALUES (?, 'queued', NULL, NULL, ?, ?)",
+                (job_id, now, now),
+            )
+            return JobRecord(job_id=job_id, status="queued", created_at=now, updated_at=now)
+
+    def _get(self, job_id: str) -> Optional[JobRecord]:
+        # Polls only filter out expired rows; deleting them is the sweeper's job.
+        with self._lock:
+            row = self._db.execute(
+                "SELECT job_id, status, result, error, created_at, updated_at"
+                " FROM jobs WHERE job_id = ? AND updated_at >= ?",
+                (job_id, self._cutoff()),
+            ).fetchone()
+            return self._row_to_record(row) if row else None
+
+    def _create_batch(self, batch_id: str, items: list[tuple[str, str]]) -> None:
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO batch_items (batch_id, position, job_id, filename) VALUES (?, ?, ?, ?)",
+                [(batch_id, i, job_id, filename) for i, (job_id, filename) in enumerate(items)],
+            )
+
+    def _get_batch(self, batch_id: str) -> Optional[BatchRecord]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT b.job_id, b.filename, j.status FROM batch_items b"
+                " LEFT JOIN jobs j ON j.job_id = b.job_id AND j.updated_at >= ?"
+                " WHERE b.batch_id = ? ORDER BY b.position",
+                (self._cutoff(), batch_id),
+            ).fetchall()
+        if all(status is None for _, _, status in rows):
+            return None
+        return BatchRecord(
+            batch_id=batch_id,
+            items=[BatchItem(job_id=job_id, filename=filename, status=status) for job_id, filename, status in rows],
+        )
+
+    def _sweep(self) -> int:
+        removed = 0
+        while True:
+            with self._lock:
+                n = self._cleanup_expired_locked()
+            removed += n
+            if n < self._cleanup_batch:
+                break
+
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM batch_items WHERE batch_id IN ("
+                " SELECT b.batch_id FROM batch_items b LEFT JOIN jobs j ON j.job_id = b.job_id"
+                " GROUP BY b.batch_id HAVING COUNT(j.job_id) = 0)"
+            )
+        return removed
+
+    def _update(self, job_id: str, sql: str, params: tuple) -> None:
+        with self._lock:
+            self._db.execute(sql, (*params, self._now(), job_id))
+
+    # ---- async API (same contract as InMemoryJobStore) ----
+
+    async def sweep_expired(self) -> int:
+        return await asyncio.to_thread(self._sweep)
+
+    async def create(self, job_id: str) -> JobRecord:
+        return await asyncio.to_thread(self._create, job_id)
+
+    async def get(self, job_id: str) -> Optional[JobRecord]:
+        return await asyncio.to_thread(self._get, job_id)
+
+    async def wait_for(self, job_id: str, *, known_status: Optional[JobStatus], timeout: float) -> Optional[JobRecord]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = _WAIT_POLL_MIN_SECONDS
+        while True:
+            rec = await self.get(job_id)
+            if rec is None or rec.status != known_status:
+                return rec
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return rec
+            await self._notifier.wait(job_id, min(delay, remaining))
+            delay = min(delay * 2, _WAIT_POLL_MAX_SECONDS)
+
+    async def create_batch(self, batch_id: str, items: list[tuple[str, str]]) -> None:
+        await asyncio.to_thread(self._create_batch, batch_id, items)
+
+    async def get_batch(self, batch_id: str) -> Optional[BatchRecord]:
+        return await asyncio.to_thread(self._get_batch, batch_id)
+
+    async def set_status(self, job_id: str, status: JobStatus) -> None:
+        await asyncio.to_thread(
+            self._update, job_id, "UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?", (status,)
+        )
+        self._notifier.notify(job_id)
+
+    async def set_result(self, job_id: str, result: dict) -> None:
+        await asyncio.to_thread(
+            self._update,
+            job_id,
+            "UPDATE jobs SET status = 'completed', result = ?, error = NULL, updated_at = ? WHERE job_id = ?",
+            (_pack(result),),
+        )
+        self._notifier.notify(job_id)
+
+    async def set_error(self, job_id: str, error: str) -> None:
+        await asyncio.to_thread(
+            self._update,
+            job_id,
+            "UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE job_id = ?",
+            (error,),
+        )
+        self._notifier.notify(job_id)
@@ -1,50 +1,164 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import json
+import logging
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import Optional, Protocol
 
-from backend.core.jobs.models import JobRecord, JobStatus
-from backend.core.config import JOB_TTL_SECONDS
+from backend.core.jobs.models import BatchItem, BatchRecord, JobRecord, JobStatus
+from backend.core.jobs.notify import JobNotifier
+from backend.core.jobs.sqlite_store import SQLiteJobStore
+from backend.core.config import (
+    JOB_MAX_ENTRIES,
+    JOB_MAX_RESULT_MB,
+    JOB_STORE_BACKEND,
+    JOB_STORE_PATH,
+    JOB_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JobStore(Protocol):
+    """Contract shared by every job store backend."""
+
+    async def create(self, job_id: str) -> JobRecord: ...
+
+    async def get(self, job_id: str) -> Optional[JobRecord]: ...
+
+    async def set_status(self, job_id: str, status: JobStatus) -> None: ...
+
+    async def set_result(self, job_id: str, result: dict) -> None: ...
+
+    async def set_error(self, job_id: str, error: str) -> None: ...
+
+    async def wait_for(self, job_id: str, *, known_status: Optional[JobStatus], timeout: float) -> Optional[JobRecord]:
+        """
+        Return the job as soon as its status differs from known_status (or it
+        is gone), or its current state once timeout seconds have passed.
+        """
+        ...
+
+    async def create_batch(self, batch_id: str, items: list[tuple[str, str]]) -> None:
+        """Group already created jobs, given as (job_id, filename) pairs, under batch_id."""
+        ...
+
+    async def get_batch(self, batch_id: str) -> Optional[BatchRecord]:
+        """The batch with each job's current status; None once all its jobs have expired."""
+        ...
+
+    async def sweep_expired(self) -> int:
+        """Delete expired jobs (and batches left without jobs); returns how many jobs were removed."""
+        ...
 
 
 class InMemoryJobStore:
     """
-    Simple in-memory job store with TTL cleanup.
+    In-memory job store with TTL expiry and bounded size.
 
-    NOTE: In production with multiple workers/instances, this won't be shared.
+    - Expiry: a min-heap of (updated_at, job_id) so a sweep only touches
+      expired entries (O(k log n)) instead of scanning every job. Heap entries
+      are invalidated lazily: one is stale if the job was updated since.
+    - Limits: at most max_entries jobs and max_result_bytes of stored results;
+      beyond that, least recently used finished (completed/failed) jobs are
+      evicted, taken from their own LRU index. Queued and running jobs are
+      never evicted: with none finished left, the store stays over its limits
+      until jobs finish.
+    - Sweeping runs in a background task (see run_sweeper); get() never
+      cleans up, it just hides expired jobs.
+    - Batches only reference their jobs and are dropped once all of them are
+      gone: each job maps to its batch, which counts its remaining jobs.
+    - wait_for() sleeps on a per-job event that every update sets, so
+      long-polls and SSE streams wake the moment a job changes.
+
+    NOTE: Not shared between uvicorn workers/instances; use JOB_STORE_BACKEND=sqlite for that.
     """
 
-    def __init__(self, *, ttl_seconds: int) -> None:
-        self._jobs: dict[str, JobRecord] = {}
+    def __init__(self, *, ttl_seconds: int, max_entries: int = 0, max_result_bytes: int = 0) -> None:
+        self._jobs: OrderedDict[str, JobRecord] = OrderedDict()  # least recently used first
+        self._finished: OrderedDict[str, None] = OrderedDict()  # completed/failed job ids, same order
+        self._expiry: list[tuple[float, str]] = []
+        self._result_sizes: dict[str, int] = {}
+        self._result_bytes = 0
+        self._batches: dict[str, list[tuple[str, str]]] = {}
+        self._job_batch: dict[str, str] = {}  # job_id -> batch_id
+        self._batch_jobs_left: dict[str, int] = {}
+        self._notifier = JobNotifier()
         self._lock = asyncio.Lock()
         self._ttl_seconds = ttl_seconds
-        self._last_cleanup_at = 0.0
+        self._max_entries = max_entries
+        self._max_result_bytes = max_result_bytes
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def result_bytes(self) -> int:
+        return self._result_bytes
 
     def _now(self) -> float:
         return time.time()
 
-    def _should_cleanup(self) -> bool:
-        # Avoid cleaning too often
-        return (self._now() - self._last_cleanup_at) >= 5
-
-    def _cleanup_expired_locked(self) -> None:
-        now = self._now()
-        cutoff = now - self._ttl_seconds
-        expired_ids = [
-            job_id
-            for job_id, rec in self._jobs.items()
-            if rec.updated_at < cutoff
-        ]
-        for job_id in expired_ids:
-            self._jobs.pop(job_id, None)
-        self._last_cleanup_at = now
+    def _is_expired(self, rec: JobRecord) -> bool:
+        return rec.updated_at < self._now() - self._ttl_seconds
 
-    async def create(self, job_id: str) -> JobRecord:
+    def _touch_locked(self, rec: JobRecord) -> None:
+        rec.updated_at = self._now()
+        heapq.heappush(self._expiry, (rec.updated_at, rec.job_id))
+        self._jobs.move_to_end(rec.job_id)
+        if rec.status in ("completed", "failed"):
+            self._finished[rec.job_id] = None
+            self._finished.move_to_end(rec.job_id)
+        else:
+            self._finished.pop(rec.job_id, None)
+        self._notifier.notify(rec.job_id)
+
+    def _remove_locked(self, job_id: str) -> None:
+        if self._jobs.pop(job_id, None) is None:
+            return
+        self._finished.pop(job_id, None)
+        self._result_bytes -= self._result_sizes.pop(job_id, 0)
+        self._notifier.notify(job_id)
+        batch_id = self._job_batch.pop(job_id, None)
+        if batch_id is not None:
+            self._batch_jobs_left[batch_id] -= 1
+            if not self._batch_jobs_left[batch_id]:
+                del self._batch_jobs_left[batch_id]
+                del self._batches[batch_id]
+
+    def _cleanup_expired_locked(self) -> int:
+        cutoff = self._now() - self._ttl_seconds
+        removed = 0
+        while self._expiry and self._expiry[0][0] < cutoff:
+            updated_at, job_id = heapq.heappop(self._expiry)
+            rec = self._jobs.get(job_id)
+            if rec is not None and rec.updated_at == updated_at:
+                self._remove_locked(job_id)
+                removed += 1
+        return removed
+
+    def _over_limits(self) -> bool:
+        return (self._max_entries > 0 and len(self._jobs) > self._max_entries) or (
+            self._max_result_bytes > 0 and self._result_bytes > self._max_result_bytes
+        )
+
+    def _evict_locked(self, keep: str) -> None:
+        # keep was just touched, so it is last in _finished (if there at all)
+        while self._over_limits():
+            victim = next(iter(self._finished), None)
+            if victim is None or victim == keep:
+                return
+            self._remove_locked(victim)
+
+    async def sweep_expired(self) -> int:
         async with self._lock:
-            if self._should_cleanup():
-                self._cleanup_expired_locked()
+            return self._cleanup_expired_locked()
 
+    async def create(self, job_id: str) -> JobRecord:
+        async with self._lock:
             now = self._now()
             rec = JobRecord(
                 job_id=job_id,
@@ -52,21 +166,67 @@ class InMemoryJobStore:
                 created_at=now,
                 updated_at=now,
             )
+            self._remove_locked(job_id)
             self._jobs[job_id] = rec
+            heapq.heappush(self._expiry, (now, job_id))
+            self._evict_locked(keep=job_id)
             return rec
 
     async def get(self, job_id: str) -> Optional[JobRecord]:
         async with self._lock:
-            if self._should_cleanup():
-                self._cleanup_expired_locked()
-            return self._jobs.get(job_id)
+            rec = self._jobs.get(job_id)
+            if rec is None or self._is_expired(rec):
+                return None
+            self._jobs.move_to_end(job_id)
+            if job_id in self._finished:
+                self._finished.move_to_end(job_id)
+            return rec
+
+    async def wait_for(self, job_id: str, *, known_status: Optional[JobStatus], timeout: float) -> Optional[JobRecord]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            async with self._lock:
+                rec = self._jobs.get(job_id)
+                if rec is None or self._is_expired(rec):
+                    return None
+                if rec.status != known_status:
+                    return rec
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return rec
+            await self._notifier.wait(job_id, remaining)
+
+    async def create_batch(self, batch_id: str, items: list[tuple[str, str]]) -> None:
+        async with self._lock:
+            live = [job_id for job_id, _ in items if job_id in self._jobs]
+            if not live:
+                return
+            self._batches[batch_id] = list(items)
+            self._batch_jobs_left[batch_id] = len(live)
+            for job_id in live:
+                self._job_batch[job_id] = batch_id
+
+    async def get_batch(self, batch_id: str) -> Optional[BatchRecord]:
+        async with self._lock:
+            items = self._batches.get(batch_id)
+            if items is None:
+                return None
+            batch_items = []
+            for job_id, filename in items:
+                rec = self._jobs.get(job_id)
+                status = rec.status if rec is not None and not self._is_expired(rec) else None
+                batch_items.append(BatchItem(job_id=job_id, filename=filename, status=status))
+            if all(item.status is None for item in batch_items):
+                return None
+            return BatchRecord(batch_id=batch_id, items=batch_items)
 
     async def set_status(self, job_id: str, status: JobStatus) -> None:
         async with self._lock:
             rec = self._jobs.get(job_id)
             if rec:
                 rec.status = status
-                rec.updated_at = self._now()
+                self._touch_locked(rec)
 
     async def set_result(self, job_id: str, result: dict) -> None:
         async with self._lock:
@@ -75,7 +235,14 @@ class InMemoryJobStore:
                 rec.status = "completed"
                 rec.result = result
                 rec.error = None
-                rec.updated_at = self._now()
+                self._touch_locked(rec)
+
+                if self._max_result_bytes > 0:
+                    # Measured once here; eviction only subtracts the recorded size
+                    size = len(json.dumps(result, separators=(",", ":"), default=str))
+                    self._result_bytes += size - self._result_sizes.get(job_id, 0)
+                    self._result_sizes[job_id] = size
+                self._evict_locked(keep=job_id)
 
     async def set_error(self, job_id: str, error: str) -> None:
         async with self._lock:
@@ -83,7 +250,30 @@ class InMemoryJobStore:
             if rec:
                 rec.status = "failed"
                 rec.error = error
-                rec.updated_at = self._now()
+                self._touch_locked(rec)
+                self._evict_locked(keep=job_id)
+
+
+async def run_sweeper(store: JobStore, interval_seconds: float) -> None:
+    """Background task: expire old jobs every interval_seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await store.sweep_expired()
+        except Exception:
+            logger.exception("job store sweep failed")
+
+
+def _make_job_store() -> JobStore:
+    if JOB_STORE_BACKEND == "memory":
+        return InMemoryJobStore(
+            ttl_seconds=JOB_TTL_SECONDS,
+            max_entries=JOB_MAX_ENTRIES,
+            max_result_bytes=JOB_MAX_RESULT_MB * 1024 * 1024,
+        )
+    if JOB_STORE_BACKEND == "sqlite":
+        return SQLiteJobStore(path=JOB_STORE_PATH, ttl_seconds=JOB_TTL_SECONDS)
+    raise ValueError(f"Unknown JOB_STORE_BACKEND: {JOB_STORE_BACKEND!r} (expected 'memory' or 'sqlite')")
 
 
-JOB_STORE = InMemoryJobStore(ttl_seconds=JOB_TTL_SECONDS)
+JOB_STORE: JobStore = _make_job_store()
@@ -0,0 +1,167 @@
+"""
+Known carrier layouts read from their field zones only.
+
+A layout template is a JSON file:
+
+    {
+      "name": "tforce_straight_bol",
+      "fingerprint": "0f3c...",          # dhash of the blank form (python -m backend.scripts.layout_fingerprint)
+      "max_distance": 24,                # differing hash bits still counted as a match
+      "aspect": 0.773,                   # page width / height; other page shapes never match
+      "required": ["bol_number"],        # must resolve to skip the LLM (default: bol_number)
+      "confidence": 0.9,
+      "zones": {                         # x0, y0, x1, y1 as fractions of the page
+        "BOL_NO": [0.62, 0.05, 0.95, 0.09],
+        "SHIPPER": [0.05, 0.14, 0.48, 0.18],
+        "SHIP_DATE": [0.62, 0.10, 0.95, 0.13]
+      },
+      "fields": {                        # same field specs as form templates, over zone names
+        "bol_number": "BOL_NO",
+        "shipper.name": "SHIPPER",
+        "shipment_date": {"fields": ["SHIP_DATE"], "type": "date"}
+      }
+    }
+
+The fingerprint is a difference hash of a low-resolution grayscale render of
+the first page: it follows the printed boxes, rules and logos, which carry far
+more ink than the filled-in values. Only single-page documents are matched;
+anything unknown, multi-page, or whose zones don't resolve the required
+fields goes through the regular pipeline.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import fitz
+import numpy as np
+from PIL import Image
+
+from backend.core.config import LAYOUT_TEMPLATES_PATH, LAYOUT_ZONE_DPI
+from backend.core.document_source import DocumentSource, open_image, open_pdf, source_suffix
+from backend.core.form_mapping import FormMapping, FormTemplate, apply_template, load_templates
+from backend.core.ocr_extraction import IMAGE_EXTS, Box, read_zones
+
+
+# Hash grid: HASH_SIZE x HASH_SIZE bits
+HASH_SIZE = 16
+# Resolution of the render the hash is taken from (plenty for a 17x16 grid)
+_THUMB_DPI = 36
+# Page aspect ratios within this relative difference count as the same shape
+_ASPECT_TOLERANCE = 0.03
+
+
+@dataclass(frozen=True)
+class LayoutTemplate:
+    name: str
+    fingerprint: int
+    zones: Dict[str, Box]
+    fields: Dict[str, Any]
+    max_distance: int = 24
+    aspect: Optional[float] = None
+    required: Tuple[str, ...] = ("bol_number",)
+    confidence: float = 0.9
+
+    def as_form_template(self) -> FormTemplate:
+        """Zone names play the part of widget names, so form template field specs apply as-is."""
+        return FormTemplate(
+            name=self.name,
+            fingerprint=frozenset(self.zones),
+            fields=self.fields,
+            required=self.required,
+            confidence=self.confidence,
+        )
+
+
+@dataclass(frozen=True)
+class LayoutMatch:
+    template: str
+    distance: int  # differing fingerprint bits
+    zone_values: Dict[str, str]
+    mapping: FormMapping
+
+
+def _layout_from_dict(raw: Dict[str, Any]) -> LayoutTemplate:
+    try:
+        zones = {str(k): tuple(float(c) for c in v) for k, v in raw["zones"].items()}
+        if any(len(box) != 4 for box in zones.values()):
+            raise ValueError("zones must be [x0, y0, x1, y1]")
+        return LayoutTemplate(
+            name=str(raw["name"]),
+            fingerprint=int(raw["fingerprint"], 16),
+            zones=zones,
+            fields=dict(raw["fields"]),
+            max_distance=int(raw.get("max_distance", 24)),
+            aspect=float(raw["aspect"]) if raw.get("aspect") else None,
+            required=tuple(raw.get("required", ("bol_number",))),
+            confidence=float(raw.get("confidence", 0.9)),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid layout template {raw.get('name', '?')!r}: {e}") from e
+
+
+def dhash(img: Image.Image, size: int = HASH_SIZE) -> int:
+    """Difference hash: one bit per horizontally adjacent pixel pair of a (size+1) x size thumbnail."""
+    small = np.asarray(img.convert("L").resize((size + 1, size), Image.BILINEAR), dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def first_page(source: DocumentSource) -> Optional[Tuple[int, float]]:
+    """(dhash, aspect ratio) of the document's only page; None for multi-page PDFs."""
+    if source_suffix(source) in IMAGE_EXTS:
+        with open_image(source) as img:
+            return dhash(img), img.width / img.height
+    with open_pdf(source) as doc:
+        if len(doc) != 1:
+            return None
+        page = doc[0]
+        pix = page.get_pixmap(dpi=_THUMB_DPI, colorspace=fitz.csGRAY, alpha=False)
+        img = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+        return dhash(img), page.rect.width / page.rect.height
+
+
+class LayoutTemplateRegistry:
+    """Picks the template whose fingerprint is nearest a page's, within its max_distance."""
+
+    def __init__(self, templates: List[LayoutTemplate]) -> None:
+        self._templates = list(templates)
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def match(self, fingerprint: int, aspect: float) -> Optional[Tuple[LayoutTemplate, int]]:
+        best: Optional[Tuple[LayoutTemplate, int]] = None
+        for t in self._templates:
+            if t.aspect and abs(aspect - t.aspect) > _ASPECT_TOLERANCE * t.aspect:
+                continue
+            distance = (fingerprint ^ t.fingerprint).bit_count()
+            if distance <= t.max_distance and (best is None or distance < best[1]):
+                best = (t, distance)
+        return best
+
+    def extract(self, source: DocumentSource, timings_ms: Dict[str, int]) -> Optional[LayoutMatch]:
+        """Zone values of a matching layout mapped to BolV1; None if no template matches."""
+        if not self._templates:
+            return None
+        t0 = time.perf_counter()
+        page = first_page(source)
+        found = self.match(*page) if page else None
+        timings_ms["layout_match_ms"] = int((time.perf_counter() - t0) * 1000)
+        if found is None:
+            return None
+
+        template, distance = found
+        t0 = time.perf_counter()
+        values = read_zones(source, template.zones, dpi=LAYOUT_ZONE_DPI)
+        timings_ms["layout_zones_ms"] = int((time.perf_counter() - t0) * 1000)
+        return LayoutMatch(
+            template=template.name,
+            distance=distance,
+            zone_values=values,
+            mapping=apply_template(template.as_form_template(), values),
+        )
+
+
+LAYOUT_TEMPLATES = LayoutTemplateRegistry(load_templates(LAYOUT_TEMPLATES_PATH, _layout_from_dict))
@@ -1,6 +1,7 @@
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, Literal, Optional, Tuple
 
 
 SchemaName = Literal["bol_v1"]
@@ -11,6 +12,10 @@ class LLMExtractRequest:
     schema: SchemaName
     text: str
     document_hint: Optional[str] = None  # e.g., filename, carrier name, etc.
+    # Values already resolved without the LLM (e.g. from form widgets); they win over LLM output
+    known_fields: Optional[Dict[str, Any]] = None
+    # BolV1 paths the LLM should concentrate on; None = extract everything
+    missing_fields: Optional[Tuple[str, ...]] = None
 
 
 @dataclass(frozen=True)
@@ -18,6 +23,9 @@ class LLMExtractResponse:
     schema: SchemaName
     json: Dict[str, Any]
     raw: Optional[str] = None  # provider raw response if you want to store it later
+    model: Optional[str] = None  # model that produced json, when a client picks between several
+    timings_ms: Optional[Dict[str, int]] = None  # client-side stage timings, merged into meta.timings_ms
+    usage: Optional[Dict[str, int]] = None  # provider token counts: prompt_tokens, completion_tokens
 
 
 class LLMClient(ABC):
@@ -26,6 +34,9 @@ class LLMClient(ABC):
     implementing this exact contract.
     """
 
+    # Identifies the model behind the client (part of result cache keys)
+    model_name: str = "unknown"
+
     @abstractmethod
     def extract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
         """
@@ -33,3 +44,12 @@ class LLMClient(ABC):
         Must be deterministic for a given input when possible (helps testing).
         """
         raise NotImplementedError
+
+    async def aextract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
+        """
+        Async variant of extract_json.
+
+        The default runs extract_json in a worker thread; providers with a
+        native async SDK should override it so no thread is held while waiting.
+        """
+        return await asyncio.to_thread(self.extract_json, request)
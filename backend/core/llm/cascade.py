@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ValidationError, create_model
+
+from backend.core.form_mapping import merge_mapped
+from backend.core.llm.base import LLMClient, LLMExtractRequest, LLMExtractResponse
+from backend.schemas.bol_v1 import BolV1
+
+
+@lru_cache(maxsize=32)
+def _partial_schema(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """BolV1 cut down to the top-level fields a request asked for, plus confidence."""
+    names = sorted({f.split(".", 1)[0] for f in fields} | {"confidence"})
+    return create_model(
+        "PartialBolV1",
+        **{n: (BolV1.model_fields[n].annotation, BolV1.model_fields[n]) for n in names if n in BolV1.model_fields},
+    )
+
+
+class CascadeLLMClient(LLMClient):
+    """
+    Tries cheap clients first and escalates to the next tier only when the
+    answer is not good enough: the payload fails BolV1 validation (only of the
+    requested fields when the request names missing_fields), its
+    confidence is below min_confidence, or the call itself fails.
+
+    Each response carries timings_ms with one llm_tier<N>_ms entry per tier
+    tried, llm_tier (the 1-based tier that answered) and llm_escalations.
+    If no tier is good enough, the best valid answer (else the last) is returned.
+    """
+
+    def __init__(self, tiers: Sequence[Tuple[str, LLMClient]], *, min_confidence: float = 0.7) -> None:
+        if not tiers:
+            raise ValueError("CascadeLLMClient needs at least one tier")
+        self._tiers = list(tiers)
+        self._min_confidence = min_confidence
+        names = ">".join(name for name, _ in self._tiers)
+        self.model_name = f"cascade({names}@{min_confidence})"
+
+    def _score(self, request: LLMExtractRequest, payload: Dict[str, Any]) -> Optional[float]:
+        """Confidence of the payload the pipeline would validate; None if it is invalid."""
+        if request.known_fields:
+            payload = merge_mapped(payload, request.known_fields)
+        # A page-group chunk asks only for line items: bol_number etc. aren't its job
+        schema = _partial_schema(request.missing_fields) if request.missing_fields else BolV1
+        try:
+            return schema.model_validate(payload).confidence
+        except ValidationError:
+            return None
+
+    def _pick(
+        self,
+        answers: List[Tuple[int, LLMExtractResponse, Optional[float]]],
+        timings_ms: Dict[str, int],
+        error: Optional[Exception],
+    ) -> LLMExtractResponse:
+        valid = [a for a in answers if a[2] is not None]
+        if valid:
+            tier, resp, _ = max(valid, key=lambda a: a[2])
+        elif answers:
+            tier, resp, _ = answers[-1]
+        else:
+            raise error  # every tier raised
+        tried = len(timings_ms)  # one llm_tier<N>_ms entry per tier called
+        timings_ms["llm_tier"] = tier + 1
+        timings_ms["llm_escalations"] = tried - 1
+
+        # Every tier called is paid for, not just the one kept
+        usage: Dict[str, int] = {}
+        for _, answer, _ in answers:
+            for key, count in (answer.usage or {}).items():
+                usage[key] = usage.get(key, 0) + count
+        return LLMExtractResponse(
+            schema=resp.schema,
+            json=resp.json,
+            raw=resp.raw,
+            model=self._tiers[tier][0],
+            timings_ms=timings_ms,
+            usage=usage or None,
+        )
+
+    def _accept(self, score: Optional[float]) -> bool:
+        return score is not None and score >= self._min_confidence
+
+    def extract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
+        timings_ms: Dict[str, int] = {}
+        answers: List[Tuple[int, LLMExtractResponse, Optional[float]]] = []
+        error: Optional[Exception] = None
+
+        for i, (_, client) in enumerate(self._tiers):
+            t0 = time.perf_counter()
+            try:
+                resp = client.extract_json(request)
+            except Exception as e:
+                error = e
+                continue
+            finally:
+                timings_ms[f"llm_tier{i + 1}_ms"] = int((time.perf_counter() - t0) * 1000)
+            score = self._score(request, resp.json)
+            answers.append((i, resp, score))
+            if self._accept(score):
+                break
+
+        return self._pick(answers, timings_ms, error)
+
+    async def aextract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
+        timings_ms: Dict[str, int] = {}
+        answers: List[Tuple[int, LLMExtractResponse, Optional[float]]] = []
+        error: Optional[Exception] = None
+
+        for i, (_, client) in enumerate(self._tiers):
+            t0 = time.perf_counter()
+            try:
+                resp = await client.aextract_json(request)
+            except Exception as e:
+                error = e
+                continue
+            finally:
+                timings_ms[f"llm_tier{i + 1}_ms"] = int((time.perf_counter() - t0) * 1000)
+            score = self._score(request, resp.json)
+            answers.append((i, resp, score))
+            if self._accept(score):
+                break
+
+        return self._pick(answers, timings_ms, error)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from backend.core.config import USE_MOCK_LLM
+from backend.core.config import LLM_CASCADE_MIN_CONFIDENCE, LLM_CASCADE_MODELS, OPENAI_MODEL, USE_MOCK_LLM
 from backend.core.llm.base import LLMClient
+from backend.core.llm.cascade import CascadeLLMClient
 from backend.core.llm.mock import MockLLMClient
 from backend.core.llm.openai_client import OpenAILLMClient
 
@@ -10,10 +11,16 @@ def get_llm_client() -> LLMClient:
     """
     Factory that returns the correct LLM implementation.
     - Mock for tests / CI
-    - OpenAI for real runs
+    - OpenAI for real runs, as a cascade when LLM_CASCADE_MODELS lists several models
     """
 
     if USE_MOCK_LLM:
         return MockLLMClient()
 
-    return OpenAILLMClient()
+    if len(LLM_CASCADE_MODELS) > 1:
+        return CascadeLLMClient(
+            [(model, OpenAILLMClient(model)) for model in LLM_CASCADE_MODELS],
+            min_confidence=LLM_CASCADE_MIN_CONFIDENCE,
+        )
+
+    return OpenAILLMClient(LLM_CASCADE_MODELS[0] if LLM_CASCADE_MODELS else OPENAI_MODEL)
@@ -19,6 +19,8 @@ class MockLLMClient(LLMClient):
     - It returns a stable shape that your pipeline can validate with Pydantic.
     """
 
+    model_name = "mock"
+
     def extract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
         schema = request.schema
         text = request.text or ""
@@ -85,3 +87,7 @@ class MockLLMClient(LLMClient):
             }
 
         return LLMExtractResponse(schema=schema, json=payload, raw=None)
+
+    async def aextract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
+        # Pure CPU and instant: no need for a worker thread.
+        return self.extract_json(request)
@@ -1,8 +1,12 @@
+import asyncio
 import json
-from typing import Any, Dict
+import weakref
+from typing import Any, Dict, List, Tuple
 
-from openai import OpenAI
-from backend.core.config import OPENAI_API_KEY
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAI
+from backend.core.config import OPENAI_API_KEY, OPENAI_MAX_CONCURRENCY, OPENAI_MAX_CONNECTIONS, OPENAI_MODEL
+from backend.core.prompting import known_fields_block
 
 from backend.core.llm.base import (
     LLMClient,
@@ -11,27 +15,13 @@ from backend.core.llm.base import (
 )
 
 
-class OpenAILLMClient(LLMClient):
-    """
-    OpenAI implementation of LLMClient.
-    Uses strict JSON output and schema-guided extraction.
-    """
-
-    def __init__(self, model: str = "gpt-4o-mini"):
-        self._client = OpenAI(api_key=OPENAI_API_KEY)
-        self._model = model
-
-    def extract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
-        if request.schema != "bol_v1":
-            raise ValueError(f"Unsupported schema: {request.schema}")
-
-        system_prompt = (
-            "You are an expert logistics document parser.\n"
-            "Extract structured data from a Bill of Lading.\n"
-            "Return ONLY valid JSON. Do not include explanations."
-        )
+SYSTEM_PROMPT = (
+    "You are an expert logistics document parser.\n"
+    "Extract structured data from a Bill of Lading.\n"
+    "Return ONLY valid JSON. Do not include explanations."
+)
 
-        schema_prompt = """
+SCHEMA_PROMPT = """
         Extract a Bill of Lading into the following JSON structure:
 
         {
@@ -68,30 +58,93 @@ class OpenAILLMClient(LLMClient):
         - If uncertain, lower confidence and add a warning
         """
 
-        user_prompt = (
-            schema_prompt
-            + "\n\nDOCUMENT TEXT:\n----------------\n"
-            + request.text
-        )
 
-        response = self._client.chat.completions.create(
-            model=self._model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0,
+# One pooled AsyncOpenAI client + concurrency limit per event loop, shared by
+# every OpenAILLMClient instance. httpx pools and asyncio primitives are bound
+# to the loop that created them, hence the per-loop keying.
+_ASYNC_POOLS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[AsyncOpenAI, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _async_pool() -> Tuple[AsyncOpenAI, asyncio.Semaphore]:
+    loop = asyncio.get_running_loop()
+    pool = _ASYNC_POOLS.get(loop)
+    if pool is None:
+        client = AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+                ),
+            ),
         )
+        pool = (client, asyncio.Semaphore(OPENAI_MAX_CONCURRENCY))
+        _ASYNC_POOLS[loop] = pool
+    return pool
 
-        raw_content = response.choices[0].message.content
 
+class OpenAILLMClient(LLMClient):
+    """
+    OpenAI implementation of LLMClient.
+    Uses strict JSON output and schema-guided extraction.
+    """
+
+    def __init__(self, model: str = OPENAI_MODEL):
+        self._client = OpenAI(api_key=OPENAI_API_KEY)
+        self._model = model
+        self.model_name = model
+
+    def _messages(self, request: LLMExtractRequest) -> List[Dict[str, str]]:
+        if request.schema != "bol_v1":
+            raise ValueError(f"Unsupported schema: {request.schema}")
+
+        user_prompt = SCHEMA_PROMPT
+        focus = known_fields_block(request.known_fields, request.missing_fields)
+        if focus:
+            user_prompt += "\n\n" + focus
+        user_prompt += "\n\nDOCUMENT TEXT:\n----------------\n" + request.text
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _parse(self, request: LLMExtractRequest, response: Any) -> LLMExtractResponse:
+        raw_content = response.choices[0].message.content
         try:
             parsed: Dict[str, Any] = json.loads(raw_content)
-        except json.JSONDecodeError as e:
+        except (TypeError, json.JSONDecodeError) as e:
             raise ValueError(f"OpenAI did not return valid JSON: {raw_content}") from e
 
+        usage = None
+        if response.usage is not None:
+            usage = {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+            }
         return LLMExtractResponse(
             schema=request.schema,
             json=parsed,
             raw=raw_content,
+            usage=usage,
         )
+
+    def extract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
+        response = self._client.chat.completions.create(
+            model=self._model,
+            messages=self._messages(request),
+            temperature=0,
+        )
+        return self._parse(request, response)
+
+    async def aextract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
+        messages = self._messages(request)
+        client, limit = _async_pool()
+        async with limit:
+            response = await client.chat.completions.create(
+                model=self._model,
+                messages=messages,
+                temperature=0,
+            )
+        return self._parse(request, response)
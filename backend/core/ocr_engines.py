@@ -0,0 +1,158 @@
+"""
+OCR engines behind one interface, so the pipeline doesn't care how Tesseract is driven.
+
+  - PytesseractEngine: runs the tesseract binary per call (temp image file,
+    language model reload, stdout parsing on every page)
+  - TesserocrEngine: keeps a pool of initialized libtesseract handles in the
+    process and reuses them across pages and requests
+
+get_ocr_engine() returns the process-wide engine chosen by OCR_ENGINE.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from backend.core.config import OCR_ENGINE, OCR_ENGINE_POOL_SIZE, OCR_LANG
+
+
+class OcrEngine(ABC):
+    name = "base"
+
+    @abstractmethod
+    def image_to_text(self, img: Image.Image, dpi: Optional[int] = None) -> str:
+        """Text of img; dpi is the image's resolution when known (helps Tesseract size its glyphs)."""
+        raise NotImplementedError
+
+    def recognize(self, img: Image.Image, dpi: Optional[int] = None) -> Tuple[str, Optional[float]]:
+        """(text, mean word confidence 0..100); confidence is None when there are no words or it's unknown."""
+        return self.image_to_text(img, dpi), None
+
+
+class PytesseractEngine(OcrEngine):
+    name = "pytesseract"
+
+    def __init__(self, lang: str = "eng") -> None:
+        self._lang = lang
+
+    def image_to_text(self, img: Image.Image, dpi: Optional[int] = None) -> str:
+        import pytesseract
+
+        config = f"--dpi {dpi}" if dpi else ""
+        return pytesseract.image_to_string(img, lang=self._lang, config=config)
+
+    def recognize(self, img: Image.Image, dpi: Optional[int] = None) -> Tuple[str, Optional[float]]:
+        import pytesseract
+
+        # One tesseract run: rebuild the text from the word boxes instead of calling image_to_string too
+        config = f"--dpi {dpi}" if dpi else ""
+        data = pytesseract.image_to_data(img, lang=self._lang, config=config, output_type=pytesseract.Output.DICT)
+        lines: Dict[Tuple[int, int, int], List[str]] = {}
+        confs: List[float] = []
+        for i, word in enumerate(data["text"]):
+            conf = float(data["conf"][i])
+            if conf < 0 or not word.strip():
+                continue
+            lines.setdefault((data["block_num"][i], data["par_num"][i], data["line_num"][i]), []).append(word)
+            confs.append(conf)
+
+        out: List[str] = []
+        prev = None
+        for (block, par, _), words in lines.items():
+            if prev is not None and (block, par) != prev:
+                out.append("")  # blank line between paragraphs, like image_to_string
+            out.append(" ".join(words))
+            prev = (block, par)
+        return "\n".join(out), (sum(confs) / len(confs) if confs else None)
+
+
+class TesserocrEngine(OcrEngine):
+    """
+    Pool of tesserocr.PyTessBaseAPI handles.
+
+    A handle is not thread-safe, so each call borrows one exclusively. Handles
+    are created on demand up to pool_size; further callers wait for one to be
+    returned. The first handle is created eagerly so a missing library or
+    language file fails here, not on the first page.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, lang: str = "eng", pool_size: int = 2) -> None:
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        self._lang = lang
+        self._pool_size = max(1, pool_size)
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._handles: List[Any] = []
+        self._lock = threading.Lock()
+        self._idle.put(self._new_handle())
+
+    @property
+    def handles_created(self) -> int:
+        return len(self._handles)
+
+    def _new_handle(self) -> Any:
+        # Raises RuntimeError when the language data can't be loaded
+        api = self._tesserocr.PyTessBaseAPI(lang=self._lang)
+        self._handles.append(api)
+        return api
+
+    def _acquire(self) -> Any:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._handles) < self._pool_size:
+                return self._new_handle()
+        return self._idle.get()
+
+    def _read(self, img: Image.Image, dpi: Optional[int], confidence: bool) -> Tuple[str, Optional[float]]:
+        api = self._acquire()
+        try:
+            api.SetImage(img)
+            if dpi:
+                api.SetSourceResolution(dpi)
+            text = api.GetUTF8Text()
+            return text, (float(api.MeanTextConf()) if confidence and text.strip() else None)
+        finally:
+            api.Clear()  # drop the page image and results, keep the loaded model
+            self._idle.put(api)
+
+    def image_to_text(self, img: Image.Image, dpi: Optional[int] = None) -> str:
+        return self._read(img, dpi, confidence=False)[0]
+
+    def recognize(self, img: Image.Image, dpi: Optional[int] = None) -> Tuple[str, Optional[float]]:
+        return self._read(img, dpi, confidence=True)
+
+    def close(self) -> None:
+        with self._lock:
+            for api in self._handles:
+                api.End()
+            self._handles.clear()
+
+
+def create_ocr_engine(kind: str, *, lang: str = "eng", pool_size: int = 2) -> OcrEngine:
+    if kind == "pytesseract":
+        return PytesseractEngine(lang)
+    if kind == "tesserocr":
+        return TesserocrEngine(lang, pool_size)
+    if kind == "auto":
+        try:
+            return TesserocrEngine(lang, pool_size)
+        except (ImportError, RuntimeError):
+            return PytesseractEngine(lang)
+    raise ValueError(f"Unknown OCR engine: {kind!r}")
+
+
+@lru_cache(maxsize=1)
+def get_ocr_engine() -> OcrEngine:
+    """The engine for this process, created on first use (OCR worker processes each get their own)."""
+    return create_ocr_engine(OCR_ENGINE, lang=OCR_LANG, pool_size=OCR_ENGINE_POOL_SIZE)
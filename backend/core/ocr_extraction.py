@@ -1,69 +1,409 @@
 from __future__ import annotations
 
+import io
 import time
-from pathlib import Path
-from typing import Dict, List, Optional
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
 
-import pytesseract
+import fitz
 from PIL import Image
 
-# pdf2image is only used for PDFs
-from pdf2image import convert_from_path
+from backend.core.config import (
+    OCR_ADAPTIVE_DPI,
+    OCR_DEFAULT_DPI,
+    OCR_DPI_LADDER,
+    OCR_DPI_MAX_RETRIES,
+    OCR_ENGINE,
+    OCR_LANG,
+    OCR_MIN_CONFIDENCE,
+    OCR_PLAN_X_HEIGHT_PX,
+    OCR_PREPROCESS,
+    OCR_TARGET_X_HEIGHT_PX,
+)
+from backend.core.document_source import DocumentSource, for_worker_process, open_image, open_pdf, source_suffix
+from backend.core.executor import EXECUTOR
+from backend.core.ocr_engines import get_ocr_engine
+from backend.core.ocr_preprocess import binarize, preprocess, to_gray, x_height
+from backend.core.page_cache import page_cache_key, page_digest
+from backend.core.result_cache import ResultCache
 
 
 IMAGE_EXTS = {".png", ".jpg", ".jpeg"}
 
+# A lone image must cover this share of the page to be treated as the scan itself
+_SCAN_MIN_COVERAGE = 0.9
+# Resolution of the thumbnail the DPI planner measures glyphs on
+_PROBE_DPI = 100
+# Everything besides the page that decides its OCR text (part of page cache keys)
+_OCR_SETTINGS = (
+    OCR_ENGINE,
+    OCR_LANG,
+    OCR_PREPROCESS,
+    OCR_TARGET_X_HEIGHT_PX,
+    OCR_ADAPTIVE_DPI,
+    OCR_DEFAULT_DPI,
+    OCR_DPI_LADDER,
+    OCR_PLAN_X_HEIGHT_PX,
+    OCR_MIN_CONFIDENCE,
+    OCR_DPI_MAX_RETRIES,
+)
+
+
+@dataclass(frozen=True)
+class PageOcr:
+    text: str
+    ms: int
+    source: str  # "embedded" | "rendered"
+    dpi: Optional[int] = None  # resolution the page was OCR'd at
+    confidence: Optional[float] = None  # mean word confidence 0..100 (adaptive DPI only)
+    prep_ms: Dict[str, int] = field(default_factory=dict)
+    plan_ms: int = 0
+    retries: int = 0
+
+
+def _ms(t0: float) -> int:
+    return int((time.perf_counter() - t0) * 1000)
+
+
+def _read(img: Image.Image, dpi: Optional[int], confidence: bool) -> Tuple[str, Optional[float]]:
+    engine = get_ocr_engine()
+    if confidence:
+        return engine.recognize(img, dpi)
+    return engine.image_to_text(img, dpi), None
+
+
+def _ocr(
+    img: Image.Image, dpi: Optional[int] = None, *, confidence: bool = False, planned: bool = False
+) -> Tuple[str, Optional[float], Dict[str, int]]:
+    """
+    Preprocess img (unless disabled) and OCR it; returns (text, mean word
+    confidence if asked for, preprocessing step timings).
+
+    planned: the resolution was chosen by plan_dpi, so preprocessing must not
+    downscale it again.
+    """
+    if not OCR_PREPROCESS:
+        return (*_read(img, dpi, confidence), {})
+    pre = preprocess(img, dpi, target_x_height=0 if planned else OCR_TARGET_X_HEIGHT_PX)
+    with pre.image:
+        return (*_read(pre.image, pre.dpi, confidence), pre.timings_ms)
+
+
+def _ocr_image_file(source: DocumentSource) -> Tuple[str, int, Dict[str, int]]:
+    """OCR a single image (file or in-memory). Runs in an OCR worker process."""
+    t0 = time.perf_counter()
+    with open_image(source) as img:
+        text, _, prep_ms = _ocr(img)
+    return text, _ms(t0), prep_ms
+
+
+@contextmanager
+def _render_page(page: fitz.Page, dpi: int, clip: Optional[fitz.Rect] = None) -> Iterator[Image.Image]:
+    """
+    Render one PDF page (or just its clip area) to an 8-bit grayscale PIL image.
+
+    The image wraps the pixmap's sample buffer directly (no copy), so it is
+    only valid inside the with-block; it is closed before the pixmap is freed.
+    Grayscale is all Tesseract needs and is a third of the size of RGB.
+    """
+    pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False, clip=clip)
+    img = Image.frombuffer("L", (pix.width, pix.height), pix.samples_mv, "raw", "L", pix.stride, 1)
+    try:
+        yield img
+    finally:
+        img.close()
+        del img
+
+
+def _embedded_scan(doc: fitz.Document, page: fitz.Page) -> Optional[Tuple[Image.Image, int]]:
+    """
+    If the page is nothing but one scanned image, decode that image from its
+    native stream (JPEG, CCITT, ...) and return it with its effective DPI.
+
+    Returns None whenever only a render is faithful: text or vector drawings
+    on the page, several images, masks, rotation/flips, inverted samples,
+    partial coverage, or a stream Pillow can't decode (e.g. JBIG2).
+    """
+    if page.rotation:
+        return None
+
+    infos = page.get_image_info(xrefs=True)
+    if len(infos) != 1 or page.get_drawings() or page.get_text("text").strip():
+        return None
+
+    info = infos[0]
+    xref = info["xref"]
+    a, b, c, d, _, _ = info["transform"]
+    if not xref or info["has-mask"] or b or c or a <= 0 or d <= 0:
+        return None
+
+    bbox = fitz.Rect(info["bbox"])
+    if bbox.get_area() < _SCAN_MIN_COVERAGE * page.rect.get_area():
+        return None
+
+    if doc.xref_get_key(xref, "Decode")[0] != "null":
+        return None
+
+    try:
+        img = Image.open(io.BytesIO(doc.extract_image(xref)["image"]))
+        img.load()
+    except Exception:
+        return None
+
+    if img.mode not in ("L", "RGB"):
+        img = img.convert("L")
+
+    native_dpi = max(1, round(img.width * 72 / bbox.width))
+    return img, native_dpi
+
+
+def _snap_dpi(dpi: float) -> int:
+    """Lowest ladder step at or above dpi (the top step if none is)."""
+    return next((d for d in OCR_DPI_LADDER if d >= dpi), OCR_DPI_LADDER[-1])
+
+
+def plan_dpi(page: fitz.Page) -> int:
+    """
+    DPI at which the page's text renders with about OCR_PLAN_X_HEIGHT_PX
+    x-height, from glyph sizes measured on a _PROBE_DPI thumbnail.
+    """
+    with _render_page(page, _PROBE_DPI) as img:
+        xh = x_height(binarize(to_gray(img)))
+    if xh is None:  # no measurable text lines
+        return _snap_dpi(OCR_DEFAULT_DPI)
+    return _snap_dpi(OCR_PLAN_X_HEIGHT_PX * _PROBE_DPI / xh)
+
+
+def _sum_ms(into: Dict[str, int], steps: Dict[str, int]) -> None:
+    for step, ms in steps.items():
+        into[step] = into.get(step, 0) + ms
+
+
+def _ocr_adaptive(page: fitz.Page, t0: float) -> PageOcr:
+    """Render at the planned DPI; while confidence stays low, retry one ladder step up and keep the best."""
+    t_plan = time.perf_counter()
+    step = OCR_DPI_LADDER.index(plan_dpi(page))
+    plan_ms = _ms(t_plan)
+
+    prep_ms: Dict[str, int] = {}
+    best: Optional[Tuple[str, int, Optional[float]]] = None
+    retries = 0
+    while True:
+        dpi = OCR_DPI_LADDER[step]
+        with _render_page(page, dpi) as img:
+            text, conf, steps = _ocr(img, dpi, confidence=True, planned=True)
+        _sum_ms(prep_ms, steps)
+        if best is None or (conf or 0) > (best[2] or 0):
+            best = (text, dpi, conf)
+        # No words at all means nothing to gain from more pixels
+        low = conf is not None and conf < OCR_MIN_CONFIDENCE
+        if not low or retries >= OCR_DPI_MAX_RETRIES or step + 1 >= len(OCR_DPI_LADDER):
+            break
+        step += 1
+        retries += 1
+
+    text, dpi, conf = best
+    return PageOcr(
+        text=text,
+        ms=_ms(t0),
+        source="rendered",
+        dpi=dpi,
+        confidence=None if conf is None else round(conf, 1),
+        prep_ms=prep_ms,
+        plan_ms=plan_ms,
+        retries=retries,
+    )
+
+
+def _ocr_page(doc: fitz.Document, page_number: int, dpi: Optional[int]) -> PageOcr:
+    """OCR one page; dpi=None plans the render resolution (see _ocr_adaptive)."""
+    t0 = time.perf_counter()
+    page = doc[page_number - 1]
+
+    scan = _embedded_scan(doc, page)
+    if scan is not None:
+        img, native_dpi = scan
+        with img:
+            text, _, prep_ms = _ocr(img, native_dpi)
+        return PageOcr(text=text, ms=_ms(t0), source="embedded", dpi=native_dpi, prep_ms=prep_ms)
+
+    if dpi is None:
+        return _ocr_adaptive(page, t0)
+
+    with _render_page(page, dpi) as img:
+        text, _, prep_ms = _ocr(img, dpi)
+    return PageOcr(text=text, ms=_ms(t0), source="rendered", dpi=dpi, prep_ms=prep_ms)
+
+
+def _ocr_pdf_page(source: DocumentSource, page_number: int, dpi: Optional[int]) -> PageOcr:
+    """
+    Render one PDF page (1-based) and OCR it. Runs in an OCR worker process.
+
+    Each task renders its own page so only the text crosses the process
+    boundary, not a 300 DPI bitmap. In-memory sources ship the PDF bytes
+    instead of a path.
+    """
+    with open_pdf(source) as doc:
+        return _ocr_page(doc, page_number, dpi)
+
+
+Box = Tuple[float, float, float, float]  # x0, y0, x1, y1 as fractions of the page
+
+
+def read_zones(source: DocumentSource, zones: Dict[str, Box], *, dpi: int = 300) -> Dict[str, str]:
+    """
+    Text inside each zone of the first page, without reading the rest of it.
+
+    PDF zones use the text layer inside the box when it has any, else an OCR
+    of just that box rendered at dpi; image zones are cropped and OCR'd.
+    Rendering and OCR run on EXECUTOR's process pool, like page OCR.
+    """
+    return EXECUTOR.run_cpu(_read_zones, for_worker_process(source), zones, dpi)
+
+
+def _read_zones(source: DocumentSource, zones: Dict[str, Box], dpi: int) -> Dict[str, str]:
+    """read_zones() in an OCR worker process."""
+    values: Dict[str, str] = {}
+    if source_suffix(source) in IMAGE_EXTS:
+        with open_image(source) as img:
+            w, h = img.size
+            for name, (x0, y0, x1, y1) in zones.items():
+                with img.crop((round(x0 * w), round(y0 * h), round(x1 * w), round(y1 * h))) as crop:
+                    values[name] = _ocr(crop)[0].strip()
+        return values
+
+    with open_pdf(source) as doc:
+        page = doc[0]
+        r = page.rect
+        for name, (x0, y0, x1, y1) in zones.items():
+            clip = fitz.Rect(r.x0 + x0 * r.width, r.y0 + y0 * r.height, r.x0 + x1 * r.width, r.y0 + y1 * r.height)
+            text = page.get_text("text", clip=clip).strip()
+            if not text:
+                with _render_page(page, dpi, clip) as img:
+                    text = _ocr(img, dpi)[0].strip()
+            values[name] = text
+    return values
+
+
+def _prep_timings(per_page: List[Dict[str, int]]) -> Dict[str, int]:
+    """Preprocessing step timings summed over pages, as ocr_prep_<step>_ms."""
+    totals: Dict[str, int] = {}
+    for steps in per_page:
+        for step, ms in steps.items():
+            key = f"ocr_prep_{step}_ms"
+            totals[key] = totals.get(key, 0) + ms
+    return totals
+
 
 def extract_text_from_file_ocr(
-    path: str,
+    source: DocumentSource,
     *,
-    dpi: int = 300,
+    dpi: Optional[int] = None,
     pages: Optional[List[int]] = None,  # 1-based page numbers (PDF only)
+    parallel: bool = True,
+    cache: Optional[ResultCache] = None,
 ) -> Dict[str, object]:
     """
-    OCR for either:
-      - image files (.png/.jpg/.jpeg) => OCR directly
-      - PDFs => convert pages to images then OCR
+    OCR a file path or an InMemoryDocument (no temp file needed), either:
+      - images (.png/.jpg/.jpeg) => OCR directly
+      - PDFs => per page, either
+          - "embedded": the page is a single scanned image, OCR'd from its
+            native stream at the scanner's resolution (no render), or
+          - "rendered": render with PyMuPDF at `dpi`, then OCR. dpi=None
+            plans it per page (OCR_ADAPTIVE_DPI): the lowest OCR_DPI_LADDER
+            step that makes the page's glyphs legible, one step higher on
+            low confidence; with adaptive DPI off it means OCR_DEFAULT_DPI
+
+    Only one page image per worker is alive at any moment, and no
+    poppler subprocess or intermediate PPM files are involved.
+    page_sources reports which path each page took and page_dpis the
+    resolution it was read at (page_confidences: mean word confidence of
+    planned pages); planning time and retries are in ocr_dpi_plan_ms and
+    ocr_dpi_retries. Every image is cleaned up
+    by backend.core.ocr_preprocess first (OCR_PREPROCESS); its step timings
+    are summed over pages as ocr_prep_<step>_ms.
 
     pages:
       - Only applies to PDFs (1-based page indices)
-      - If None, OCR all pages (not recommended for MVP; use [1] or [1,2])
+      - If None, OCR all pages
+
+    parallel:
+      - If True, PDF pages are OCR'd concurrently on EXECUTOR's process pool
+        (page_texts still come back in page order)
+      - If False, pages are OCR'd one after another from a single open document
+
+    cache:
+      - PDF pages already OCR'd with the same content and settings are taken
+        from it (see backend.core.page_cache) and the others are added to it;
+        ocr_cache_hits counts the reused pages
     """
     t0 = time.perf_counter()
-    p = Path(path)
-    ext = p.suffix.lower()
+    ext = source_suffix(source)
+    if dpi is None and not OCR_ADAPTIVE_DPI:
+        dpi = OCR_DEFAULT_DPI
 
     if ext in IMAGE_EXTS:
         # Image OCR
-        img = Image.open(path)
-        text = pytesseract.image_to_string(img)
+        text, page_ms, prep_ms = EXECUTOR.run_cpu(_ocr_image_file, for_worker_process(source))
+        timings_ms = {"ocr_page_1_ms": page_ms, **_prep_timings([prep_ms])}
+        timings_ms["ocr_ms"] = _ms(t0)
         return {
             "text": text,
             "method": "ocr",
             "page_texts": [text],
-            "timings_ms": {"ocr_ms": int((time.perf_counter() - t0) * 1000)},
+            "page_sources": ["image"],
+            "timings_ms": timings_ms,
         }
 
     # PDF OCR
-    first_page = min(pages) if pages else None
-    last_page = max(pages) if pages else None
+    with open_pdf(source) as doc:
+        if pages is None:
+            pages = list(range(1, len(doc) + 1))
+        page_numbers = sorted(set(pages))
 
-    images = convert_from_path(
-        path,
-        dpi=dpi,
-        first_page=first_page,
-        last_page=last_page,
-    )
+        keys: Dict[int, str] = {}
+        cached: Dict[int, PageOcr] = {}
+        if cache is not None:
+            t_cache = time.perf_counter()
+            keys = {n: page_cache_key("ocr", page_digest(doc, n), dpi, _OCR_SETTINGS) for n in page_numbers}
+            for n, key in keys.items():
+                hit = cache.get(key)
+                if hit is not None:
+                    cached[n] = PageOcr(ms=0, **hit)
+            cache_ms = _ms(t_cache)
+        todo = [n for n in page_numbers if n not in cached]
+
+        if parallel and len(todo) > 1:
+            task_source = for_worker_process(source)
+            fresh = EXECUTOR.map_cpu(_ocr_pdf_page, [(task_source, n, dpi) for n in todo])
+        else:
+            fresh = [_ocr_page(doc, n, dpi) for n in todo]
+
+    timings_ms = {f"ocr_page_{n}_ms": r.ms for n, r in zip(todo, fresh)}
+    if cache is not None:
+        for n, r in zip(todo, fresh):
+            cache.set(keys[n], {"text": r.text, "source": r.source, "dpi": r.dpi, "confidence": r.confidence})
+        timings_ms["ocr_cache_hits"] = len(cached)
+        timings_ms["ocr_cache_ms"] = cache_ms
+    cached.update(zip(todo, fresh))
+    results = [cached[n] for n in page_numbers]
 
-    page_texts: List[str] = []
-    for img in images:
-        page_texts.append(pytesseract.image_to_string(img))
+    page_texts: List[str] = [r.text for r in results]
+    timings_ms.update(_prep_timings([r.prep_ms for r in results]))
+    if dpi is None:
+        timings_ms["ocr_dpi_plan_ms"] = sum(r.plan_ms for r in results)
+        timings_ms["ocr_dpi_retries"] = sum(r.retries for r in results)
 
     full_text = "\n\n".join(page_texts)
+    timings_ms["ocr_ms"] = _ms(t0)
 
     return {
         "text": full_text,
         "method": "ocr",
         "page_texts": page_texts,
-        "timings_ms": {"ocr_ms": int((time.perf_counter() - t0) * 1000)},
+        "page_sources": [r.source for r in results],
+        "page_dpis": [r.dpi for r in results],
+        "page_confidences": [r.confidence for r in results],
+        "timings_ms": timings_ms,
     }
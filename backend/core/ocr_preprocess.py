@@ -0,0 +1,211 @@
+"""
+Cleans up an image before it goes to Tesseract, with NumPy on whole arrays:
+
+  1. gray: 8-bit grayscale (alpha flattened onto white)
+  2. binarize: adaptive threshold against the local mean (integral image), so
+     shadows and uneven lighting on phone photos don't swallow the text
+  3. deskew: the angle whose horizontal projection profile is sharpest (text
+     lines fall into the fewest rows), searched coarse then fine
+  4. crop: drop dark scanner/fax borders, then blank margins around the ink
+  5. scale: downscale so the text x-height, estimated from the text line
+     bands, is about target_x_height pixels (never upscales)
+
+Tesseract gets a smaller, clean black-on-white image and the matching DPI.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+
+# Ink: darker than the local mean by this many gray levels, or darker than _DARK outright
+_OFFSET = 10
+_DARK = 40
+# Deskew search: ±_MAX_SKEW degrees in _COARSE_STEP steps, then ±_COARSE_STEP in _FINE_STEP steps
+_MAX_SKEW = 5.0
+_COARSE_STEP = 0.5
+_FINE_STEP = 0.1
+# The best angle must sharpen the profile by this much over 0°, else the page is left alone
+_MIN_SKEW_GAIN = 1.02
+# Long side the deskew search works at, and ink points it samples
+_DESKEW_SIDE = 1500
+_DESKEW_POINTS = 200_000
+# Edge rows/columns with more ink than this are border, not content
+_BORDER_INK = 0.5
+_CROP_MARGIN = 10
+# Text line bands: at least this tall, at most this share of the page, and enough of them
+_MIN_BAND = 5
+_MAX_BAND_SHARE = 0.1
+_MIN_BANDS = 3
+# Line band height (ascender to descender) per x-height
+_BAND_PER_X_HEIGHT = 2.0
+# Scales closer to 1 than this aren't worth a resample
+_MIN_DOWNSCALE = 0.85
+
+
+@dataclass(frozen=True)
+class Preprocessed:
+    image: Image.Image
+    dpi: Optional[int]
+    skew_deg: float = 0.0
+    scale: float = 1.0
+    timings_ms: Dict[str, int] = field(default_factory=dict)
+
+
+def _ms(t0: float) -> int:
+    return int((time.perf_counter() - t0) * 1000)
+
+
+def to_gray(img: Image.Image) -> np.ndarray:
+    if "A" in img.getbands() or img.mode == "P":
+        rgba = img.convert("RGBA")
+        img = Image.alpha_composite(Image.new("RGBA", rgba.size, "white"), rgba)
+    if img.mode != "L":
+        img = img.convert("L")
+    return np.asarray(img, dtype=np.uint8)
+
+
+def _box_mean(gray: np.ndarray, r: int) -> np.ndarray:
+    """Mean over the (2r+1)² window around each pixel, edges replicated."""
+    padded = np.pad(gray, r + 1, mode="edge")
+    # uint32 wraps, but the four-corner difference is exact as long as one window sum fits
+    integral = padded.astype(np.uint32).cumsum(0, dtype=np.uint32).cumsum(1, dtype=np.uint32)
+    h, w = gray.shape
+    k = 2 * r + 1
+    total = integral[k : k + h, k : k + w] - integral[:h, k : k + w] - integral[k : k + h, :w] + integral[:h, :w]
+    return total.astype(np.float32) / (k * k)
+
+
+def binarize(gray: np.ndarray) -> np.ndarray:
+    """Ink mask (True = ink)."""
+    r = max(7, min(gray.shape) // 60)
+    # The local mean is smooth: take it on a reduced copy and blow it back up
+    f = max(1, r // 4)
+    if f > 1:
+        small = np.asarray(Image.fromarray(gray).reduce(f))
+        mean = _box_mean(small, r // f).repeat(f, 0).repeat(f, 1)[: gray.shape[0], : gray.shape[1]]
+    else:
+        mean = _box_mean(gray, r)
+    return (gray < mean - _OFFSET) | (gray < _DARK)
+
+
+def _profile_score(ys: np.ndarray, xs: np.ndarray, angles_deg: np.ndarray) -> np.ndarray:
+    """Sharpness (sum of squared row counts) of the ink profile sheared by each angle."""
+    # One angle at a time: a few float32/int32 arrays of the points, not an angles x points float64 matrix
+    scores = np.empty(len(angles_deg))
+    for i, slope in enumerate(np.tan(np.deg2rad(angles_deg)).astype(np.float32)):
+        rows = np.rint(ys - slope * xs).astype(np.int32)
+        counts = np.bincount(rows - rows.min())
+        scores[i] = float(np.dot(counts, counts))
+    return scores
+
+
+def skew_angle(mask: np.ndarray) -> float:
+    """Counter-clockwise rotation in degrees that levels the text lines (0 when there's no clear answer)."""
+    step = max(1, max(mask.shape) // _DESKEW_SIDE)
+    ys, xs = np.nonzero(mask[::step, ::step])
+    if len(ys) < 100:
+        return 0.0
+    if len(ys) > _DESKEW_POINTS:
+        keep = slice(None, None, len(ys) // _DESKEW_POINTS + 1)
+        ys, xs = ys[keep], xs[keep]
+    ys = ys.astype(np.float32)
+    xs = xs.astype(np.float32)
+
+    coarse = np.arange(-_MAX_SKEW, _MAX_SKEW + 1e-9, _COARSE_STEP)
+    scores = _profile_score(ys, xs, coarse)
+    best = coarse[int(np.argmax(scores))]
+    fine = np.arange(best - _COARSE_STEP, best + _COARSE_STEP + 1e-9, _FINE_STEP)
+    fine_scores = _profile_score(ys, xs, fine)
+    i = int(np.argmax(fine_scores))
+
+    level = scores[int(np.argmin(np.abs(coarse)))]
+    if fine_scores[i] < _MIN_SKEW_GAIN * level:
+        return 0.0
+    return round(float(fine[i]), 2)
+
+
+def _leading(flags: np.ndarray) -> int:
+    """Length of the run of True at the start of flags."""
+    off = np.flatnonzero(~flags)
+    return int(off[0]) if len(off) else len(flags)
+
+
+def crop_box(mask: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    """(top, bottom, left, right) of the content, or None to keep the whole image."""
+    h, w = mask.shape
+    dark_rows = mask.mean(1) > _BORDER_INK
+    dark_cols = mask.mean(0) > _BORDER_INK
+    top, bottom = _leading(dark_rows), h - _leading(dark_rows[::-1])
+    left, right = _leading(dark_cols), w - _leading(dark_cols[::-1])
+    if top >= bottom or left >= right:
+        return None
+
+    inner = mask[top:bottom, left:right]
+    rows = np.flatnonzero(inner.any(1))
+    cols = np.flatnonzero(inner.any(0))
+    if not len(rows):
+        return None
+    box = (
+        max(0, top + int(rows[0]) - _CROP_MARGIN),
+        min(h, top + int(rows[-1]) + 1 + _CROP_MARGIN),
+        max(0, left + int(cols[0]) - _CROP_MARGIN),
+        min(w, left + int(cols[-1]) + 1 + _CROP_MARGIN),
+    )
+    return None if box == (0, h, 0, w) else box
+
+
+def x_height(mask: np.ndarray) -> Optional[float]:
+    """Estimated x-height in pixels from the median text line band, or None without enough lines."""
+    inked = mask.sum(1) > 1
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], inked.view(np.int8), [0]))))
+    heights = edges[1::2] - edges[::2]
+    heights = heights[(heights >= _MIN_BAND) & (heights <= _MAX_BAND_SHARE * mask.shape[0])]
+    if len(heights) < _MIN_BANDS:
+        return None
+    return float(np.median(heights)) / _BAND_PER_X_HEIGHT
+
+
+def preprocess(img: Image.Image, dpi: Optional[int] = None, *, target_x_height: int = 24) -> Preprocessed:
+    timings_ms: Dict[str, int] = {}
+
+    t0 = time.perf_counter()
+    gray = to_gray(img)
+    timings_ms["gray"] = _ms(t0)
+
+    t0 = time.perf_counter()
+    mask = binarize(gray)
+    timings_ms["binarize"] = _ms(t0)
+
+    t0 = time.perf_counter()
+    angle = skew_angle(mask)
+    out = Image.fromarray(np.where(mask, 0, 255).astype(np.uint8))
+    if angle:
+        out = out.rotate(angle, resample=Image.NEAREST, expand=True, fillcolor=255)
+        mask = np.asarray(out) < 128
+    timings_ms["deskew"] = _ms(t0)
+
+    t0 = time.perf_counter()
+    box = crop_box(mask)
+    if box is not None:
+        top, bottom, left, right = box
+        out = out.crop((left, top, right, bottom))
+        mask = mask[top:bottom, left:right]
+    timings_ms["crop"] = _ms(t0)
+
+    t0 = time.perf_counter()
+    scale = 1.0
+    xh = x_height(mask)
+    if xh and target_x_height > 0 and target_x_height / xh < _MIN_DOWNSCALE:
+        scale = target_x_height / xh
+        size = (max(1, round(out.width * scale)), max(1, round(out.height * scale)))
+        out = out.resize(size, Image.LANCZOS)
+        if dpi:
+            dpi = max(1, round(dpi * scale))
+    timings_ms["scale"] = _ms(t0)
+
+    return Preprocessed(image=out, dpi=dpi, skew_deg=angle, scale=round(scale, 3), timings_ms=timings_ms)
@@ -0,0 +1,73 @@
+"""
+Per-page cache, so a corrected resubmission only redoes the pages that changed.
+
+The result cache is keyed by the whole file: change one page and every page
+is OCR'd and sent to the LLM again. This cache keeps the per-page work,
+keyed by what a page draws rather than by the file it came in:
+
+  - OCR text of a PDF page: page_digest() + OCR settings
+  - LLM answers for the page groups of long documents
+    (backend.core.pipeline.chunked): the exact request + model + pipeline version
+
+It is another ResultCache, with the same memory LRU and optional SQLite tiers;
+sharing a file with the result cache is fine, entries go to their own table.
+"""
+from __future__ import annotations
+
+import hashlib
+
+import fitz
+
+from backend.core.config import PAGE_CACHE_MAX_MB, PAGE_CACHE_PATH, RESULT_CACHE_TTL_SECONDS
+from backend.core.result_cache import ResultCache
+
+
+def _font_data(doc: fitz.Document, xref: int, base_name: str) -> bytes:
+    """The embedded font file, or just the base name of a font that isn't embedded."""
+    try:
+        data = doc.extract_font(xref)[3]
+    except Exception:  # Type3 and broken font dictionaries
+        data = b""
+    return data or base_name.encode("utf-8")
+
+
+def page_digest(doc: fitz.Document, page_number: int) -> str:
+    """
+    Content hash of one PDF page (1-based): its content stream, the raw
+    streams of the images, form XObjects and fonts it uses, what its
+    annotations and form fields say, size and rotation. Other pages and
+    file-level changes (metadata, object numbering of a re-save) don't affect
+    it: streams are taken in order of their own hashes, not their xrefs, and
+    annotations by content rather than by their object text, which holds
+    "N 0 R" references.
+    """
+    page = doc[page_number - 1]
+    h = hashlib.sha256()
+    h.update(f"{tuple(page.rect)}|{page.rotation}".encode("utf-8"))
+    h.update(page.read_contents())
+
+    xrefs = {img[0] for img in page.get_images(full=True)} | {xo[0] for xo in page.get_xobjects()}
+    streams = [hashlib.sha256(doc.xref_stream_raw(xref) or b"").digest() for xref in xrefs]
+    streams += [hashlib.sha256(_font_data(doc, f[0], f[3])).digest() for f in page.get_fonts(full=True)]
+    for digest in sorted(streams):
+        h.update(digest)
+
+    for annot in page.annots():
+        h.update(f"{annot.type[1]}|{tuple(annot.rect)}|{annot.info.get('content', '')}".encode("utf-8"))
+    for widget in page.widgets():
+        h.update(f"{widget.field_name}|{widget.field_value}|{tuple(widget.rect)}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def page_cache_key(kind: str, *parts: object) -> str:
+    """Key for one kind of per-page entry ("ocr", "chunk") from everything its value depends on."""
+    raw = "\x1f".join([kind, *map(str, parts)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+PAGE_CACHE = ResultCache(
+    max_memory_bytes=PAGE_CACHE_MAX_MB * 1024 * 1024,
+    db_path=PAGE_CACHE_PATH or None,
+    ttl_seconds=RESULT_CACHE_TTL_SECONDS,
+    table="pages",
+)
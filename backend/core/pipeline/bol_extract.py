@@ -1,92 +1,337 @@
 from __future__ import annotations
 
+import asyncio
 import time
 import uuid
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
+from backend.core.config import (
+    BATCH_CONCURRENCY,
+    CHUNK_PAGES,
+    CHUNKED_MIN_PAGES,
+    PAGE_CACHE_ENABLED,
+    PROMPT_COMPACTION_ENABLED,
+    PROMPT_MAX_TOKENS,
+    RULES_ENABLED,
+    RULES_MIN_CONFIDENCE,
+    RULES_REQUIRED_FIELDS,
+)
+from backend.core.document_source import DocumentSource, source_suffix
+from backend.core.executor import EXECUTOR
+from backend.core.layout_templates import LAYOUT_TEMPLATES
 from backend.core.llm.base import LLMClient, LLMExtractRequest
 from backend.core.ocr_extraction import extract_text_from_file_ocr
+from backend.core.page_cache import PAGE_CACHE
+from backend.core.prompt_compaction import compact_pages
 from backend.core.prompting import inject_form_fields
+from backend.core.result_cache import ResultCache
 from backend.core.text_extraction import extract_text_from_pdf
+from backend.core.text_quality import score_page_text
 
 from backend.schemas.bol_v1 import BolV1
-from backend.core.pipeline.models import PipelineMeta, PipelineValidation, PipelineResult
+from backend.core.pipeline.models import (
+    PageDecision,
+    PipelineMeta,
+    PipelinePacketResult,
+    PipelineResult,
+    PipelineValidation,
+)
+from backend.core.pipeline.chunked import (
+    LINE_ITEMS_ONLY,
+    extract_chunks_async,
+    extract_chunks_sync,
+    page_groups,
+)
+from backend.core.pipeline.prefill import Prefill, prefill
+from backend.core.pipeline.segmentation import segment_pages
 
 
 IMAGE_EXTS = {".png", ".jpg", ".jpeg"}
 
+# Bump whenever pipeline output can change for the same input (invalidates cached results)
+PIPELINE_VERSION = "7"
+# What cached results are keyed by: the version plus the settings that change output for the same input
+PIPELINE_CACHE_VERSION = "|".join(
+    map(
+        str,
+        (
+            PIPELINE_VERSION,
+            PROMPT_COMPACTION_ENABLED,
+            PROMPT_MAX_TOKENS,
+            RULES_ENABLED,
+            RULES_MIN_CONFIDENCE,
+            ",".join(RULES_REQUIRED_FIELDS),
+            CHUNKED_MIN_PAGES,
+            CHUNK_PAGES,
+        ),
+    )
+)
 
-def _is_image(path: str) -> bool:
-    return Path(path).suffix.lower() in IMAGE_EXTS
 
+def _is_image(source: DocumentSource) -> bool:
+    return source_suffix(source) in IMAGE_EXTS
 
-def extract_bol_sync(
-    *,
-    schema: str,
-    file_path: str,
-    llm: LLMClient,
-) -> PipelineResult:
+
+def _resolve_source(file_path: Optional[str], source: Optional[DocumentSource]) -> DocumentSource:
+    if (file_path is None) == (source is None):
+        raise TypeError("pass exactly one of file_path or source")
+    return file_path if file_path is not None else source
+
+
+def _page_cache(enabled: bool) -> Optional[ResultCache]:
+    return PAGE_CACHE if enabled and PAGE_CACHE_ENABLED else None
+
+
+def _ocr_failed_pages(
+    source: DocumentSource,
+    page_texts: List[str],
+    page_sizes: List[Optional[Tuple[float, float]]],
+    timings_ms: dict[str, int],
+    cache: Optional[ResultCache] = None,
+) -> Tuple[List[str], List[PageDecision]]:
     """
-    Pipeline owns extraction method decision:
-      - Image => OCR only
-      - PDF => try pdf_text (+ form fields) first, then OCR fallback if needed
+    Score each page's text layer and OCR only the pages that fail.
+
+    Passing pages keep their PDF text; failing pages are replaced by OCR text
+    (a garbage or empty text layer adds nothing worth keeping). Pages whose
+    content was OCR'd before come from the page cache, if one is given.
     """
-    request_id = uuid.uuid4().hex
-    t0_total = time.perf_counter()
+    t0 = time.perf_counter()
+    qualities = [
+        score_page_text(text, page=i + 1, page_size=size)
+        for i, (text, size) in enumerate(zip(page_texts, page_sizes))
+    ]
+    timings_ms["page_quality_ms"] = int((time.perf_counter() - t0) * 1000)
 
-    method = "unknown"
-    page_count = None
-    timings_ms: dict[str, int] = {}
+    failed = [q.page for q in qualities if not q.passed]
+    # page -> (text, ocr_source, ocr_dpi, ocr_confidence)
+    ocr_by_page: Dict[int, Tuple[str, Optional[str], Optional[int], Optional[float]]] = {}
+    if failed:
+        ocr = extract_text_from_file_ocr(source, pages=failed, cache=cache)
+        timings_ms.update(ocr.get("timings_ms", {}))
+        ocr_texts = ocr.get("page_texts") or [ocr.get("text", "")]
+        none = [None] * len(ocr_texts)
+        if len(ocr_texts) == len(failed):
+            ocr_by_page = dict(
+                zip(
+                    failed,
+                    zip(
+                        ocr_texts,
+                        ocr.get("page_sources") or none,
+                        ocr.get("page_dpis") or none,
+                        ocr.get("page_confidences") or none,
+                    ),
+                )
+            )
+        else:
+            # OCR didn't report per-page text; attach it all to the first failed page
+            ocr_by_page = {failed[0]: ("\n\n".join(ocr_texts), None, None, None)}
+            ocr_by_page.update({n: ("", None, None, None) for n in failed[1:]})
 
-    # 1) Extract text (PDF text first OR OCR)
-    if _is_image(file_path):
+    merged: List[str] = []
+    decisions: List[PageDecision] = []
+    for q, text in zip(qualities, page_texts):
+        if q.page in ocr_by_page:
+            ocr_text, ocr_source, ocr_dpi, ocr_confidence = ocr_by_page[q.page]
+            merged.append(ocr_text)
+            decisions.append(
+                PageDecision(
+                    page=q.page,
+                    score=q.score,
+                    source="ocr",
+                    ocr_source=ocr_source,
+                    ocr_dpi=ocr_dpi,
+                    ocr_confidence=ocr_confidence,
+                )
+            )
+        else:
+            merged.append(text)
+            decisions.append(PageDecision(page=q.page, score=q.score, source="pdf_text"))
+
+    return merged, decisions
+
+
+def _read_layout(source: DocumentSource, timings_ms: dict[str, int]) -> Optional[Dict[str, Any]]:
+    """
+    Stage 1a: a single-page document in a known carrier layout, read from its
+    field zones only (see backend.core.layout_templates). None when no
+    template matches or the zones don't resolve every required field.
+    """
+    match = LAYOUT_TEMPLATES.extract(source, timings_ms)
+    if match is None or not match.mapping.complete:
+        return None
+    text = "\n".join(f"{name}: {value}" for name, value in match.zone_values.items() if value)
+    return {
+        "text": text,
+        "page_texts": [text],
+        "page_sizes": [None],
+        "method": "layout_zones",
+        "page_count": None if _is_image(source) else 1,
+        "page_decisions": None,
+        "form_fields": {},
+        "form_field_names": [],
+        "layout_mapping": match.mapping,
+    }
+
+
+def _extract_text(
+    source: DocumentSource, timings_ms: dict[str, int], cache: Optional[ResultCache] = None
+) -> Dict[str, Any]:
+    """
+    Stage 1 (blocking): returns {"text", "method", "page_count", "page_decisions"}.
+      - Known carrier layout => its field zones only
+      - Image => OCR only
+      - PDF => pdf_text (+ form fields), with OCR only for pages whose text
+        layer fails the quality score (see backend.core.text_quality)
+    """
+    layout = _read_layout(source, timings_ms)
+    if layout is not None:
+        return layout
+
+    if _is_image(source):
         # Image => OCR
-        ocr = extract_text_from_file_ocr(file_path)
-        text = ocr["text"]
-        method = "ocr"
+        ocr = extract_text_from_file_ocr(source)
         timings_ms.update(ocr.get("timings_ms", {}))
+        return {
+            "text": ocr["text"],
+            "page_texts": [ocr["text"]],
+            "page_sizes": [None],
+            "method": "ocr",
+            "page_count": None,
+            "page_decisions": None,
+            "form_fields": {},
+            "form_field_names": [],
+        }
 
-    else:
-        # PDF => try text extraction first
-        tex = extract_text_from_pdf(file_path)
-        page_count = tex.get("page_count")
-        timings_ms.update(tex.get("timings_ms", {}))
-        method = tex.get("method", "pdf_text")
+    # PDF => try text extraction first
+    tex = extract_text_from_pdf(source)
+    timings_ms.update(tex.get("timings_ms", {}))
+    method = tex.get("method", "pdf_text")
 
-        text = inject_form_fields(tex.get("text", ""), tex.get("form_fields") or {})
+    page_texts = tex.get("page_texts") or [tex.get("text", "")]
+    page_sizes = tex.get("page_sizes") or [None] * len(page_texts)
 
-        # OCR fallback heuristic (MVP)
-        # If text is too short, OCR the first page and prepend it.
-        if len(text.strip()) < 300:
-            ocr = extract_text_from_file_ocr(file_path, pages=[1])
-            text = ocr["text"] + "\n\n" + text
-            method = "pdf_text+ocr"
-            timings_ms.update(ocr.get("timings_ms", {}))
+    page_texts, decisions = _ocr_failed_pages(source, page_texts, page_sizes, timings_ms, cache)
+    if any(d.source == "ocr" for d in decisions):
+        method = "pdf_text+ocr"
 
-    # 2) LLM extract
-    t0_llm = time.perf_counter()
-    llm_resp = llm.extract_json(LLMExtractRequest(schema=schema, text=text))
-    timings_ms["llm_extract_ms"] = int((time.perf_counter() - t0_llm) * 1000)
+    form_fields = tex.get("form_fields") or {}
+    text = inject_form_fields("\n\n".join(page_texts), form_fields)
+    return {
+        "text": text,
+        "page_texts": page_texts,
+        "page_sizes": page_sizes,
+        "method": method,
+        "page_count": tex.get("page_count"),
+        "page_decisions": decisions,
+        "form_fields": form_fields,
+        "form_field_names": tex.get("form_field_names") or [],
+    }
 
-    # 3) Validate
+
+def _prompt_text(
+    pages: List[str], form_fields: Dict[str, str], timings_ms: dict[str, int], tokens: Dict[str, int]
+) -> str:
+    """Document text as sent to the LLM (see backend.core.prompt_compaction)."""
+    if not PROMPT_COMPACTION_ENABLED:
+        return inject_form_fields("\n\n".join(pages), form_fields)
+    t0 = time.perf_counter()
+    compacted = compact_pages(
+        pages,
+        header=inject_form_fields("", form_fields),
+        max_tokens=PROMPT_MAX_TOKENS,
+    )
+    timings_ms["prompt_compaction_ms"] = timings_ms.get("prompt_compaction_ms", 0) + int(
+        (time.perf_counter() - t0) * 1000
+    )
+    for key, n in (
+        ("prompt_pages_deduped", compacted.pages_deduped),
+        ("prompt_blocks_dropped", compacted.blocks_dropped),
+        ("prompt_blocks_cut", compacted.blocks_cut),
+    ):
+        timings_ms[key] = timings_ms.get(key, 0) + n
+    tokens["document_tokens"] = tokens.get("document_tokens", 0) + compacted.tokens_before
+    tokens["prompt_text_tokens"] = tokens.get("prompt_text_tokens", 0) + compacted.tokens_after
+    return compacted.text
+
+
+def _llm_requests(
+    schema: str,
+    extracted: Dict[str, Any],
+    filled: Prefill,
+    timings_ms: dict[str, int],
+    tokens: Dict[str, int],
+) -> List[LLMExtractRequest]:
+    """
+    Stage 2b: one request for the whole document, or for long documents one per
+    page group (see backend.core.pipeline.chunked): the first group asks for
+    everything, the others only for their line items.
+    """
+    groups = page_groups(extracted["page_texts"], min_pages=CHUNKED_MIN_PAGES, pages_per_chunk=CHUNK_PAGES)
+    requests = [filled.llm_request(schema, _prompt_text(groups[0], extracted["form_fields"], timings_ms, tokens))]
+    for pages in groups[1:]:
+        text = _prompt_text(pages, {}, timings_ms, tokens)
+        requests.append(LLMExtractRequest(schema=schema, text=text, missing_fields=LINE_ITEMS_ONLY))
+    return requests
+
+
+def _prepare_llm(
+    schema: str, extracted: Dict[str, Any], timings_ms: dict[str, int], tokens: Dict[str, int]
+) -> Tuple[Prefill, List[LLMExtractRequest]]:
+    """Stage 2a-b (blocking): form templates + pattern rules, then the LLM requests for whatever they left open."""
+    filled = prefill(extracted, timings_ms)
+    if filled.skip_llm:
+        return filled, []
+    return filled, _llm_requests(schema, extracted, filled, timings_ms, tokens)
+
+
+def _validate_and_build(
+    *,
+    request_id: str,
+    llm_json: Optional[Dict[str, Any]],
+    extracted: Dict[str, Any],
+    timings_ms: dict[str, int],
+    t0_total: float,
+    filled: Prefill,
+    llm_model: Optional[str] = None,
+    tokens: Optional[Dict[str, int]] = None,
+) -> PipelineResult:
+    """Stage 3 (blocking): merge the LLM payload (None when skipped) with the prefill, validate, assemble."""
     t0_val = time.perf_counter()
-    validation = PipelineValidation(is_valid=True, errors=[], warnings=[])
+    errors: List[str] = []
     data = None
+    llm_json = filled.values if llm_json is None else filled.merge(llm_json)
 
     try:
-        data = BolV1.model_validate(llm_resp.json)
+        data = BolV1.model_validate(llm_json)
     except Exception as e:
-        validation.is_valid = False
-        validation.errors.append(str(e))
+        errors.append(str(e))
+    warnings: List[str] = []
+    if timings_ms.get("prompt_blocks_cut"):
+        warnings.append(
+            f"{timings_ms['prompt_blocks_cut']} text blocks were left out of the prompt to fit "
+            f"PROMPT_MAX_TOKENS={PROMPT_MAX_TOKENS}; line items may be incomplete"
+        )
+    validation = PipelineValidation(is_valid=not errors, errors=errors, warnings=warnings)
 
     timings_ms["validation_ms"] = int((time.perf_counter() - t0_val) * 1000)
     timings_ms["total_ms"] = int((time.perf_counter() - t0_total) * 1000)
 
     meta = PipelineMeta(
         request_id=request_id,
-        method=method,
-        page_count=page_count,
+        method=extracted["method"],
+        page_count=extracted["page_count"],
         timings_ms=timings_ms,
+        page_decisions=extracted["page_decisions"],
+        form_template=filled.form_template,
+        layout_template=filled.layout_template,
+        llm_skipped=filled.skip_llm,
+        llm_fields=list(filled.missing) if filled.values and not filled.skip_llm else None,
+        rule_fields=filled.rule_fields or None,
+        llm_model=llm_model,
+        tokens=tokens or None,
+        pages=extracted.get("pages"),
     )
 
     return PipelineResult(
@@ -96,3 +341,284 @@ def extract_bol_sync(
         validation=validation,
         meta=meta,
     )
+
+
+def _fields_sync(
+    *,
+    schema: str,
+    extracted: Dict[str, Any],
+    llm: LLMClient,
+    request_id: str,
+    timings_ms: dict[str, int],
+    t0_total: float,
+    cache: Optional[ResultCache] = None,
+) -> PipelineResult:
+    """Stages 2-3 for one document's extracted text (blocking)."""
+    # 2) Form templates + pattern rules, then LLM extract for whatever they left open
+    tokens: Dict[str, int] = {}
+    filled, requests = _prepare_llm(schema, extracted, timings_ms, tokens)
+    llm_model: Optional[str] = None
+    llm_json: Optional[Dict[str, Any]] = None
+    if requests:
+        t0_llm = time.perf_counter()
+        if len(requests) == 1:
+            llm_resp = llm.extract_json(requests[0])
+        else:
+            # Page groups in parallel: bounded by the slowest chunk; unchanged groups come from the page cache
+            llm_resp = extract_chunks_sync(llm, requests, cache=cache, cache_version=PIPELINE_CACHE_VERSION)
+        timings_ms["llm_extract_ms"] = int((time.perf_counter() - t0_llm) * 1000)
+        timings_ms.update(llm_resp.timings_ms or {})
+        tokens.update(llm_resp.usage or {})
+        llm_model = llm_resp.model
+        llm_json = llm_resp.json
+
+    # 3) Validate
+    return _validate_and_build(
+        request_id=request_id,
+        llm_json=llm_json,
+        extracted=extracted,
+        timings_ms=timings_ms,
+        t0_total=t0_total,
+        filled=filled,
+        llm_model=llm_model,
+        tokens=tokens,
+    )
+
+
+async def _fields_async(
+    *,
+    schema: str,
+    extracted: Dict[str, Any],
+    llm: LLMClient,
+    request_id: str,
+    timings_ms: dict[str, int],
+    t0_total: float,
+    cache: Optional[ResultCache] = None,
+) -> PipelineResult:
+    """
+    Stages 2-3 for one document's extracted text. Rules, prompt compaction and
+    validation run on EXECUTOR's thread pool; only the LLM call (llm.aextract_json)
+    is awaited on the event loop.
+    """
+    # 2) Form templates + pattern rules, then LLM extract for whatever they left open
+    tokens: Dict[str, int] = {}
+    filled, requests = await EXECUTOR.run_io(_prepare_llm, schema, extracted, timings_ms, tokens)
+    llm_model: Optional[str] = None
+    llm_json: Optional[Dict[str, Any]] = None
+    if requests:
+        t0_llm = time.perf_counter()
+        if len(requests) == 1:
+            llm_resp = await llm.aextract_json(requests[0])
+        else:
+            # Page groups in parallel: bounded by the slowest chunk; unchanged groups come from the page cache
+            llm_resp = await extract_chunks_async(llm, requests, cache=cache, cache_version=PIPELINE_CACHE_VERSION)
+        timings_ms["llm_extract_ms"] = int((time.perf_counter() - t0_llm) * 1000)
+        timings_ms.update(llm_resp.timings_ms or {})
+        tokens.update(llm_resp.usage or {})
+        llm_model = llm_resp.model
+        llm_json = llm_resp.json
+
+    # 3) Validate
+    return await EXECUTOR.run_io(
+        _validate_and_build,
+        request_id=request_id,
+        llm_json=llm_json,
+        extracted=extracted,
+        timings_ms=timings_ms,
+        t0_total=t0_total,
+        filled=filled,
+        llm_model=llm_model,
+        tokens=tokens,
+    )
+
+
+def extract_bol_sync(
+    *,
+    schema: str,
+    file_path: Optional[str] = None,
+    source: Optional[DocumentSource] = None,
+    llm: LLMClient,
+    page_cache: bool = True,
+) -> PipelineResult:
+    """
+    Blocking pipeline: text extraction/OCR -> form mapping/rules -> LLM extract -> validation.
+
+    Pass either file_path or source (e.g. an InMemoryDocument, which is
+    parsed and OCR'd straight from memory without a temp file).
+    page_cache=False neither reads nor writes the page cache (see
+    backend.core.page_cache); it is also off when PAGE_CACHE_ENABLED is.
+    Used by scripts and tests; the API uses extract_bol_async.
+    """
+    source = _resolve_source(file_path, source)
+    request_id = uuid.uuid4().hex
+    t0_total = time.perf_counter()
+    timings_ms: dict[str, int] = {}
+    cache = _page_cache(page_cache)
+
+    # 1) Extract text (PDF text first OR OCR)
+    extracted = _extract_text(source, timings_ms, cache)
+
+    return _fields_sync(
+        schema=schema,
+        extracted=extracted,
+        llm=llm,
+        request_id=request_id,
+        timings_ms=timings_ms,
+        t0_total=t0_total,
+        cache=cache,
+    )
+
+
+async def extract_bol_async(
+    *,
+    schema: str,
+    file_path: Optional[str] = None,
+    source: Optional[DocumentSource] = None,
+    llm: LLMClient,
+    page_cache: bool = True,
+) -> PipelineResult:
+    """
+    Same pipeline as extract_bol_sync, without blocking the event loop:
+      - text extraction runs on EXECUTOR's thread pool (OCR on its process pool)
+      - the LLM call uses llm.aextract_json, so no thread waits on the network
+    """
+    source = _resolve_source(file_path, source)
+    request_id = uuid.uuid4().hex
+    t0_total = time.perf_counter()
+    timings_ms: dict[str, int] = {}
+    cache = _page_cache(page_cache)
+
+    # 1) Extract text (PDF text first OR OCR)
+    extracted = await EXECUTOR.run_io(_extract_text, source, timings_ms, cache)
+
+    return await _fields_async(
+        schema=schema,
+        extracted=extracted,
+        llm=llm,
+        request_id=request_id,
+        timings_ms=timings_ms,
+        t0_total=t0_total,
+        cache=cache,
+    )
+
+
+# ---- Packets (several shipments in one file) ----
+
+def _segments(extracted: Dict[str, Any], timings_ms: dict[str, int]) -> List[Dict[str, Any]]:
+    """One extracted-text dict per document found in the file (see backend.core.pipeline.segmentation)."""
+    t0 = time.perf_counter()
+    segments = segment_pages(extracted["page_texts"], extracted["page_sizes"])
+    timings_ms["segmentation_ms"] = int((time.perf_counter() - t0) * 1000)
+    if len(segments) <= 1:
+        return [{**extracted, "pages": list(range(1, len(extracted["page_texts"]) + 1))}]
+
+    decisions = extracted["page_decisions"]
+    docs = []
+    for seg in segments:
+        page_texts = [extracted["page_texts"][i] for i in seg.pages]
+        docs.append(
+            {
+                "text": "\n\n".join(page_texts),
+                "page_texts": page_texts,
+                "page_sizes": [extracted["page_sizes"][i] for i in seg.pages],
+                "method": extracted["method"],
+                "page_count": len(seg.pages),
+                "page_decisions": [decisions[i] for i in seg.pages] if decisions else None,
+                # Widget values can't be attributed to one shipment of a packet
+                "form_fields": {},
+                "form_field_names": [],
+                "pages": [i + 1 for i in seg.pages],
+            }
+        )
+    return docs
+
+
+def _packet_result(
+    request_id: str,
+    extracted: Dict[str, Any],
+    timings_ms: dict[str, int],
+    t0_total: float,
+    documents: List[PipelineResult],
+) -> PipelinePacketResult:
+    timings_ms["total_ms"] = int((time.perf_counter() - t0_total) * 1000)
+    return PipelinePacketResult(
+        request_id=request_id,
+        method=extracted["method"],
+        page_count=extracted["page_count"],
+        timings_ms=timings_ms,
+        documents=documents,
+    )
+
+
+def extract_packet_sync(
+    *,
+    schema: str,
+    file_path: Optional[str] = None,
+    source: Optional[DocumentSource] = None,
+    llm: LLMClient,
+    page_cache: bool = True,
+) -> PipelinePacketResult:
+    """
+    Like extract_bol_sync, but a file holding several shipments yields one
+    result per document; up to BATCH_CONCURRENCY documents are extracted concurrently.
+    """
+    source = _resolve_source(file_path, source)
+    request_id = uuid.uuid4().hex
+    t0_total = time.perf_counter()
+    timings_ms: dict[str, int] = {}
+    cache = _page_cache(page_cache)
+
+    extracted = _extract_text(source, timings_ms, cache)
+    docs = _segments(extracted, timings_ms)
+
+    def run(doc: Dict[str, Any]) -> PipelineResult:
+        # Each document starts from a copy of the shared stage timings
+        return _fields_sync(
+            schema=schema,
+            extracted=doc,
+            llm=llm,
+            request_id=uuid.uuid4().hex,
+            timings_ms=dict(timings_ms),
+            t0_total=t0_total,
+            cache=cache,
+        )
+
+    workers = max(1, min(len(docs), BATCH_CONCURRENCY))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="segment") as pool:
+        documents = list(pool.map(run, docs))
+    return _packet_result(request_id, extracted, timings_ms, t0_total, documents)
+
+
+async def extract_packet_async(
+    *,
+    schema: str,
+    file_path: Optional[str] = None,
+    source: Optional[DocumentSource] = None,
+    llm: LLMClient,
+    page_cache: bool = True,
+) -> PipelinePacketResult:
+    """Async extract_packet_sync: text extraction once, then up to BATCH_CONCURRENCY documents' LLM stages at once."""
+    source = _resolve_source(file_path, source)
+    request_id = uuid.uuid4().hex
+    t0_total = time.perf_counter()
+    timings_ms: dict[str, int] = {}
+    cache = _page_cache(page_cache)
+
+    extracted = await EXECUTOR.run_io(_extract_text, source, timings_ms, cache)
+    docs = _segments(extracted, timings_ms)
+    limit = asyncio.Semaphore(max(1, BATCH_CONCURRENCY))
+
+    async def run(doc: Dict[str, Any]) -> PipelineResult:
+        async with limit:
+            return await _fields_async(
+                schema=schema,
+                extracted=doc,
+                llm=llm,
+                request_id=uuid.uuid4().hex,
+                timings_ms=dict(timings_ms),
+                t0_total=t0_total,
+                cache=cache,
+            )
+
+    documents = await asyncio.gather(*(run(doc) for doc in docs))
+    return _packet_result(request_id, extracted, timings_ms, t0_total, list(documents))
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.core.llm.base import LLMClient, LLMExtractRequest, LLMExtractResponse
+from backend.core.page_cache import page_cache_key
+from backend.core.result_cache import ResultCache
+
+
+# Asked of every page group after the first; the first group also carries the header fields
+LINE_ITEMS_ONLY = ("line_items",)
+
+
+def page_groups(page_texts: Sequence[str], *, min_pages: int, pages_per_chunk: int) -> List[List[str]]:
+    """Pages split into groups of pages_per_chunk, or a single group for short documents."""
+    if min_pages <= 0 or len(page_texts) < min_pages or pages_per_chunk <= 0:
+        return [list(page_texts)]
+    return [list(page_texts[i : i + pages_per_chunk]) for i in range(0, len(page_texts), pages_per_chunk)]
+
+
+def _timed(llm: LLMClient, request: LLMExtractRequest) -> tuple[LLMExtractResponse, int]:
+    t0 = time.perf_counter()
+    resp = llm.extract_json(request)
+    return resp, int((time.perf_counter() - t0) * 1000)
+
+
+async def _atimed(llm: LLMClient, request: LLMExtractRequest) -> tuple[LLMExtractResponse, int]:
+    t0 = time.perf_counter()
+    resp = await llm.aextract_json(request)
+    return resp, int((time.perf_counter() - t0) * 1000)
+
+
+def _chunk_key(llm: LLMClient, request: LLMExtractRequest, version: str) -> str:
+    known = json.dumps(request.known_fields, sort_keys=True, default=str)
+    return page_cache_key(
+        "chunk",
+        version,
+        llm.model_name,
+        request.schema,
+        request.text,
+        request.document_hint,
+        known,
+        request.missing_fields,
+    )
+
+
+def _cached_answers(
+    cache: Optional[ResultCache], llm: LLMClient, requests: Sequence[LLMExtractRequest], version: str
+) -> tuple[List[str], List[Optional[tuple[LLMExtractResponse, int]]]]:
+    """Cache key of every request and its cached answer, or None where there is none (or no cache)."""
+    if cache is None:
+        return [], [None] * len(requests)
+    keys = [_chunk_key(llm, r, version) for r in requests]
+    answers: List[Optional[tuple[LLMExtractResponse, int]]] = []
+    for request, key in zip(requests, keys):
+        hit = cache.get(key)
+        if hit is None:
+            answers.append(None)
+        else:
+            # No usage/timings: a cached answer costs no tokens this time
+            answers.append((LLMExtractResponse(schema=request.schema, json=hit["json"], model=hit["model"]), 0))
+    return keys, answers
+
+
+def _remember(cache: Optional[ResultCache], keys: List[str], answers: List[Any], fresh: List[int]) -> None:
+    if cache is not None:
+        for i in fresh:
+            resp, _ = answers[i]
+            cache.set(keys[i], {"json": resp.json, "model": resp.model})
+
+
+def extract_chunks_sync(
+    llm: LLMClient,
+    requests: Sequence[LLMExtractRequest],
+    *,
+    cache: Optional[ResultCache] = None,
+    cache_version: str = "",
+) -> LLMExtractResponse:
+    """
+    Run the chunk requests on a short-lived thread per chunk and merge the answers.
+
+    With a cache (backend.core.page_cache), chunks already answered for the
+    same text, model and cache_version are not sent again.
+    """
+    keys, answers = _cached_answers(cache, llm, requests, cache_version)
+    todo = [i for i, answer in enumerate(answers) if answer is None]
+    if todo:
+        with ThreadPoolExecutor(max_workers=len(todo), thread_name_prefix="chunk") as pool:
+            for i, answer in zip(todo, pool.map(lambda i: _timed(llm, requests[i]), todo)):
+                answers[i] = answer
+    _remember(cache, keys, answers, todo)
+    return merge_chunk_responses(answers, cache_hits=None if cache is None else len(requests) - len(todo))
+
+
+async def extract_chunks_async(
+    llm: LLMClient,
+    requests: Sequence[LLMExtractRequest],
+    *,
+    cache: Optional[ResultCache] = None,
+    cache_version: str = "",
+) -> LLMExtractResponse:
+    keys, answers = _cached_answers(cache, llm, requests, cache_version)
+    todo = [i for i, answer in enumerate(answers) if answer is None]
+    for i, answer in zip(todo, await asyncio.gather(*(_atimed(llm, requests[i]) for i in todo))):
+        answers[i] = answer
+    _remember(cache, keys, answers, todo)
+    return merge_chunk_responses(answers, cache_hits=None if cache is None else len(requests) - len(todo))
+
+
+def _sum_known(values: List[Any]) -> Optional[float]:
+    """Sum of values, or None when any is missing (a partial sum would be wrong)."""
+    if not values or any(not isinstance(v, (int, float)) for v in values):
+        return None
+    return sum(values)
+
+
+def reconcile_totals(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fill total_pieces / total_weight_lb from the line items when the document
+    doesn't state them; stated totals win, with a warning when they disagree.
+    """
+    items = [i for i in payload.get("line_items") or [] if isinstance(i, dict)]
+    warnings = list(payload.get("warnings") or [])
+    out = dict(payload)
+
+    for total_key, item_key in (("total_pieces", "pieces"), ("total_weight_lb", "weight_lb")):
+        computed = _sum_known([i.get(item_key) for i in items])
+        if computed is None:
+            continue
+        stated = out.get(total_key)
+        if stated is None:
+            out[total_key] = int(computed) if total_key == "total_pieces" else round(computed, 3)
+        elif not isinstance(stated, (int, float)):
+            continue  # e.g. "1 pallet": left for BolV1 validation to report
+        elif abs(stated - computed) > 0.01:
+            warnings.append(f"{total_key} {stated} differs from the line item sum {round(computed, 3)}")
+
+    out["warnings"] = warnings
+    return out
+
+
+def merge_chunk_responses(
+    answers: List[tuple[LLMExtractResponse, int]], cache_hits: Optional[int] = None
+) -> LLMExtractResponse:
+    """
+    Header fields from the first chunk, line items from every chunk in page
+    order, lowest confidence, union of warnings; totals reconciled.
+    cache_hits (chunks answered from the page cache) is reported as llm_chunk_cache_hits.
+    """
+    header, _ = answers[0]
+    payload = dict(header.json)
+
+    items: List[Any] = []
+    warnings: List[str] = []
+    confidences: List[float] = []
+    usage: Dict[str, int] = {}
+    timings_ms: Dict[str, int] = {}
+    for resp, elapsed_ms in answers:
+        items.extend(resp.json.get("line_items") or [])
+        warnings.extend(w for w in resp.json.get("warnings") or [] if w not in warnings)
+        if isinstance(resp.json.get("confidence"), (int, float)):
+            confidences.append(resp.json["confidence"])
+        for key, count in (resp.usage or {}).items():
+            usage[key] = usage.get(key, 0) + count
+        for key, value in (resp.timings_ms or {}).items():
+            # llm_tier is an index, not an amount
+            if key == "llm_tier":
+                timings_ms[key] = max(timings_ms.get(key, 0), value)
+            else:
+                timings_ms[key] = timings_ms.get(key, 0) + value
+        timings_ms["llm_chunk_max_ms"] = max(timings_ms.get("llm_chunk_max_ms", 0), elapsed_ms)
+
+    payload["line_items"] = items
+    payload["warnings"] = warnings
+    if confidences:
+        payload["confidence"] = min(confidences)
+    timings_ms["llm_chunks"] = len(answers)
+    if cache_hits is not None:
+        timings_ms["llm_chunk_cache_hits"] = cache_hits
+
+    return LLMExtractResponse(
+        schema=header.schema,
+        json=reconcile_totals(payload),
+        model=header.model,
+        timings_ms=timings_ms,
+        usage=usage or None,
+    )
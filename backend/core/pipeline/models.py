@@ -2,7 +2,17 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional, Literal
 
 from backend.schemas.bol_v1 import BolV1
-ExtractMethod = Literal["pdf_text", "ocr", "pdf_text+ocr"]
+ExtractMethod = Literal["pdf_text", "ocr", "pdf_text+ocr", "layout_zones"]
+
+@dataclass(frozen=True)
+class PageDecision:
+    page: int  # 1-based
+    score: float  # text-layer quality, 0..1
+    source: Literal["pdf_text", "ocr"]
+    ocr_source: Optional[str] = None  # "embedded" | "rendered" when source == "ocr"
+    ocr_dpi: Optional[int] = None  # resolution the page was OCR'd at
+    ocr_confidence: Optional[float] = None  # mean word confidence 0..100, when the DPI was planned
+
 
 @dataclass(frozen=True)
 class PipelineMeta:
@@ -10,6 +20,16 @@ class PipelineMeta:
     method: ExtractMethod
     page_count: Optional[int]
     timings_ms: Dict[str, int]
+    page_decisions: Optional[List[PageDecision]] = None
+    form_template: Optional[str] = None  # AcroForm template that mapped widget values
+    layout_template: Optional[str] = None  # carrier layout whose zones were read instead of the whole page
+    llm_skipped: bool = False  # True when form mapping/rules resolved every required field
+    llm_fields: Optional[List[str]] = None  # fields the LLM was asked to fill; None = whole document
+    rule_fields: Optional[Dict[str, float]] = None  # fields filled by pattern rules -> confidence
+    llm_model: Optional[str] = None  # cascade tier that produced the payload
+    # document_tokens / prompt_text_tokens (before/after compaction), prompt_tokens / completion_tokens (provider)
+    tokens: Optional[Dict[str, int]] = None
+    pages: Optional[List[int]] = None  # 1-based pages of the file this document came from
 
 
 @dataclass(frozen=True)
@@ -24,4 +44,14 @@ class PipelineResult:
     job_id: None
     data: Optional[BolV1]
     validation: PipelineValidation
-    meta: PipelineMeta
\ No newline at end of file
+    meta: PipelineMeta
+
+
+@dataclass(frozen=True)
+class PipelinePacketResult:
+    """A file holding several documents: one PipelineResult per document, in page order."""
+    request_id: str
+    method: ExtractMethod
+    page_count: Optional[int]
+    timings_ms: Dict[str, int]  # shared stages (text extraction, OCR, segmentation) and total
+    documents: List[PipelineResult]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from backend.core.config import RULES_ENABLED, RULES_MIN_CONFIDENCE, RULES_REQUIRED_FIELDS
+from backend.core.form_mapping import FORM_TEMPLATES, FormMapping, merge_mapped
+from backend.core.llm.base import LLMExtractRequest
+from backend.core.rules import RuleExtraction, extract_rules, fill_freight_class
+from backend.schemas.bol_v1 import BolV1
+
+# BolV1 fields the LLM can be asked for (the rest is bookkeeping)
+_LLM_FIELDS = tuple(f for f in BolV1.model_fields if f not in ("document_type", "warnings", "confidence"))
+
+
+@dataclass(frozen=True)
+class Prefill:
+    """Values resolved before the LLM runs, and what is left for it."""
+    values: Dict[str, Any]  # BolV1-shaped; a complete payload when skip_llm
+    missing: List[str]  # fields the LLM is asked for
+    skip_llm: bool = False
+    form_template: Optional[str] = None
+    layout_template: Optional[str] = None
+    rule_fields: Dict[str, float] = field(default_factory=dict)  # rule-filled path -> confidence
+    rules: Optional[RuleExtraction] = None
+
+    def llm_request(self, schema: str, text: str) -> LLMExtractRequest:
+        if not self.values:
+            return LLMExtractRequest(schema=schema, text=text)
+        return LLMExtractRequest(
+            schema=schema,
+            text=text,
+            known_fields=self.values,
+            missing_fields=tuple(self.missing),
+        )
+
+    def merge(self, llm_json: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        LLM output with the prefilled values laid over it. List fields are the
+        union of both (LLM order first), so a rule that found one PO doesn't
+        drop the others the LLM read.
+        """
+        merged = merge_mapped(llm_json, self.values) if self.values else llm_json
+        for key, value in self.values.items():
+            theirs = llm_json.get(key)
+            if isinstance(value, list) and isinstance(theirs, list):
+                merged[key] = theirs + [v for v in value if v not in theirs]
+        return fill_freight_class(merged, self.rules) if self.rules else merged
+
+
+def _map_form(extracted: Dict[str, Any], timings_ms: dict[str, int]) -> Optional[FormMapping]:
+    if not extracted["form_fields"]:
+        return None
+    t0 = time.perf_counter()
+    mapping = FORM_TEMPLATES.map_form(extracted["form_fields"], extracted["form_field_names"])
+    timings_ms["form_mapping_ms"] = int((time.perf_counter() - t0) * 1000)
+    return mapping
+
+
+def _run_rules(text: str, timings_ms: dict[str, int]) -> Optional[RuleExtraction]:
+    if not RULES_ENABLED:
+        return None
+    t0 = time.perf_counter()
+    rules = extract_rules(text, min_confidence=RULES_MIN_CONFIDENCE)
+    timings_ms["rules_ms"] = int((time.perf_counter() - t0) * 1000)
+    return rules
+
+
+def _has_path(values: Dict[str, Any], path: str) -> bool:
+    head, _, rest = path.partition(".")
+    if head not in values:
+        return False
+    return not rest or (isinstance(values[head], dict) and _has_path(values[head], rest))
+
+
+def _complete_payload(values: Dict[str, Any], confidence: float) -> Optional[Dict[str, Any]]:
+    payload = {"document_type": "BOL", "warnings": [], **values, "confidence": confidence}
+    try:
+        BolV1.model_validate(payload)
+    except ValidationError:
+        return None
+    return payload
+
+
+def prefill(extracted: Dict[str, Any], timings_ms: dict[str, int]) -> Prefill:
+    """
+    Stage 2a: resolve what we can without the LLM.
+
+    AcroForm templates go first (widget values win), then the pattern rules.
+    The LLM is skipped when a template resolves everything, or when the rules
+    (plus a partial template) cover every required field and the result validates.
+    A document read through its layout zones is already complete.
+    """
+    layout: Optional[FormMapping] = extracted.get("layout_mapping")
+    if layout is not None:
+        return Prefill(values=layout.values, missing=[], skip_llm=True, layout_template=layout.template)
+
+    mapping = _map_form(extracted, timings_ms)
+    if mapping is not None and mapping.complete:
+        return Prefill(values=mapping.values, missing=[], skip_llm=True, form_template=mapping.template)
+
+    rules = _run_rules(extracted["text"], timings_ms)
+    values = dict(rules.values) if rules else {}
+    rule_fields = dict(rules.confidences) if rules else {}
+    if mapping is not None:
+        values = merge_mapped(values, mapping.values)
+        # Template values replace rule values; only report the rule values actually used
+        rule_fields = {p: c for p, c in rule_fields.items() if not _has_path(mapping.values, p)}
+
+    required = mapping.unresolved if mapping is not None else list(RULES_REQUIRED_FIELDS)
+    missing_required = [p for p in required if not _has_path(values, p)]
+    template = mapping.template if mapping else None
+
+    if required and not missing_required and rule_fields:
+        payload = _complete_payload(values, min(rule_fields.values()))
+        if payload is not None:
+            return Prefill(
+                values=payload, missing=[], skip_llm=True, form_template=template, rule_fields=rule_fields, rules=rules
+            )
+
+    missing = missing_required if mapping is not None else [f for f in _LLM_FIELDS if not _has_path(values, f)]
+    return Prefill(values=values, missing=missing, form_template=template, rule_fields=rule_fields, rules=rules)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import List, Optional, Union
+
+from backend.core.pipeline.models import PageDecision, PipelinePacketResult, PipelineResult
+from backend.core.result_cache import RESULT_CACHE
+from backend.schemas.api_models import (
+    APIMeta,
+    APIPageDecision,
+    APIValidation,
+    ExtractionResponse,
+    PacketExtractionResponse,
+    PacketMeta,
+)
+
+
+def _page_decisions(decisions: Optional[List[PageDecision]]) -> Optional[List[APIPageDecision]]:
+    if decisions is None:
+        return None
+    return [APIPageDecision(**asdict(d)) for d in decisions]
+
+
+def to_extraction_response(result: PipelineResult) -> ExtractionResponse:
+    """Map a pipeline result onto the public API response model."""
+    return ExtractionResponse(
+        status=result.status,
+        job_id=result.job_id,
+        data=result.data,
+        validation=APIValidation(
+            is_valid=result.validation.is_valid,
+            errors=result.validation.errors,
+            warnings=result.validation.warnings,
+        ),
+        meta=APIMeta(
+            request_id=result.meta.request_id,
+            method=result.meta.method,
+            page_count=result.meta.page_count,
+            timings_ms=result.meta.timings_ms,
+            page_decisions=_page_decisions(result.meta.page_decisions),
+            form_template=result.meta.form_template,
+            layout_template=result.meta.layout_template,
+            llm_skipped=result.meta.llm_skipped,
+            llm_fields=result.meta.llm_fields,
+            rule_fields=result.meta.rule_fields,
+            llm_model=result.meta.llm_model,
+            tokens=result.meta.tokens,
+            pages=result.meta.pages,
+        ),
+    )
+
+
+def to_packet_response(packet: PipelinePacketResult) -> PacketExtractionResponse:
+    return PacketExtractionResponse(
+        status="completed",
+        documents=[to_extraction_response(doc) for doc in packet.documents],
+        meta=PacketMeta(
+            request_id=packet.request_id,
+            method=packet.method,
+            page_count=packet.page_count,
+            timings_ms=packet.timings_ms,
+        ),
+    )
+
+
+def is_valid_response(resp: Union[ExtractionResponse, PacketExtractionResponse]) -> bool:
+    """
+    True if the extraction passed validation. A packet is valid once it was
+    split into documents; each document reports its own validation, so one
+    bad shipment doesn't turn the others into an error.
+    """
+    if isinstance(resp, PacketExtractionResponse):
+        return bool(resp.documents)
+    return bool(resp.validation and resp.validation.is_valid)
+
+
+def store_in_cache(cache_key: Optional[str], resp: Union[ExtractionResponse, PacketExtractionResponse]) -> None:
+    # Only cache valid results; a failed validation may succeed on retry.
+    if cache_key and is_valid_response(resp):
+        RESULT_CACHE.set(cache_key, resp.model_dump(mode="json"))
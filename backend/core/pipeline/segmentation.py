@@ -0,0 +1,101 @@
+"""
+Splits a multi-document PDF packet into one page range per shipment.
+
+Each page after the first either continues the current document or starts a
+new one, decided from cheap per-page signals, strongest first:
+
+  1. "Page k of N" markers: k == 1 starts a document, k > 1 continues one
+  2. the labelled BOL number (see backend.core.rules): a different number starts
+     a document, the same one continues it
+  3. "continued" / "continuation" wording continues the document
+  4. a "Bill of Lading" title near the top of the page starts a document
+  5. a layout change (page size differs and the page opens with a block of
+     header labels) starts a document
+
+Anything else is a continuation page.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from backend.core.rules import extract_rules
+
+
+_PAGE_OF_RE = re.compile(r"(?i)\bpage\s*(\d{1,3})\s*(?:of|/)\s*(\d{1,3})\b")
+_CONTINUED_RE = re.compile(r"(?i)\bcontinu(?:ed|ation)\b")
+_TITLE_RE = re.compile(r"(?i)\bbill\s+of\s+lading\b")
+_HEADER_LABEL_RE = re.compile(
+    r"(?i)\b(?:shipper|consignee|ship\s+from|ship\s+to|carrier|scac|pro|bol|b/l|date|bill\s+to|third\s+party)\b"
+)
+
+# Lines at the top of a page that count as its header
+_HEADER_LINES = 8
+# Distinct header labels needed for a layout change to count as a new document
+_MIN_HEADER_LABELS = 3
+
+
+@dataclass(frozen=True)
+class Segment:
+    pages: List[int]  # 0-based, contiguous
+    reason: str  # why this segment starts: "first", "page_of", "bol_number", "title", "layout"
+
+
+@dataclass(frozen=True)
+class _PageSignals:
+    page_of: Optional[Tuple[int, int]]
+    bol_number: Optional[str]
+    continued: bool
+    title: bool
+    header_labels: int
+    size: Optional[Tuple[int, int]]
+
+
+def _signals(text: str, size: Optional[Tuple[float, float]]) -> _PageSignals:
+    head = "\n".join([ln for ln in text.splitlines() if ln.strip()][:_HEADER_LINES])
+    m = _PAGE_OF_RE.search(text)
+    return _PageSignals(
+        page_of=(int(m.group(1)), int(m.group(2))) if m else None,
+        bol_number=extract_rules(text, min_confidence=0.8).values.get("bol_number"),
+        continued=bool(_CONTINUED_RE.search(head)),
+        title=bool(_TITLE_RE.search(head)),
+        header_labels=len({s.lower() for s in _HEADER_LABEL_RE.findall(head)}),
+        size=(round(size[0]), round(size[1])) if size else None,
+    )
+
+
+def _starts_document(page: _PageSignals, prev: _PageSignals, current_bol: Optional[str]) -> Optional[str]:
+    """Reason page starts a new document, or None if it continues the current one."""
+    if page.page_of is not None:
+        return "page_of" if page.page_of[0] == 1 else None
+    if page.bol_number and current_bol:
+        return "bol_number" if page.bol_number != current_bol else None
+    if page.continued:
+        return None
+    if page.title:
+        return "title"
+    if page.size != prev.size and page.header_labels >= _MIN_HEADER_LABELS:
+        return "layout"
+    return None
+
+
+def segment_pages(
+    page_texts: Sequence[str], page_sizes: Optional[Sequence[Optional[Tuple[float, float]]]] = None
+) -> List[Segment]:
+    if not page_texts:
+        return []
+    sizes = list(page_sizes) if page_sizes else [None] * len(page_texts)
+    signals = [_signals(text, size) for text, size in zip(page_texts, sizes)]
+
+    segments = [Segment(pages=[0], reason="first")]
+    current_bol = signals[0].bol_number
+    for i in range(1, len(signals)):
+        reason = _starts_document(signals[i], signals[i - 1], current_bol)
+        if reason is None:
+            segments[-1].pages.append(i)
+            current_bol = current_bol or signals[i].bol_number
+        else:
+            segments.append(Segment(pages=[i], reason=reason))
+            current_bol = signals[i].bol_number
+    return segments
@@ -0,0 +1,199 @@
+"""
+Shrinks document text before it goes into an LLM prompt.
+
+  1. normalize: collapse whitespace, drop signature rules ("_____") and blank runs
+  2. dedupe: drop pages that repeat an earlier page (e.g. OCR of a page whose
+     text layer is also present) and repeated blocks
+  3. strip boilerplate: long blocks dominated by legal wording (terms and
+     conditions, liability limits, certifications) with few field labels
+  4. budget: when the text is still over max_tokens, drop the least relevant
+     blocks (fewest field labels and numbers per token); the document's opening
+     block is considered first and the original order is preserved
+
+Token counts use tiktoken once load_tokenizer() has run (at startup; loading
+may download the encoding), else ~4 characters per token. Requests never
+touch the network.
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+from backend.core.config import OPENAI_MODEL
+
+
+_SPACES_RE = re.compile(r"[ \t\u00a0]+")
+_RULE_RE = re.compile(r"_{3,}|-{4,}|\.{4,}|={4,}")
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
+_DIGITS_RE = re.compile(r"\d+")
+
+_FIELD_RE = re.compile(
+    r"(?i)\b(?:bol|b/l|bill\s+of\s+lading|pro|shipper|consignee|ship\s+(?:from|to)|carrier|scac|date|"
+    r"p\.?o\.?|purchase\s+order|weight|wt|lbs?|pieces|pcs|qty|quantity|class|nmfc|description|total|"
+    r"handling\s+units?|pallets?|skids?|cartons?|zip|address|phone|ref(?:erence)?|seal|trailer)\b"
+)
+_BOILERPLATE_RE = re.compile(
+    r"(?i)\b(?:subject\s+to|tariffs?|liabilit\w*|hereby|herein|thereof|certif\w*|terms|conditions|"
+    r"agreed|shall|declared\s+value|limitation|governed|without\s+recourse|not\s+responsible|"
+    r"apparent\s+good\s+order|notwithstanding|valuation|in\s+accordance|pursuant|indemnif\w*)\b"
+)
+
+# A block is boilerplate when it has at least this many legal terms, more than
+# twice as many as field labels, and is long enough to be worth dropping
+_BOILERPLATE_MIN_HITS = 3
+_BOILERPLATE_MIN_CHARS = 150
+# Pages whose line sets overlap at least this much are duplicates
+_DUPLICATE_PAGE_OVERLAP = 0.9
+# Blocks longer than this (in lines) are split so ranking isn't all-or-nothing per page
+_MAX_BLOCK_LINES = 20
+
+
+@dataclass(frozen=True)
+class CompactedText:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    pages_deduped: int = 0
+    blocks_dropped: int = 0  # boilerplate, repeats and budget cuts
+    blocks_cut: int = 0  # of which budget cuts
+
+
+_encode: Optional[Callable[[str], List[int]]] = None
+
+
+def load_tokenizer() -> bool:
+    """
+    Load the tiktoken encoding for OPENAI_MODEL; call once at startup.
+
+    tiktoken downloads the encoding on first use, so this is the only place
+    that may go to the network. Returns False (counts stay heuristic) when
+    tiktoken is not installed or the encoding can't be loaded.
+    """
+    global _encode
+    try:
+        import tiktoken
+    except ImportError:
+        return False
+    try:
+        enc = tiktoken.encoding_for_model(OPENAI_MODEL)
+    except Exception:
+        try:
+            enc = tiktoken.get_encoding("o200k_base")
+        except Exception:  # no cached encoding and no network
+            return False
+    _encode = enc.encode
+    return True
+
+
+def count_tokens(text: str) -> int:
+    encode = _encode
+    if encode is not None:
+        return len(encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def normalize(text: str) -> str:
+    lines = []
+    for line in text.splitlines():
+        line = _SPACES_RE.sub(" ", _RULE_RE.sub(" ", line)).strip()
+        lines.append(line)
+    return _BLANK_RUN_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _blocks(page: str) -> List[str]:
+    blocks = []
+    for para in page.split("\n\n"):
+        lines = [ln for ln in para.split("\n") if ln]
+        for i in range(0, len(lines), _MAX_BLOCK_LINES):
+            blocks.append("\n".join(lines[i : i + _MAX_BLOCK_LINES]))
+    return [b for b in blocks if b]
+
+
+def _is_duplicate_page(lines: frozenset, seen: List[frozenset]) -> bool:
+    for other in seen:
+        overlap = len(lines & other) / max(1, min(len(lines), len(other)))
+        if overlap >= _DUPLICATE_PAGE_OVERLAP:
+            return True
+    return False
+
+
+def _is_boilerplate(block: str) -> bool:
+    if len(block) < _BOILERPLATE_MIN_CHARS:
+        return False
+    legal = len(_BOILERPLATE_RE.findall(block))
+    return legal >= _BOILERPLATE_MIN_HITS and legal > 2 * len(_FIELD_RE.findall(block))
+
+
+def _relevance(block: str, tokens: int) -> float:
+    """Field labels and numbers per token."""
+    signal = len(_FIELD_RE.findall(block)) + 0.5 * len(_DIGITS_RE.findall(block))
+    return signal / max(1, tokens)
+
+
+def compact_pages(pages: Sequence[str], *, header: str = "", max_tokens: int = 0) -> CompactedText:
+    """
+    Compacted text of pages, prefixed by header (kept verbatim, e.g. form fields).
+
+    max_tokens bounds the whole result (0 = no budget, only normalize/dedupe/strip).
+    """
+    tokens_before = count_tokens(header + "\n\n".join(pages))
+
+    # 1-2) normalize and drop repeated pages
+    seen_pages: List[frozenset] = []
+    kept_pages: List[List[str]] = []
+    pages_deduped = 0
+    for page in pages:
+        page = normalize(page)
+        lines = frozenset(ln.lower() for ln in page.split("\n") if ln)
+        if not lines:
+            continue
+        if _is_duplicate_page(lines, seen_pages):
+            pages_deduped += 1
+            continue
+        seen_pages.append(lines)
+        kept_pages.append(_blocks(page))
+
+    # 2-3) drop repeated blocks and boilerplate; remember (block, tokens, relevance)
+    seen_blocks: set = set()
+    blocks: List[tuple] = []
+    dropped = cut = 0
+    for page_blocks in kept_pages:
+        for block in page_blocks:
+            key = block.lower()
+            if key in seen_blocks and len(block) >= 40:
+                dropped += 1
+                continue
+            seen_blocks.add(key)
+            if _is_boilerplate(block):
+                dropped += 1
+                continue
+            tokens = count_tokens(block)
+            blocks.append((block, tokens, _relevance(block, tokens)))
+
+    # 4) token budget: keep the document's opening block, then the most relevant ones
+    header = header.strip()
+    if max_tokens > 0:
+        budget = max_tokens - count_tokens(header)
+        order = sorted(range(len(blocks)), key=lambda i: (i != 0, -blocks[i][2]))
+        keep = set()
+        for i in order:
+            if blocks[i][1] <= budget:
+                keep.add(i)
+                budget -= blocks[i][1]
+        cut = len(blocks) - len(keep)
+        dropped += cut
+        blocks = [b for i, b in enumerate(blocks) if i in keep]
+
+    body = "\n\n".join(block for block, _, _ in blocks)
+    text = f"{header}\n\n{body}" if header and body else header or body
+
+    return CompactedText(
+        text=text,
+        tokens_before=tokens_before,
+        tokens_after=count_tokens(text),
+        pages_deduped=pages_deduped,
+        blocks_dropped=dropped,
+        blocks_cut=cut,
+    )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Dict
+import json
+from typing import Any, Dict, Optional, Sequence
 
 
 def inject_form_fields(text: str, form_fields: Dict[str, str]) -> str:
@@ -10,3 +11,16 @@ def inject_form_fields(text: str, form_fields: Dict[str, str]) -> str:
 
     lines = [f"- {k}: {v}" for k, v in sorted(interesting.items())]
     return "FORM FIELDS:\n" + "\n".join(lines) + "\n\n" + text
+
+
+def known_fields_block(known: Optional[Dict[str, Any]], missing: Optional[Sequence[str]]) -> str:
+    """Prompt section telling the LLM what is already known and what is still missing."""
+    parts = []
+    if known:
+        parts.append(
+            "ALREADY EXTRACTED (copy these values unchanged):\n"
+            + json.dumps(known, separators=(",", ":"), default=str)
+        )
+    if missing:
+        parts.append("STILL MISSING (focus on these): " + ", ".join(missing))
+    return "\n\n".join(parts)
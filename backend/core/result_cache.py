@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from backend.core.config import (
+    RESULT_CACHE_MAX_MB,
+    RESULT_CACHE_PATH,
+    RESULT_CACHE_TTL_SECONDS,
+)
+
+
+def make_cache_key(*, content_sha256: str, schema: str, model: str, pipeline_version: str) -> str:
+    """Content-addressed key: same bytes + schema + model + pipeline => same result."""
+    raw = "\x1f".join([content_sha256, schema, model, pipeline_version])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache for extraction results (JSON-serializable dicts).
+
+    - Memory tier: LRU, evicted by total serialized size (max_memory_bytes).
+    - Disk tier (optional): SQLite file so results survive restarts.
+      Disk hits are promoted back into memory. Caches sharing a file keep
+      their entries apart by table name.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_memory_bytes: int,
+        db_path: Optional[str] = None,
+        ttl_seconds: int = 0,
+        table: str = "results",
+    ) -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table!r}")
+        self._table = table
+        self._max_memory_bytes = max(0, max_memory_bytes)
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+            self._prune_disk_locked()
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def _now(self) -> float:
+        return time.time()
+
+    def _prune_disk_locked(self) -> None:
+        if self._db is not None and self._ttl_seconds > 0:
+            self._db.execute(
+                f"DELETE FROM {self._table} WHERE created_at < ?",
+                (self._now() - self._ttl_seconds,),
+            )
+
+    def _remember_locked(self, key: str, blob: bytes) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+
+        if len(blob) > self._max_memory_bytes:
+            return
+
+        self._memory[key] = blob
+        self._memory_bytes += len(blob)
+        while self._memory_bytes > self._max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+                return json.loads(blob)
+
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                f"SELECT value, created_at FROM {self._table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            blob, created_at = row
+            if self._ttl_seconds > 0 and created_at < self._now() - self._ttl_seconds:
+                self._db.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+                return None
+
+            self._remember_locked(key, blob)
+            return json.loads(blob)
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        blob = json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+        with self._lock:
+            self._remember_locked(key, blob)
+            if self._db is not None:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self._table} (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, blob, self._now()),
+                )
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old)
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+
+
+RESULT_CACHE = ResultCache(
+    max_memory_bytes=RESULT_CACHE_MAX_MB * 1024 * 1024,
+    db_path=RESULT_CACHE_PATH or None,
+    ttl_seconds=RESULT_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,193 @@
+"""
+Rule-based pre-extraction of the BolV1 fields that follow fixed patterns.
+
+One compiled alternation is scanned over the document text in a single pass;
+section labels ("Ship From", "Consignee", ...) met along the way decide whether
+a "City, ST 12345" line is the origin or the destination. Every hit carries a
+confidence: labelled values score high, bare tokens low, and conflicting
+candidates for a single-valued field are discounted.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from backend.schemas.bol_v1 import LineItem
+
+
+_ID = r"[A-Z0-9][A-Z0-9\-]*\d[A-Z0-9\-]*(?![a-z])"
+# "#", "No.", "Number" and the separator before a value on the same line
+_LABEL_TAIL = r"(?:[ \t]*(?:NO\.?|NUMBER|NBR|#))?(?:[ \t]*[:#][ \t]*|[ \t]+)"
+_END = r"(?![A-Za-z])"
+
+_PATTERN = re.compile(
+    "|".join(
+        [
+            # Labelled identifiers: "BOL #: 12345", "B/L No. A-778", "PRO: 1234567", "PO# 4500123"
+            rf"(?i:\b(?:B/?L|BOL|BILL\s+OF\s+LADING){_END}{_LABEL_TAIL})(?P<bol>{_ID})",
+            rf"(?i:\bPRO{_END}{_LABEL_TAIL})(?P<pro>{_ID})",
+            rf"(?i:\b(?:P\.?O\.?|PURCHASE\s+ORDER|CUST(?:OMER)?\s+ORDER){_END}{_LABEL_TAIL})(?P<po>{_ID})",
+            # A bare "BOL-889977" style token (no label)
+            r"\b(?P<bol_token>BOL-?\d{4,})\b",
+            # Dates, with a shipping-specific or generic label
+            r"(?i:\b(?P<ship_label>SHIP(?:MENT)?\s+DATE|DATE\s+SHIPPED|PICK\s*-?\s*UP\s+DATE)|\bDATE)[ \t]*:?[ \t]*"
+            r"(?P<date>\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}-\d{2}-\d{2}|[A-Z][a-z]{2,8}\.?[ \t]+\d{1,2},?[ \t]+\d{4})",
+            # Section labels that give the addresses after them their role
+            r"(?i:\b(?P<origin_label>SHIP\s+FROM|SHIPPER|ORIGIN|PICK\s*-?\s*UP\s+AT)\b)",
+            r"(?i:\b(?P<destination_label>SHIP\s+TO|CONSIGNEE|DESTINATION|DELIVER\s+TO)\b)",
+            # "Dallas, TX 75201" / "Saint Paul, MN 55101-1234"
+            r"(?P<city>[A-Z][A-Za-z.'\-]*(?:[ ][A-Z][A-Za-z.'\-]*){0,2}),[ \t]*(?P<state>[A-Z]{2})[ \t]+"
+            r"(?P<zip>\d{5})(?:-\d{4})?\b",
+            # "Class: 77.5", "Freight Class 85"
+            r"(?i:\b(?:FREIGHT\s+)?CLASS[ \t]*:?[ \t]*)(?P<freight_class>\d{2,3}(?:\.5)?)\b",
+        ]
+    )
+)
+
+_STATES = frozenset(
+    "AL AK AZ AR CA CO CT DE DC FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO MT NE NV NH NJ NM NY "
+    "NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY PR "
+    "AB BC MB NB NL NS NT NU ON PE QC SK YT".split()
+)
+_DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y", "%m-%d-%y", "%Y-%m-%d", "%b %d %Y", "%B %d %Y")
+
+# Confidence of a single hit, by how it was found
+_LABELLED = 0.9
+_GENERIC_DATE = 0.7
+_BARE_TOKEN = 0.7
+_LOCATION = 0.85
+# Applied when a single-valued field has conflicting candidates of the same strength
+_CONFLICT_FACTOR = 0.6
+
+
+@dataclass(frozen=True)
+class RuleHit:
+    path: str  # BolV1 path, e.g. "bol_number", "origin.postal_code"
+    value: Any
+    confidence: float
+    start: int  # offset in the text
+
+
+@dataclass(frozen=True)
+class RuleExtraction:
+    values: Dict[str, Any]  # BolV1-shaped
+    confidences: Dict[str, float]  # path -> confidence of each value in values
+    freight_classes: List[str] = field(default_factory=list)  # distinct classes named in the text
+
+    def covers(self, path: str) -> bool:
+        """True if path (or, for an object like "origin", any field under it) has a value."""
+        return any(p == path or p.startswith(path + ".") for p in self.confidences)
+
+    @property
+    def confidence(self) -> float:
+        """Lowest confidence among the values (0.0 when there are none)."""
+        return min(self.confidences.values(), default=0.0)
+
+
+def _parse_date(raw: str) -> Optional[str]:
+    value = " ".join(raw.replace(",", " ").replace(".", " ").split())
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def _scan(text: str) -> Tuple[List[RuleHit], List[str]]:
+    hits: List[RuleHit] = []
+    classes: List[str] = []
+    section: Optional[str] = None
+
+    for m in _PATTERN.finditer(text):
+        kind = m.lastgroup  # the value group of whichever alternative matched
+        start = m.start()
+
+        if kind == "bol":
+            hits.append(RuleHit("bol_number", m.group("bol"), _LABELLED, start))
+        elif kind == "bol_token":
+            hits.append(RuleHit("bol_number", m.group("bol_token"), _BARE_TOKEN, start))
+        elif kind == "pro":
+            hits.append(RuleHit("pro_number", m.group("pro"), _LABELLED, start))
+        elif kind == "po":
+            hits.append(RuleHit("po_numbers", m.group("po"), _LABELLED, start))
+        elif kind == "date":
+            parsed = _parse_date(m.group("date"))
+            if parsed:
+                confidence = _LABELLED if m.group("ship_label") else _GENERIC_DATE
+                hits.append(RuleHit("shipment_date", parsed, confidence, start))
+        elif kind == "origin_label":
+            section = "origin"
+        elif kind == "destination_label":
+            section = "destination"
+        elif kind == "zip":
+            if section and m.group("state") in _STATES:
+                hits.append(RuleHit(f"{section}.city", m.group("city"), _LOCATION, start))
+                hits.append(RuleHit(f"{section}.state", m.group("state"), _LOCATION, start))
+                hits.append(RuleHit(f"{section}.postal_code", m.group("zip"), _LOCATION, start))
+        elif kind == "freight_class":
+            classes.append(m.group("freight_class"))
+
+    return hits, classes
+
+
+def _set_path(target: Dict[str, Any], path: str, value: Any) -> None:
+    head, _, rest = path.partition(".")
+    if rest:
+        _set_path(target.setdefault(head, {}), rest, value)
+    else:
+        target[head] = value
+
+
+def extract_rules(text: str, *, min_confidence: float = 0.0) -> RuleExtraction:
+    """Pattern-matched BolV1 values of text; values below min_confidence are dropped."""
+    hits, classes = _scan(text)
+
+    by_path: Dict[str, List[RuleHit]] = {}
+    for hit in hits:
+        by_path.setdefault(hit.path, []).append(hit)
+
+    values: Dict[str, Any] = {}
+    confidences: Dict[str, float] = {}
+    for path, candidates in by_path.items():
+        if path == "po_numbers":
+            # A list field: every labelled PO, first-seen order
+            pos = list(dict.fromkeys(h.value for h in candidates))
+            value, confidence = pos, min(h.confidence for h in candidates)
+        else:
+            best = max(candidates, key=lambda h: (h.confidence, -h.start))
+            value, confidence = best.value, best.confidence
+            # Weaker candidates (e.g. a generic "Date:") don't undermine a labelled one
+            if any(h.value != value and h.confidence >= confidence for h in candidates):
+                confidence *= _CONFLICT_FACTOR
+        if confidence >= min_confidence:
+            _set_path(values, path, value)
+            confidences[path] = round(confidence, 3)
+
+    return RuleExtraction(values=values, confidences=confidences, freight_classes=list(dict.fromkeys(classes)))
+
+
+def fill_freight_class(payload: Dict[str, Any], rules: RuleExtraction) -> Dict[str, Any]:
+    """
+    Give line items without a freight class the document's class, when the
+    text names exactly one valid class.
+    """
+    if len(rules.freight_classes) != 1 or not isinstance(payload.get("line_items"), list):
+        return payload
+    freight_class = rules.freight_classes[0]
+    try:
+        LineItem(description="-", freight_class=freight_class)
+    except ValidationError:
+        return payload
+
+    items = [
+        {**item, "freight_class": freight_class}
+        if isinstance(item, dict) and not item.get("freight_class")
+        else item
+        for item in payload["line_items"]
+    ]
+    return {**payload, "line_items": items}
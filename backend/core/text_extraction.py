@@ -1,40 +1,48 @@
 from time import perf_counter
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
-from fitz import open
+from backend.core.document_source import DocumentSource, InMemoryDocument, open_pdf
 
 
-def extract_text_from_pdf(path: str) -> Dict[str, object]:
-    pdf_path = Path(path)
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF not found: {path}")
+def extract_text_from_pdf(source: DocumentSource) -> Dict[str, object]:
+    """Text layer, page sizes and AcroForm values of a PDF path or InMemoryDocument."""
+    if not isinstance(source, InMemoryDocument) and not Path(source).exists():
+        raise FileNotFoundError(f"PDF not found: {source}")
 
     t0 = perf_counter()
 
-    doc = open(pdf_path)
     page_texts: List[str] = []
+    page_sizes: List[Tuple[float, float]] = []
     form_fields: Dict[str, str] = {}
-
-    for page in doc:
-        # Normal text extraction
-        page_texts.append(page.get_text())
-
-        # Form fields (AcroForm widgets)
-        for w in page.widgets() or []:
-            if w.field_name and w.field_value is not None:
-                value = str(w.field_value).strip()
-                # Keep only meaningful values (avoid empty)
-                if value:
-                    form_fields[w.field_name] = value
+    form_field_names: List[str] = []
+
+    with open_pdf(source) as doc:
+        page_count = len(doc)
+        for page in doc:
+            # Normal text extraction
+            page_texts.append(page.get_text())
+            page_sizes.append((page.rect.width, page.rect.height))
+
+            # Form fields (AcroForm widgets)
+            for w in page.widgets() or []:
+                if w.field_name:
+                    form_field_names.append(w.field_name)
+                if w.field_name and w.field_value is not None:
+                    value = str(w.field_value).strip()
+                    # Keep only meaningful values (avoid empty)
+                    if value:
+                        form_fields[w.field_name] = value
 
     full_text = "\n\n".join(page_texts)
 
     return {
         "text": full_text,
-        "page_count": len(doc),
+        "page_count": page_count,
         "method": "pdf_text",
         "page_texts": page_texts,
+        "page_sizes": page_sizes,
         "form_fields": form_fields,
+        "form_field_names": form_field_names,  # every widget, filled or not
         "timings_ms": {"text_extraction_ms": int((perf_counter() - t0) * 1000)},
     }
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from backend.core.config import PAGE_QUALITY_MIN_CHARS, PAGE_QUALITY_THRESHOLD
+
+
+BOL_KEYWORDS = (
+    "bill of lading",
+    "shipper",
+    "consignee",
+    "carrier",
+    "scac",
+    "pro",
+    "freight",
+    "class",
+    "nmfc",
+    "weight",
+    "pieces",
+    "qty",
+    "ship from",
+    "ship to",
+    "po",
+    "seal",
+    "trailer",
+)
+
+_KEYWORD_RE = re.compile(r"\b(" + "|".join(re.escape(k) for k in BOL_KEYWORDS) + r")\b", re.IGNORECASE)
+_TOKEN_RE = re.compile(r"\S+")
+# Words: letters with at least one vowel and no long consonant runs (OCR/encoding garbage has neither)
+_WORD_RE = re.compile(r"^(?=.*[aeiouyAEIOUY])(?!.*[b-df-hj-np-tv-xzB-DF-HJ-NP-TV-XZ]{5})[A-Za-z][A-Za-z'\-]*$")
+# Numbers and identifiers: 1200, 77.5, BOL-889977, 12/31/2024, (555)
+_NUMERIC_RE = re.compile(r"^[(#$]?[A-Za-z]{0,4}[\d][\d,./:\-]*[A-Za-z]{0,3}[)%]?$")
+_PUNCT = ".,:;!?()[]{}\"'"
+
+# Characters per 10k pt² that count as a "full" page; a letter page holds ~50 at body size
+_DENSITY_TARGET = 20.0
+
+
+@dataclass(frozen=True)
+class PageQuality:
+    page: int  # 1-based
+    score: float  # 0..1
+    printable_ratio: float
+    word_ratio: float
+    keyword_hits: int
+    density: Optional[float]  # characters per 10k pt², None if page size unknown
+    passed: bool
+
+
+def _printable_ratio(text: str) -> float:
+    chars = [c for c in text if not c.isspace()]
+    if not chars:
+        return 0.0
+    good = sum(1 for c in chars if c.isprintable() and c != "\ufffd" and not ("\ue000" <= c <= "\uf8ff"))
+    return good / len(chars)
+
+
+def _word_ratio(text: str) -> float:
+    tokens = [t.strip(_PUNCT) for t in _TOKEN_RE.findall(text)]
+    tokens = [t for t in tokens if t]
+    if not tokens:
+        return 0.0
+    good = sum(1 for t in tokens if _WORD_RE.match(t) or _NUMERIC_RE.match(t))
+    return good / len(tokens)
+
+
+def score_page_text(
+    text: str,
+    *,
+    page: int,
+    page_size: Optional[Tuple[float, float]] = None,
+    threshold: float = PAGE_QUALITY_THRESHOLD,
+    min_chars: int = PAGE_QUALITY_MIN_CHARS,
+) -> PageQuality:
+    """
+    Score how usable a page's text layer is, without OCR.
+
+    Combines:
+      - printable ratio (broken font encodings produce U+FFFD / private-use glyphs)
+      - share of dictionary-like tokens (words with vowels, numbers, identifiers)
+      - BOL keyword hits
+      - glyph/area density (a near-empty text layer over a full page => scan)
+
+    A page passes if it has at least min_chars characters and score >= threshold.
+    """
+    stripped = text.strip()
+    printable = _printable_ratio(stripped)
+    words = _word_ratio(stripped)
+    keyword_hits = len({m.lower() for m in _KEYWORD_RE.findall(stripped)})
+
+    density = None
+    density_score = 1.0
+    if page_size and page_size[0] > 0 and page_size[1] > 0:
+        area = page_size[0] * page_size[1]
+        density = len(stripped) * 10_000 / area
+        density_score = min(density / _DENSITY_TARGET, 1.0)
+
+    score = (
+        0.35 * printable
+        + 0.35 * words
+        + 0.15 * min(keyword_hits / 3, 1.0)
+        + 0.15 * density_score
+    )
+    score = round(score, 3)
+
+    return PageQuality(
+        page=page,
+        score=score,
+        printable_ratio=round(printable, 3),
+        word_ratio=round(words, 3),
+        keyword_hits=keyword_hits,
+        density=round(density, 2) if density is not None else None,
+        passed=len(stripped) >= min_chars and score >= threshold,
+    )
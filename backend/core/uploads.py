@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from tempfile import NamedTemporaryFile
+from typing import Awaitable, BinaryIO, Callable, Optional
+
+from fastapi import UploadFile
+
+from backend.core.config import UPLOAD_SPOOL_DIR
+
+
+CHUNK_BYTES = 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(f"File too large (max {max_bytes // (1024 * 1024)}MB)")
+        self.max_bytes = max_bytes
+
+
+class EmptyUpload(ValueError):
+    def __init__(self) -> None:
+        super().__init__("Empty file")
+
+
+@dataclass(frozen=True)
+class SpooledUpload:
+    path: str
+    size: int
+    sha256: str
+
+
+@dataclass(frozen=True)
+class BufferedUpload:
+    data: bytes
+    size: int
+    sha256: str
+
+
+def discard(path: Optional[str]) -> None:
+    """Delete a spooled file, ignoring one that is already gone."""
+    if not path:
+        return
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _spool_file(suffix: str):
+    return NamedTemporaryFile(delete=False, suffix=suffix, dir=UPLOAD_SPOOL_DIR or None)
+
+
+async def _spool(read: Callable[[int], Awaitable[bytes]], *, suffix: str, max_bytes: int) -> SpooledUpload:
+    """
+    Copy chunks from read() into the spool dir; disk writes run on a worker thread.
+
+    The SHA-256 is computed on the way, and the copy stops with UploadTooLarge
+    as soon as max_bytes is exceeded, so at most one chunk is held in memory.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    tmp = await asyncio.to_thread(_spool_file, suffix)
+    try:
+        while chunk := await read(CHUNK_BYTES):
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            digest.update(chunk)
+            await asyncio.to_thread(tmp.write, chunk)
+        if size == 0:
+            raise EmptyUpload()
+        await asyncio.to_thread(tmp.close)
+    except BaseException:
+        tmp.close()
+        discard(tmp.name)
+        raise
+    return SpooledUpload(path=tmp.name, size=size, sha256=digest.hexdigest())
+
+
+async def spool_stream(src: BinaryIO, *, suffix: str, max_bytes: int) -> SpooledUpload:
+    """Spool a blocking readable stream (e.g. a zip member); reads run on a worker thread too."""
+    return await _spool(lambda n: asyncio.to_thread(src.read, n), suffix=suffix, max_bytes=max_bytes)
+
+
+async def spool_upload(file: UploadFile, *, suffix: str, max_bytes: int) -> SpooledUpload:
+    """
+    Spool a FastAPI UploadFile.
+
+    Rejects on the multipart part size (file.size) before copying anything
+    when the server already knows it.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+    return await _spool(file.read, suffix=suffix, max_bytes=max_bytes)
+
+
+async def read_upload(file: UploadFile, *, max_bytes: int) -> BufferedUpload:
+    """Read a (small) upload into memory in chunks, hashing it on the way; same limits as spool_upload."""
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    digest = hashlib.sha256()
+    chunks: list[bytes] = []
+    size = 0
+    while chunk := await file.read(CHUNK_BYTES):
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        digest.update(chunk)
+        chunks.append(chunk)
+    if size == 0:
+        raise EmptyUpload()
+    return BufferedUpload(data=b"".join(chunks), size=size, sha256=digest.hexdigest())
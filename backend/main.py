@@ -1,9 +1,36 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 
+from backend.api.middleware import RequestSizeLimitMiddleware
 from backend.api.routes.health import router as health_router
 from backend.api.routes.extractions import router as extractions_router
+from backend.core.config import JOB_SWEEP_INTERVAL_SECONDS, MAX_UPLOAD_MB
+from backend.core.executor import EXECUTOR
+from backend.core.jobs.store import JOB_STORE, run_sweeper
+from backend.core.prompt_compaction import load_tokenizer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(load_tokenizer)
+    sweeper = asyncio.create_task(run_sweeper(JOB_STORE, JOB_SWEEP_INTERVAL_SECONDS))
+    yield
+    sweeper.cancel()
+    with suppress(asyncio.CancelledError):
+        await sweeper
+    EXECUTOR.shutdown()
+
+
+app = FastAPI(title="AI Document Extraction API", version="0.1.0", lifespan=lifespan)
 
-app = FastAPI(title="AI Document Extraction API", version="0.1.0")
+# Multipart framing and form fields on top of the file itself
+_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    limits={"/v1/extractions": MAX_UPLOAD_MB * 1024 * 1024 + _MULTIPART_OVERHEAD_BYTES},
+)
 
 app.include_router(health_router)
 app.include_router(extractions_router)
@@ -13,11 +13,29 @@ class APIValidation(BaseModel):
     warnings: List[str]
 
 
+class APIPageDecision(BaseModel):
+    page: int
+    score: float
+    source: str
+    ocr_source: Optional[str] = None
+    ocr_dpi: Optional[int] = None
+    ocr_confidence: Optional[float] = None
+
+
 class APIMeta(BaseModel):
     request_id: str
     method: str
     page_count: Optional[int]
     timings_ms: Dict[str, int]
+    page_decisions: Optional[List[APIPageDecision]] = None
+    form_template: Optional[str] = None
+    layout_template: Optional[str] = None
+    llm_skipped: bool = False
+    llm_fields: Optional[List[str]] = None
+    rule_fields: Optional[Dict[str, float]] = None
+    llm_model: Optional[str] = None
+    tokens: Optional[Dict[str, int]] = None
+    pages: Optional[List[int]] = None
 
 
 class ExtractionResponse(BaseModel):
@@ -26,3 +44,27 @@ class ExtractionResponse(BaseModel):
     data: Optional[BolV1] = None
     validation: Optional[APIValidation] = None
     meta: APIMeta
+
+
+class PacketMeta(BaseModel):
+    request_id: str
+    method: str
+    page_count: Optional[int]
+    timings_ms: Dict[str, int]
+
+
+class PacketExtractionResponse(BaseModel):
+    """A file split into several documents (?split_packets=true); one result per document, in page order."""
+    status: Literal["completed"]
+    job_id: Optional[str] = None
+    documents: List[ExtractionResponse]
+    meta: PacketMeta
+
+
+class BatchItemResult(BaseModel):
+    """One NDJSON line of a streamed batch: a document's outcome, in completion order."""
+    index: int  # position of the document in the batch
+    filename: str
+    status: Literal["completed", "failed"]
+    result: Optional[ExtractionResponse] = None
+    error: Optional[str] = None
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel
 
 JobStatus = Literal["queued", "running", "completed", "failed"]
+BatchStatus = Literal["queued", "running", "completed"]
 
 
 class JobCreateResponse(BaseModel):
@@ -17,3 +18,25 @@ class JobGetResponse(BaseModel):
     status: JobStatus
     result: Optional[dict[str, Any]] = None
     error: Optional[str] = None
+
+
+class BatchCreateResponse(BaseModel):
+    batch_id: str
+    status: BatchStatus
+    total: int
+    job_ids: List[str]
+
+
+class BatchJobStatus(BaseModel):
+    job_id: str
+    filename: str
+    status: Optional[JobStatus] = None  # None once the job has expired
+
+
+class BatchGetResponse(BaseModel):
+    batch_id: str
+    status: BatchStatus
+    total: int
+    counts: Dict[str, int]  # jobs per status, plus "expired"
+    progress: float  # share of jobs that are finished (completed, failed or expired), 0..1
+    jobs: List[BatchJobStatus]
@@ -0,0 +1,35 @@
+"""
+Print the fingerprint of a blank (or filled) carrier form, to start a layout template.
+
+    python -m backend.scripts.layout_fingerprint form.pdf [other.pdf ...]
+
+With several files, also prints the distance of each to the first, which is a
+guide for max_distance.
+"""
+import json
+import sys
+
+from backend.core.layout_templates import HASH_SIZE, first_page
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+
+    ref = None
+    for path in sys.argv[1:]:
+        page = first_page(path)
+        if page is None:
+            print(f"{path}: only single-page documents can be fingerprinted")
+            continue
+        fingerprint, aspect = page
+        hex_digits = HASH_SIZE * HASH_SIZE // 4
+        print(json.dumps({"file": path, "fingerprint": f"{fingerprint:0{hex_digits}x}", "aspect": round(aspect, 3)}))
+        if ref is None:
+            ref = fingerprint
+        else:
+            print(f"  distance to {sys.argv[1]}: {(fingerprint ^ ref).bit_count()} bits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Per-page OCR time of each available engine on the same rendered page.
+
+    python -m backend.scripts.ocr_engine_benchmark [file.pdf] [pages]
+
+The difference between engines is the fixed per-call overhead pytesseract pays
+(process spawn, temp file, model load); tesserocr reuses a loaded handle.
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from backend.core.ocr_engines import create_ocr_engine
+
+PDF_PATH = Path("tests/fixtures/test_bol.pdf")
+DPI = 300
+
+
+def _render(path: Path) -> Image.Image:
+    with fitz.open(path) as doc:
+        pix = doc[0].get_pixmap(dpi=DPI, colorspace=fitz.csGRAY, alpha=False)
+        return Image.frombytes("L", (pix.width, pix.height), pix.samples)
+
+
+def main() -> None:
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else PDF_PATH
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    img = _render(path)
+    print(f"{path} page 1 at {DPI} DPI ({img.width}x{img.height}), {pages} pages per engine\n")
+
+    for kind in ("pytesseract", "tesserocr"):
+        try:
+            engine = create_ocr_engine(kind)
+            engine.image_to_text(img, DPI)  # warm-up
+        except Exception as e:  # library, binary or language data missing
+            print(f"{kind:12s} unavailable: {e}")
+            continue
+
+        times = []
+        for _ in range(pages):
+            t0 = time.perf_counter()
+            engine.image_to_text(img, DPI)
+            times.append((time.perf_counter() - t0) * 1000)
+        print(f"{kind:12s} median {statistics.median(times):7.1f} ms/page   min {min(times):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
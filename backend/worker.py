@@ -0,0 +1,190 @@
+"""
+Standalone extraction worker.
+
+    JOB_STORE_BACKEND=sqlite JOB_QUEUE_BACKEND=sqlite python -m backend.worker --concurrency 8
+
+Claims jobs the API enqueued on JOB_QUEUE and runs them through the same
+pipeline as the in-process path. Run as many worker processes (on the same
+host) as the CPU allows; they coordinate only through the queue's leases.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+from contextlib import suppress
+from typing import Optional
+
+from backend.core.config import PIPELINE_IO_WORKERS
+from backend.core.executor import EXECUTOR
+from backend.core.jobs.queue import JOB_QUEUE, QueuedJob, SQLiteJobQueue
+from backend.core.jobs.runner import run_extraction_job
+from backend.core.jobs.store import JOB_STORE, JobStore
+from backend.core.llm.base import LLMClient
+from backend.core.llm.factory import get_llm_client
+from backend.core.prompt_compaction import load_tokenizer
+
+logger = logging.getLogger("backend.worker")
+
+
+def _unlink(path: Optional[str]) -> None:
+    if not path:
+        return
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class Worker:
+    """Claims queued jobs and runs up to `concurrency` of them at a time."""
+
+    def __init__(
+        self,
+        *,
+        queue: SQLiteJobQueue,
+        store: JobStore,
+        llm: LLMClient,
+        concurrency: int = 1,
+        poll_interval: float = 0.5,
+        owner: Optional[str] = None,
+    ) -> None:
+        self.queue = queue
+        self.store = store
+        self.llm = llm
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    async def _keep_lease(self, job_id: str) -> None:
+        # Renew well before the lease runs out so a slow page never looks like a crash.
+        while True:
+            await asyncio.sleep(max(self.queue.lease_seconds / 3, 0.1))
+            if not await self.queue.extend(job_id, self.owner):
+                logger.warning("lost lease on job %s", job_id)
+                return
+
+    async def process(self, job: QueuedJob) -> None:
+        file_path = job.payload.get("file_path")
+
+        if job.attempts > self.queue.max_attempts:
+            # Every earlier claim ended without an ack: the job keeps killing workers.
+            await self.store.set_error(job.job_id, f"Gave up after {job.attempts - 1} attempts")
+            _unlink(file_path)
+            await self.queue.ack(job.job_id, self.owner)
+            return
+
+        if await self.store.get(job.job_id) is None:
+            # Expired from the job store while waiting; nobody can fetch the result.
+            _unlink(file_path)
+            await self.queue.ack(job.job_id, self.owner)
+            return
+
+        heartbeat = asyncio.create_task(self._keep_lease(job.job_id))
+        try:
+            recorded = await run_extraction_job(
+                store=self.store,
+                job_id=job.job_id,
+                schema=job.payload["schema"],
+                file_path=file_path,
+                llm=self.llm,
+                cache_key=job.payload.get("cache_key"),
+                split_packets=job.payload.get("split_packets", False),
+                page_cache=job.payload.get("page_cache", True),
+                # Renewing doubles as the check: False once another worker holds the lease
+                still_leased=lambda: self.queue.extend(job.job_id, self.owner),
+            )
+        finally:
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+        if not recorded:
+            logger.warning("abandoned job %s: its lease went to another worker", job.job_id)
+            return
+        await self.queue.ack(job.job_id, self.owner)
+
+    async def run_once(self) -> bool:
+        """Claim and process a single job; False if the queue was empty."""
+        job = await self.queue.claim(self.owner)
+        if job is None:
+            return False
+        await self.process(job)
+        return True
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Process jobs until stop is set, then let the in-flight ones finish."""
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks: set[asyncio.Task] = set()
+
+        async def _process(job: QueuedJob) -> None:
+            try:
+                await self.process(job)
+            except Exception:
+                # The lease will lapse and another claim retries the job.
+                logger.exception("job %s crashed", job.job_id)
+            finally:
+                slots.release()
+
+        while not stop.is_set():
+            await slots.acquire()
+            try:
+                job = await self.queue.claim(self.owner)
+            except Exception:
+                logger.exception("claiming a job failed")
+                job = None
+            if job is None:
+                slots.release()
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stop.wait(), self.poll_interval)
+                continue
+
+            task = asyncio.create_task(_process(job))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _main(concurrency: int, poll_interval: float) -> None:
+    if JOB_QUEUE is None:
+        raise SystemExit("JOB_QUEUE_BACKEND=sqlite is required to run a worker")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+
+    await asyncio.to_thread(load_tokenizer)
+    worker = Worker(
+        queue=JOB_QUEUE,
+        store=JOB_STORE,
+        llm=get_llm_client(),
+        concurrency=concurrency,
+        poll_interval=poll_interval,
+    )
+    logger.info("worker %s started (concurrency=%d)", worker.owner, worker.concurrency)
+    try:
+        await worker.run(stop)
+    finally:
+        EXECUTOR.shutdown()
+    logger.info("worker %s stopped", worker.owner)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run extraction jobs from the durable job queue.")
+    parser.add_argument("--concurrency", type=int, default=PIPELINE_IO_WORKERS, help="jobs processed at once")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="seconds to wait when the queue is empty")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(_main(args.concurrency, args.poll_interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,3 +2,12 @@ import os
 
 # Force mock LLM for all pytest runs
 os.environ["USE_MOCK_LLM"] = "1"
+
+# Run OCR inline so tests can monkeypatch it (process pools can't see patches)
+os.environ["PIPELINE_CPU_WORKERS"] = "0"
+
+# Tests fake Tesseract by patching pytesseract, so pin that engine even where tesserocr is installed
+os.environ["OCR_ENGINE"] = "pytesseract"
+
+# Tests reuse identical generated pages with different fake OCR/LLM output; page cache tests opt back in
+os.environ["PAGE_CACHE_ENABLED"] = "0"
@@ -0,0 +1,42 @@
+"""Fake LLM and PDF builders shared by the pipeline tests."""
+from typing import Iterable, Optional, Tuple
+
+import fitz
+
+from backend.core.llm.base import LLMClient, LLMExtractRequest, LLMExtractResponse
+
+
+class RecordingLLM(LLMClient):
+    """Records every request and answers with json_out; without json_out, any call fails the test."""
+
+    model_name = "recording"
+
+    def __init__(self, json_out=None, usage=None):
+        self.json_out = json_out
+        self.usage = usage
+        self.requests = []
+
+    def extract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
+        if self.json_out is None:
+            raise AssertionError("LLM should not be called")
+        self.requests.append(request)
+        return LLMExtractResponse(schema=request.schema, json=self.json_out, usage=self.usage)
+
+
+def text_pdf(
+    path,
+    pages: Iterable[str],
+    *,
+    fontsize: float = 10,
+    size: Optional[Tuple[float, float]] = None,
+    margin: float = 40,
+) -> str:
+    """A PDF with one page per text (A4 unless size is given as (width, height)); returns its path."""
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page(width=size[0], height=size[1]) if size else doc.new_page()
+        r = page.rect
+        page.insert_textbox(fitz.Rect(margin, margin, r.width - margin, r.height - margin), text, fontsize=fontsize)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
@@ -3,6 +3,8 @@ from pathlib import Path
 import pytest
 from fastapi.testclient import TestClient
 
+from backend.core.executor import EXECUTOR
+from backend.core.jobs.store import InMemoryJobStore
 from backend.main import app
 
 client = TestClient(app)
@@ -42,3 +44,22 @@ def test_async_job_happy_path(monkeypatch):
     if body2["status"] == "completed":
         assert body2["result"] is not None
         assert body2["result"]["status"] == "completed"
+
+
+def test_async_job_gives_the_slot_back_if_it_cannot_be_created(monkeypatch):
+    class BrokenStore(InMemoryJobStore):
+        async def create(self, job_id):
+            raise RuntimeError("job store unavailable")
+
+    monkeypatch.setattr("backend.api.routes.extractions.JOB_STORE", BrokenStore(ttl_seconds=60))
+    before = EXECUTOR.in_flight
+
+    with FIXTURE.open("rb") as f:
+        r = TestClient(app, raise_server_exceptions=False).post(
+            "/v1/extractions?async_mode=true&no_cache=true",
+            data={"schema_name": "bol_v1"},
+            files={"file": ("test_bol.pdf", f, "application/pdf")},
+        )
+
+    assert r.status_code == 500
+    assert EXECUTOR.in_flight == before
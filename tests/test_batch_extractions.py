@@ -0,0 +1,119 @@
+import asyncio
+import io
+import json
+import zipfile
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api.routes.extractions import _BatchDoc, _BatchStream
+from backend.core.executor import EXECUTOR
+from backend.core.jobs.sqlite_store import SQLiteJobStore
+from backend.core.jobs.store import InMemoryJobStore
+from backend.main import app
+
+client = TestClient(app)
+FIXTURE = Path(__file__).parent / "fixtures" / "test_bol.pdf"
+
+
+def _zip_of(**members: bytes) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+    return buf.getvalue()
+
+
+def _batch_files():
+    pdf = FIXTURE.read_bytes()
+    archive = _zip_of(**{"day/b.pdf": pdf, "day/notes.txt": b"not a document"})
+    return [
+        ("files", ("a.pdf", pdf, "application/pdf")),
+        ("files", ("dump.zip", archive, "application/zip")),
+    ]
+
+
+@pytest.mark.integration
+def test_batch_streams_one_ndjson_line_per_document():
+    with client.stream("POST", "/v1/extractions/batch?no_cache=true", files=_batch_files()) as r:
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in r.iter_lines() if line]
+
+    assert sorted((line["index"], line["filename"]) for line in lines) == [(0, "a.pdf"), (1, "dump.zip/day/b.pdf")]
+    for line in lines:
+        assert line["status"] == "completed", line
+        assert line["result"]["data"]["bol_number"] == "MOCK-BOL-0001"
+
+
+@pytest.mark.integration
+def test_async_batch_reports_aggregate_progress():
+    r = client.post("/v1/extractions/batch?async_mode=true&no_cache=true", files=_batch_files())
+
+    assert r.status_code == 202, r.text
+    body = r.json()
+    assert body["total"] == 2 and len(body["job_ids"]) == 2
+
+    # BackgroundTasks have run by the time TestClient returns
+    r2 = client.get(f"/v1/extractions/batches/{body['batch_id']}")
+    assert r2.status_code == 200, r2.text
+    progress = r2.json()
+    assert progress["status"] == "completed"
+    assert progress["counts"]["completed"] == 2
+    assert progress["progress"] == 1.0
+    assert [j["filename"] for j in progress["jobs"]] == ["a.pdf", "dump.zip/day/b.pdf"]
+
+    job = client.get(f"/v1/extractions/{body['job_ids'][1]}").json()
+    assert job["result"]["data"]["bol_number"] == "MOCK-BOL-0001"
+
+
+def test_batch_stream_releases_slots_once_even_if_never_started(tmp_path):
+    docs = []
+    for n in range(2):
+        path = tmp_path / f"{n}.pdf"
+        path.write_bytes(FIXTURE.read_bytes())
+        docs.append(_BatchDoc(index=n, filename=path.name, path=str(path), sha256=""))
+    before = EXECUTOR.in_flight
+    EXECUTOR.reserve_many(2)
+
+    stream = _BatchStream(docs, use_cache=False, slots=2)
+    asyncio.run(stream.close())  # client disconnected before the first line
+    asyncio.run(stream.close())
+
+    assert EXECUTOR.in_flight == before
+    assert not any(Path(doc.path).exists() for doc in docs)
+
+
+def test_batch_rejects_archives_without_documents():
+    files = [("files", ("dump.zip", _zip_of(**{"notes.txt": b"hello"}), "application/zip"))]
+    r = client.post("/v1/extractions/batch", files=files)
+    assert r.status_code == 400
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_store_batches_track_job_status_and_expire_with_jobs(tmp_path, backend):
+    if backend == "memory":
+        store = InMemoryJobStore(ttl_seconds=60)
+    else:
+        store = SQLiteJobStore(path=str(tmp_path / "jobs.sqlite"), ttl_seconds=60)
+
+    async def main():
+        await store.create("job-1")
+        await store.create("job-2")
+        await store.create_batch("batch-1", [("job-1", "a.pdf"), ("job-2", "b.pdf")])
+        await store.set_error("job-2", "boom")
+        live = await store.get_batch("batch-1")
+
+        store._ttl_seconds = -1  # everything is now expired
+        await store.sweep_expired()
+        return live, await store.get_batch("batch-1"), await store.get_batch("missing")
+
+    live, expired, missing = asyncio.run(main())
+
+    assert [(i.job_id, i.filename, i.status) for i in live.items] == [
+        ("job-1", "a.pdf", "queued"),
+        ("job-2", "b.pdf", "failed"),
+    ]
+    assert expired is None
+    assert missing is None
@@ -0,0 +1,119 @@
+import asyncio
+import re
+import time
+
+import fitz
+import pytest
+
+from backend.core.llm.base import LLMClient, LLMExtractRequest, LLMExtractResponse
+from backend.core.pipeline.bol_extract import extract_bol_async, extract_bol_sync
+from backend.core.pipeline.chunked import page_groups, reconcile_totals
+from helpers import text_pdf
+
+PAGES = 8
+
+
+class PageLLM(LLMClient):
+    """Returns one line item per "ITEM n" line; header fields only when the BOL header is in the text."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = []
+
+    def _answer(self, request):
+        self.requests.append(request)
+        items = [
+            {"description": f"Item {n}", "pieces": 2, "weight_lb": 100.0}
+            for n in re.findall(r"ITEM (\d+)", request.text)
+        ]
+        payload = {"line_items": items, "confidence": 0.9, "warnings": []}
+        if "BOL #" in request.text:
+            payload.update({"bol_number": "LONG-1", "total_weight_lb": 1600.0})
+        else:
+            payload.update({"bol_number": "CHUNK", "confidence": 0.8, "warnings": ["continuation page"]})
+        return LLMExtractResponse(schema=request.schema, json=payload, usage={"prompt_tokens": 10})
+
+    def extract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
+        time.sleep(self.delay)
+        return self._answer(request)
+
+    async def aextract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
+        await asyncio.sleep(self.delay)
+        return self._answer(request)
+
+
+@pytest.fixture
+def long_pdf(tmp_path):
+    pages = []
+    for p in range(PAGES):
+        text = "STRAIGHT BILL OF LADING\nBOL #: LONG-1\n" if p == 0 else f"Continued - page {p + 1}\n"
+        text += f"Qty Description Weight\nITEM {2 * p + 1} 2 pallets 100 lb\nITEM {2 * p + 2} 2 pallets 100 lb\n"
+        pages.append(text)
+    return text_pdf(tmp_path / "long.pdf", pages)
+
+
+@pytest.fixture(autouse=True)
+def chunking(monkeypatch):
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.CHUNKED_MIN_PAGES", 4)
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.CHUNK_PAGES", 2)
+
+
+def test_page_groups():
+    assert page_groups(["a", "b", "c"], min_pages=4, pages_per_chunk=2) == [["a", "b", "c"]]
+    assert page_groups(list("abcde"), min_pages=4, pages_per_chunk=2) == [["a", "b"], ["c", "d"], ["e"]]
+    assert page_groups(list("abcde"), min_pages=0, pages_per_chunk=2) == [list("abcde")]
+
+
+def test_reconcile_totals_fills_missing_and_flags_mismatch():
+    items = [{"description": "a", "pieces": 2, "weight_lb": 10.0}, {"description": "b", "pieces": 3, "weight_lb": 5.5}]
+
+    out = reconcile_totals({"line_items": items, "total_weight_lb": 20.0})
+
+    assert out["total_pieces"] == 5
+    assert out["total_weight_lb"] == 20.0  # stated total wins
+    assert out["warnings"] == ["total_weight_lb 20.0 differs from the line item sum 15.5"]
+    # A partial sum is not a total
+    assert "total_pieces" not in reconcile_totals({"line_items": [{"description": "a"}, {"description": "b", "pieces": 1}]})
+    # A non-numeric stated total is kept as-is for validation to reject
+    assert reconcile_totals({"line_items": items, "total_pieces": "1 pallet"})["total_pieces"] == "1 pallet"
+
+
+def test_long_document_is_extracted_in_page_groups(long_pdf):
+    llm = PageLLM()
+
+    result = extract_bol_sync(schema="bol_v1", file_path=long_pdf, llm=llm)
+
+    assert len(llm.requests) == PAGES // 2
+    assert llm.requests[0].missing_fields != ("line_items",)  # the first group asks for the header too
+    assert all(r.missing_fields == ("line_items",) for r in llm.requests[1:])
+    data = result.data
+    assert data.bol_number == "LONG-1"
+    assert [i.description for i in data.line_items] == [f"Item {n}" for n in range(1, 2 * PAGES + 1)]
+    assert data.total_pieces == 4 * PAGES
+    assert data.total_weight_lb == 1600.0
+    assert data.confidence == 0.8
+    assert result.meta.timings_ms["llm_chunks"] == PAGES // 2
+    assert result.meta.tokens["prompt_tokens"] == 10 * (PAGES // 2)
+
+
+def test_chunks_run_in_parallel(long_pdf):
+    llm = PageLLM(delay=0.3)
+
+    t0 = time.perf_counter()
+    result = asyncio.run(extract_bol_async(schema="bol_v1", file_path=long_pdf, llm=llm))
+    elapsed = time.perf_counter() - t0
+
+    assert result.validation.is_valid
+    assert elapsed < 0.3 * (PAGES // 2) * 0.75
+    assert result.meta.timings_ms["llm_chunk_max_ms"] >= 300
+
+
+def test_short_documents_use_one_call(tmp_path):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "STRAIGHT BILL OF LADING  BOL #: S-1  ITEM 1")
+    doc.save(str(tmp_path / "short.pdf"))
+    llm = PageLLM()
+
+    extract_bol_sync(schema="bol_v1", file_path=str(tmp_path / "short.pdf"), llm=llm)
+
+    assert len(llm.requests) == 1
@@ -0,0 +1,68 @@
+import pickle
+from pathlib import Path
+
+import fitz
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.core.document_source import InMemoryDocument, for_worker_process
+from backend.core.ocr_extraction import extract_text_from_file_ocr
+from backend.core.text_extraction import extract_text_from_pdf
+from backend.main import app
+
+FIXTURE = Path(__file__).parent / "fixtures" / "test_bol.pdf"
+
+
+def test_pdf_text_from_memory_matches_file():
+    from_file = extract_text_from_pdf(str(FIXTURE))
+    from_memory = extract_text_from_pdf(InMemoryDocument(data=memoryview(FIXTURE.read_bytes()), suffix=".pdf"))
+
+    for key in ("text", "page_count", "page_texts", "page_sizes", "form_fields"):
+        assert from_memory[key] == from_file[key]
+
+
+def test_ocr_reads_pdf_bytes_without_a_file(monkeypatch):
+    doc = fitz.open()
+    for n in range(1, 4):
+        doc.new_page(width=100 * n, height=50)
+    data = doc.tobytes()
+    doc.close()
+
+    monkeypatch.setattr(
+        "pytesseract.image_to_string",
+        lambda img, lang="eng", config="": f"page {img.width // 100}",
+    )
+
+    out = extract_text_from_file_ocr(InMemoryDocument(data=memoryview(data), suffix=".pdf"), dpi=72)
+
+    assert out["page_texts"] == ["page 1", "page 2", "page 3"]
+
+
+def test_in_memory_sources_can_be_sent_to_ocr_processes():
+    source = InMemoryDocument(data=memoryview(b"%PDF-1.4"), suffix=".pdf")
+
+    with pytest.raises(TypeError):
+        pickle.dumps(source)
+    assert pickle.loads(pickle.dumps(for_worker_process(source))).data == b"%PDF-1.4"
+
+
+@pytest.mark.integration
+def test_small_sync_upload_is_processed_without_a_spool_file(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.core.uploads.UPLOAD_SPOOL_DIR", str(tmp_path))
+    seen = []
+
+    def recording_pdf_text(source):
+        seen.append(source)
+        return extract_text_from_pdf(source)
+
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.extract_text_from_pdf", recording_pdf_text)
+
+    with FIXTURE.open("rb") as f:
+        r = TestClient(app).post(
+            "/v1/extractions?no_cache=true",
+            files={"file": ("test_bol.pdf", f, "application/pdf")},
+        )
+
+    assert r.status_code == 200, r.text
+    assert isinstance(seen[0], InMemoryDocument)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.core.executor import ExecutorSaturated, PipelineExecutor
+from backend.main import app
+
+client = TestClient(app)
+FIXTURE = Path(__file__).parent / "fixtures" / "test_bol.pdf"
+
+
+def test_executor_rejects_beyond_capacity():
+    ex = PipelineExecutor(io_workers=1, cpu_workers=0, max_queue=1, retry_after_seconds=7)
+    ex.reserve()
+    ex.reserve()
+
+    with pytest.raises(ExecutorSaturated) as info:
+        ex.reserve()
+    assert info.value.retry_after_seconds == 7
+
+    ex.release()
+    ex.reserve()
+    assert ex.in_flight == 2
+
+
+def test_executor_runs_blocking_calls_off_the_loop():
+    ex = PipelineExecutor(io_workers=1, cpu_workers=0, max_queue=0, retry_after_seconds=1)
+
+    async def main():
+        return await ex.run_io(lambda a, b: (a + b, threading.current_thread().name), 2, b=3)
+
+    total, thread_name = asyncio.run(main())
+
+    assert total == 5
+    assert thread_name.startswith("pipeline-io")
+    ex.shutdown()
+
+
+def test_saturated_executor_returns_503(monkeypatch):
+    full = PipelineExecutor(io_workers=1, cpu_workers=0, max_queue=0, retry_after_seconds=4)
+    full.reserve()
+    monkeypatch.setattr("backend.api.routes.extractions.EXECUTOR", full)
+
+    for query in ("?no_cache=true", "?async_mode=true&no_cache=true"):
+        with FIXTURE.open("rb") as f:
+            files = {"file": ("test_bol.pdf", f, "application/pdf")}
+            r = client.post(f"/v1/extractions{query}", data={"schema_name": "bol_v1"}, files=files)
+
+        assert r.status_code == 503, r.text
+        assert r.headers["Retry-After"] == "4"
@@ -0,0 +1,108 @@
+import json
+
+import fitz
+import pytest
+
+from backend.core.form_mapping import FormTemplateRegistry, _template_from_dict, apply_template, load_templates
+from backend.core.pipeline.bol_extract import extract_bol_sync
+from helpers import RecordingLLM
+
+
+TEMPLATE = {
+    "name": "acme_bol",
+    "fingerprint": ["BOL_NO", "SHIPPER", "CONSIGNEE", "SHIP_DATE", "WEIGHT"],
+    "fields": {
+        "bol_number": "BOL_NO",
+        "shipper.name": "SHIPPER",
+        "consignee.name": "CONSIGNEE",
+        "shipment_date": {"fields": ["SHIP_DATE"], "type": "date", "formats": ["%m/%d/%Y"]},
+        "total_weight_lb": {"fields": ["WEIGHT"], "type": "float"},
+    },
+}
+
+
+def _form_pdf(path, values):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_textbox(
+        fitz.Rect(320, 60, 560, 400),
+        "STRAIGHT BILL OF LADING - SHORT FORM\n"
+        "Ship From: see form fields on the left of this page\n"
+        "Ship To: see form fields on the left of this page\n"
+        "Received, subject to the classifications and tariffs in effect on the date of issue.",
+        fontsize=9,
+    )
+    for i, (name, value) in enumerate(values.items()):
+        w = fitz.Widget()
+        w.field_name = name
+        w.field_type = fitz.PDF_WIDGET_TYPE_TEXT
+        w.field_value = value
+        w.rect = fitz.Rect(72, 100 + 30 * i, 300, 120 + 30 * i)
+        page.add_widget(w)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    path = tmp_path / "templates"
+    path.mkdir()
+    (path / "acme.json").write_text(json.dumps(TEMPLATE))
+    reg = FormTemplateRegistry(load_templates(str(path)))
+    monkeypatch.setattr("backend.core.pipeline.prefill.FORM_TEMPLATES", reg)
+    return reg
+
+
+def test_values_are_converted_to_bol_types(registry):
+    mapping = registry.map_form(
+        {"BOL_NO": " B-100 ", "SHIPPER": "Acme", "CONSIGNEE": "Globex", "SHIP_DATE": "03/04/2024", "WEIGHT": "1,250 lb"}
+    )
+
+    assert mapping.complete
+    assert mapping.values["bol_number"] == "B-100"
+    assert mapping.values["shipper"] == {"name": "Acme"}
+    assert mapping.values["shipment_date"] == "2024-03-04"
+    assert mapping.values["total_weight_lb"] == 1250.0
+
+
+def test_unmatched_fingerprint_falls_back_to_llm(registry):
+    assert registry.map_form({"FOO": "1", "BAR": "2", "BOL_NO": "B-1"}) is None
+
+
+def test_invalid_widget_values_are_left_unresolved():
+    template = _template_from_dict({**TEMPLATE, "fields": {**TEMPLATE["fields"], "total_weight_lb": "WEIGHT"}})
+    mapping = apply_template(template, {"BOL_NO": "B-1", "WEIGHT": "heavy"})
+
+    assert mapping.unresolved == ["total_weight_lb"]
+    assert "total_weight_lb" not in mapping.values
+
+
+def test_fully_mapped_form_skips_the_llm(tmp_path, registry):
+    pdf = _form_pdf(
+        tmp_path / "form.pdf",
+        {"BOL_NO": "B-100", "SHIPPER": "Acme", "CONSIGNEE": "Globex", "SHIP_DATE": "03/04/2024", "WEIGHT": "500"},
+    )
+
+    result = extract_bol_sync(schema="bol_v1", file_path=pdf, llm=RecordingLLM())
+
+    assert result.validation.is_valid
+    assert result.data.bol_number == "B-100"
+    assert result.meta.form_template == "acme_bol"
+    assert result.meta.llm_skipped
+    assert "llm_extract_ms" not in result.meta.timings_ms
+
+
+def test_partially_mapped_form_asks_llm_for_the_rest(tmp_path, registry):
+    pdf = _form_pdf(tmp_path / "form.pdf", {"SHIPPER": "Acme", "CONSIGNEE": "Globex", "SHIP_DATE": "", "WEIGHT": "500"})
+    llm = RecordingLLM({"bol_number": "LLM-1", "shipper": {"name": "Wrong"}, "total_weight_lb": 1.0, "confidence": 0.5})
+
+    result = extract_bol_sync(schema="bol_v1", file_path=pdf, llm=llm)
+
+    assert llm.requests[0].missing_fields == ("bol_number",)
+    assert llm.requests[0].known_fields["shipper"] == {"name": "Acme"}
+    assert result.data.bol_number == "LLM-1"
+    assert result.data.shipper.name == "Acme"
+    assert result.data.total_weight_lb == 500.0
+    assert not result.meta.llm_skipped
+    assert result.meta.llm_fields == ["bol_number"]
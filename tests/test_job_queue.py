@@ -0,0 +1,138 @@
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.core.jobs.queue import QueueFull, SQLiteJobQueue
+from backend.core.jobs.sqlite_store import SQLiteJobStore
+from backend.core.llm.mock import MockLLMClient
+from backend.main import app
+from backend.worker import Worker
+
+FIXTURE = Path(__file__).parent / "fixtures" / "test_bol.pdf"
+
+
+def test_queue_leases_jobs_to_one_worker_and_retries_after_lease_expiry(tmp_path):
+    path = str(tmp_path / "queue.sqlite")
+    api = SQLiteJobQueue(path=path, lease_seconds=60, max_attempts=3)
+    worker_a = SQLiteJobQueue(path=path, lease_seconds=60, max_attempts=3)
+    worker_b = SQLiteJobQueue(path=path, lease_seconds=60, max_attempts=3)
+
+    async def main():
+        await api.enqueue("job-1", {"schema": "bol_v1"})
+        first = await worker_a.claim("a")
+        second = await worker_b.claim("b")  # job-1 is leased to "a"
+
+        # "a" dies without acking: once its lease runs out "b" gets the job again
+        worker_a._db.execute("UPDATE queue SET lease_until = 0")
+        retried = await worker_b.claim("b")
+        stale_extend = await worker_a.extend("job-1", "a")
+        await worker_b.ack("job-1", "b")
+        return first, second, retried, stale_extend, await api.depth()
+
+    first, second, retried, stale_extend, depth = asyncio.run(main())
+
+    assert (first.job_id, first.attempts, first.payload) == ("job-1", 1, {"schema": "bol_v1"})
+    assert second is None
+    assert (retried.job_id, retried.attempts, retried.lease_owner) == ("job-1", 2, "b")
+    assert stale_extend is False
+    assert depth == 0
+
+
+def test_queue_rejects_enqueue_when_full(tmp_path):
+    queue = SQLiteJobQueue(path=str(tmp_path / "queue.sqlite"), lease_seconds=60, max_attempts=3, max_pending=1)
+
+    async def main():
+        await queue.enqueue("job-1", {})
+        await queue.enqueue("job-2", {})
+
+    with pytest.raises(QueueFull):
+        asyncio.run(main())
+
+
+def test_worker_fails_job_after_max_attempts(tmp_path):
+    queue = SQLiteJobQueue(path=str(tmp_path / "queue.sqlite"), lease_seconds=60, max_attempts=1)
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.sqlite"), ttl_seconds=60)
+    worker = Worker(queue=queue, store=store, llm=MockLLMClient(), owner="w")
+
+    async def main():
+        await store.create("job-1")
+        await queue.enqueue("job-1", {"schema": "bol_v1", "file_path": str(tmp_path / "gone.pdf")})
+        await queue.claim("crashed")  # first attempt never acks
+        queue._db.execute("UPDATE queue SET lease_until = 0")
+        processed = await worker.run_once()
+        return processed, await store.get("job-1"), await queue.depth()
+
+    processed, rec, depth = asyncio.run(main())
+
+    assert processed is True
+    assert rec.status == "failed"
+    assert "attempts" in rec.error
+    assert depth == 0
+
+
+def test_worker_abandons_job_whose_lease_was_lost(tmp_path):
+    queue = SQLiteJobQueue(path=str(tmp_path / "queue.sqlite"), lease_seconds=60, max_attempts=3)
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.sqlite"), ttl_seconds=60)
+    upload = tmp_path / "upload.pdf"
+    shutil.copy(FIXTURE, upload)
+
+    class StallingLLM(MockLLMClient):
+        def extract_json(self, request):
+            # The worker stalls past its lease and another worker claims the job meanwhile
+            with queue._lock:
+                queue._db.execute("UPDATE queue SET lease_until = 0")
+            queue._claim("other")
+            return super().extract_json(request)
+
+    worker = Worker(queue=queue, store=store, llm=StallingLLM(), owner="w")
+
+    async def main():
+        await store.create("job-1")
+        await queue.enqueue("job-1", {"schema": "bol_v1", "file_path": str(upload)})
+        await worker.run_once()
+        return await store.get("job-1"), await queue.claim("third")
+
+    rec, reclaim = asyncio.run(main())
+
+    assert rec.status == "running"  # no result from the worker that lost the lease
+    assert upload.exists()  # the new lease holder still needs the upload
+    assert reclaim is None
+    assert queue._db.execute("SELECT lease_owner FROM queue").fetchone() == ("other",)
+
+
+@pytest.mark.integration
+def test_api_only_enqueues_and_worker_completes_job(tmp_path, monkeypatch):
+    queue = SQLiteJobQueue(path=str(tmp_path / "queue.sqlite"), lease_seconds=60, max_attempts=3)
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.sqlite"), ttl_seconds=60)
+    monkeypatch.setattr("backend.api.routes.extractions.JOB_QUEUE", queue)
+    monkeypatch.setattr("backend.api.routes.extractions.JOB_STORE", store)
+
+    def fail_if_run_in_api(*args, **kwargs):
+        raise AssertionError("the API must not run the pipeline in queue mode")
+
+    monkeypatch.setattr("backend.api.routes.extractions._run_job", fail_if_run_in_api)
+
+    client = TestClient(app)
+    upload = tmp_path / "upload.pdf"
+    shutil.copy(FIXTURE, upload)
+    with upload.open("rb") as f:
+        r = client.post(
+            "/v1/extractions?async_mode=true&no_cache=true",
+            data={"schema_name": "bol_v1"},
+            files={"file": ("test_bol.pdf", f, "application/pdf")},
+        )
+
+    assert r.status_code == 202, r.text
+    job_id = r.json()["job_id"]
+    assert client.get(f"/v1/extractions/{job_id}").json()["status"] == "queued"
+
+    worker = Worker(queue=queue, store=store, llm=MockLLMClient())
+    assert asyncio.run(worker.run_once()) is True
+    assert asyncio.run(worker.run_once()) is False
+
+    body = client.get(f"/v1/extractions/{job_id}").json()
+    assert body["status"] == "completed", body
+    assert body["result"]["data"]["bol_number"] == "MOCK-BOL-0001"
@@ -0,0 +1,146 @@
+import asyncio
+import sqlite3
+
+from fastapi.testclient import TestClient
+
+from backend.core.jobs.sqlite_store import SQLiteJobStore
+from backend.core.jobs.store import InMemoryJobStore
+from backend.main import app
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    api = SQLiteJobStore(path=path, ttl_seconds=60)
+    worker = SQLiteJobStore(path=path, ttl_seconds=60)  # e.g. another uvicorn worker
+
+    async def main():
+        await api.create("job-1")
+        await worker.set_status("job-1", "running")
+        await worker.set_result("job-1", {"status": "completed", "data": {"bol_number": "23"}})
+        return await api.get("job-1")
+
+    rec = asyncio.run(main())
+
+    assert rec.status == "completed"
+    assert rec.result == {"status": "completed", "data": {"bol_number": "23"}}
+    assert rec.error is None
+
+
+def test_sqlite_store_records_failures(tmp_path):
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.sqlite"), ttl_seconds=60)
+
+    async def main():
+        await store.create("job-1")
+        await store.set_error("job-1", "boom")
+        return await store.get("job-1"), await store.get("missing")
+
+    rec, missing = asyncio.run(main())
+
+    assert (rec.status, rec.error) == ("failed", "boom")
+    assert missing is None
+
+
+def test_sqlite_store_expires_in_batches(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    store = SQLiteJobStore(path=path, ttl_seconds=60, cleanup_batch=2)
+
+    async def main():
+        for n in range(5):
+            await store.create(f"job-{n}")
+
+    asyncio.run(main())
+    store._now = lambda: 10**10  # everything is now past its TTL
+
+    assert asyncio.run(store.get("job-4")) is None  # expired rows are never returned
+    assert store._cleanup_expired_locked() == 2  # one batch through the index
+    assert asyncio.run(store.sweep_expired()) == 3  # sweeper drains the rest
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 0
+
+
+def test_memory_store_expires_via_heap_without_scanning():
+    store = InMemoryJobStore(ttl_seconds=60)
+    clock = [1000.0]
+    store._now = lambda: clock[0]
+
+    async def main():
+        for n in range(5):
+            clock[0] += 1
+            await store.create(f"job-{n}")
+        clock[0] += 1
+        await store.set_status("job-0", "running")  # refreshes job-0
+
+        clock[0] = 1000 + 4 + 60.5  # job-1..3 are past the TTL
+        hidden = await store.get("job-1")
+        removed = await store.sweep_expired()
+        return hidden, removed
+
+    hidden, removed = asyncio.run(main())
+
+    assert hidden is None
+    assert removed == 3
+    assert sorted(store._jobs) == ["job-0", "job-4"]
+
+
+def test_memory_store_evicts_least_recently_used_finished_jobs():
+    store = InMemoryJobStore(ttl_seconds=60, max_entries=3, max_result_bytes=100)
+
+    async def main():
+        for n in range(3):
+            await store.create(f"job-{n}")
+        await store.set_result("job-1", {"v": "x" * 40})
+        await store.set_result("job-2", {"v": "y" * 40})
+        await store.get("job-1")  # job-1 becomes most recently used
+
+        await store.create("job-3")  # over max_entries: job-2 is the LRU finished job
+        await store.set_result("job-3", {"v": "z" * 60})  # over max_result_bytes: evicts job-1
+
+    asyncio.run(main())
+
+    assert sorted(store._jobs) == ["job-0", "job-3"]  # queued job-0 survives
+    assert store.result_bytes <= 100
+
+
+def test_memory_store_never_evicts_unfinished_jobs():
+    store = InMemoryJobStore(ttl_seconds=60, max_entries=2)
+
+    async def main():
+        for n in range(4):
+            await store.create(f"job-{n}")
+        await store.set_status("job-1", "running")
+        over = sorted(store._jobs)
+
+        await store.set_error("job-0", "boom")
+        await store.set_result("job-1", {"v": 1})  # first finished job evicts the earlier one
+        return over
+
+    over = asyncio.run(main())
+
+    assert over == ["job-0", "job-1", "job-2", "job-3"]  # over the limit rather than dropping live jobs
+    assert sorted(store._jobs) == ["job-1", "job-2", "job-3"]
+    assert list(store._finished) == ["job-1"]
+
+
+def test_memory_store_drops_a_batch_with_its_last_job():
+    store = InMemoryJobStore(ttl_seconds=60, max_entries=2)
+
+    async def main():
+        for n in range(2):
+            await store.create(f"job-{n}")
+        await store.create_batch("batch-1", [("job-0", "a.pdf"), ("job-1", "b.pdf")])
+        await store.set_result("job-0", {"v": 0})
+        await store.set_result("job-1", {"v": 1})
+        await store.create("job-2")  # evicts job-0
+        after_one = await store.get_batch("batch-1")
+        await store.set_result("job-2", {"v": 2})
+        await store.create("job-3")  # evicts job-1, the batch's last job
+        return after_one
+
+    after_one = asyncio.run(main())
+
+    assert [i.status for i in after_one.items] == [None, "completed"]
+    assert store._batches == {} and store._job_batch == {}
+
+
+def test_app_starts_and_stops_the_sweeper():
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.core.jobs.sqlite_store import SQLiteJobStore
+from backend.core.jobs.store import InMemoryJobStore
+from backend.main import app
+
+
+def test_memory_store_wait_for_wakes_on_update():
+    store = InMemoryJobStore(ttl_seconds=60)
+
+    async def main():
+        await store.create("job-1")
+
+        async def finish():
+            await asyncio.sleep(0.05)
+            await store.set_result("job-1", {"ok": True})
+
+        t0 = time.perf_counter()
+        waiter = asyncio.gather(
+            store.wait_for("job-1", known_status="queued", timeout=5),
+            finish(),
+        )
+        rec, _ = await waiter
+        woke_after = time.perf_counter() - t0
+
+        unchanged = await store.wait_for("job-1", known_status="completed", timeout=0.05)
+        return rec, woke_after, unchanged, store._notifier._events
+
+    rec, woke_after, unchanged, leftover_events = asyncio.run(main())
+
+    assert rec.status == "completed"
+    assert woke_after < 1
+    assert unchanged.status == "completed"  # timed out, current state returned
+    assert leftover_events == {}
+
+
+def test_sqlite_store_wait_for_sees_other_processes(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    api = SQLiteJobStore(path=path, ttl_seconds=60)
+    worker = SQLiteJobStore(path=path, ttl_seconds=60)  # another process: no shared events
+
+    async def main():
+        await api.create("job-1")
+
+        async def finish():
+            await asyncio.sleep(0.1)
+            await worker.set_error("job-1", "boom")
+
+        rec, _ = await asyncio.gather(api.wait_for("job-1", known_status="queued", timeout=5), finish())
+        return rec
+
+    rec = asyncio.run(main())
+
+    assert (rec.status, rec.error) == ("failed", "boom")
+
+
+def _finish_later(client, store, job_id, delay=0.2):
+    def run():
+        time.sleep(delay)
+        client.portal.call(store.set_status, job_id, "running")
+        time.sleep(delay)
+        client.portal.call(store.set_result, job_id, {"status": "completed"})
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_get_job_long_polls_until_completion(monkeypatch):
+    store = InMemoryJobStore(ttl_seconds=60)
+    monkeypatch.setattr("backend.api.routes.extractions.JOB_STORE", store)
+
+    with TestClient(app) as client:
+        client.portal.call(store.create, "job-1")
+        assert client.get("/v1/extractions/job-1").json()["status"] == "queued"
+
+        thread = _finish_later(client, store, "job-1")
+        r = client.get("/v1/extractions/job-1?wait=5")
+        thread.join()
+
+    assert r.status_code == 200
+    assert r.json()["status"] == "completed"
+    assert r.json()["result"] == {"status": "completed"}
+
+
+def test_job_events_stream_status_changes(monkeypatch):
+    store = InMemoryJobStore(ttl_seconds=60)
+    monkeypatch.setattr("backend.api.routes.extractions.JOB_STORE", store)
+
+    with TestClient(app) as client:
+        client.portal.call(store.create, "job-1")
+        thread = _finish_later(client, store, "job-1")
+        with client.stream("GET", "/v1/extractions/job-1/events") as r:
+            assert r.headers["content-type"].startswith("text/event-stream")
+            body = "".join(r.iter_text())
+        thread.join()
+
+        assert client.get("/v1/extractions/missing/events").status_code == 404
+
+    events = [
+        (block.split("\n")[0].removeprefix("event: "), json.loads(block.split("\n")[1].removeprefix("data: ")))
+        for block in body.strip().split("\n\n")
+    ]
+    assert [name for name, _ in events] == ["queued", "running", "completed"]
+    assert events[-1][1]["result"] == {"status": "completed"}
@@ -0,0 +1,151 @@
+import fitz
+import pytest
+
+from backend.core.document_source import InMemoryDocument
+from backend.core.layout_templates import LayoutTemplateRegistry, _layout_from_dict, first_page
+from backend.core.ocr_engines import OcrEngine
+from backend.core.pipeline.bol_extract import extract_bol_sync
+from helpers import RecordingLLM
+
+
+VALUES = {"bol": "TF-20240314", "shipper": "Acme Widgets", "date": "03/14/2024"}
+
+
+def _carrier_form(path, values=None):
+    """A printed BOL layout: header bar, labelled boxes, and the values typed into them."""
+    doc = fitz.open()
+    page = doc.new_page(width=612, height=792)
+    page.draw_rect(fitz.Rect(30, 30, 582, 90), color=(0, 0, 0), fill=(0.2, 0.2, 0.2))
+    boxes = {
+        "bol": fitz.Rect(380, 110, 582, 150),
+        "shipper": fitz.Rect(30, 170, 300, 230),
+        "date": fitz.Rect(380, 170, 582, 210),
+    }
+    for name, rect in boxes.items():
+        page.draw_rect(rect, color=(0, 0, 0), width=1.5)
+        page.insert_text((rect.x0 + 4, rect.y0 + 10), name.upper(), fontsize=7)
+        if values:
+            page.insert_text((rect.x0 + 8, rect.y0 + 28), values[name], fontsize=11)
+    for y in range(260, 740, 24):
+        page.draw_line((30, y), (582, y), color=(0, 0, 0), width=0.8)
+    page.draw_rect(fitz.Rect(30, 250, 582, 750), color=(0, 0, 0), width=2)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def _other_carrier_form(path):
+    """A different carrier's layout: a column of field boxes and a shaded block on the right."""
+    doc = fitz.open()
+    page = doc.new_page(width=612, height=792)
+    for i, y in enumerate(range(40, 760, 36)):
+        page.draw_rect(fitz.Rect(30, y, 300, y + 28), color=(0, 0, 0), width=1.5)
+        page.insert_text((36, y + 18), "BOL NUMBER: OC-77" if i == 0 else f"FIELD {i}", fontsize=9)
+    page.draw_rect(fitz.Rect(330, 40, 582, 400), color=(0, 0, 0), fill=(0.3, 0.3, 0.3))
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def _template(fingerprint):
+    return _layout_from_dict(
+        {
+            "name": "tforce_straight_bol",
+            "fingerprint": f"{fingerprint:x}",
+            "aspect": 612 / 792,
+            "zones": {
+                # boxes above in fractions of the page, below the printed labels
+                "BOL_NO": [380 / 612, 125 / 792, 1.0, 150 / 792],
+                "SHIPPER": [30 / 612, 185 / 792, 300 / 612, 230 / 792],
+                "SHIP_DATE": [380 / 612, 185 / 792, 582 / 612, 210 / 792],
+            },
+            "fields": {
+                "bol_number": "BOL_NO",
+                "shipper.name": "SHIPPER",
+                "shipment_date": {"fields": ["SHIP_DATE"], "type": "date"},
+            },
+        }
+    )
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    blank, _ = first_page(_carrier_form(tmp_path / "blank.pdf"))
+    reg = LayoutTemplateRegistry([_template(blank)])
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.LAYOUT_TEMPLATES", reg)
+    return reg
+
+
+def test_filled_forms_match_their_blank_layout(tmp_path):
+    blank, aspect = first_page(_carrier_form(tmp_path / "blank.pdf"))
+    filled, _ = first_page(_carrier_form(tmp_path / "filled.pdf", VALUES))
+    other, _ = first_page(_other_carrier_form(tmp_path / "other.pdf"))
+
+    reg = LayoutTemplateRegistry([_template(blank)])
+
+    assert reg.match(filled, aspect) is not None
+    assert reg.match(other, aspect) is None
+    assert reg.match(filled, 792 / 612) is None  # landscape page
+
+
+def test_known_layout_skips_full_extraction_and_llm(tmp_path, registry):
+    pdf = _carrier_form(tmp_path / "filled.pdf", VALUES)
+
+    result = extract_bol_sync(schema="bol_v1", file_path=pdf, llm=RecordingLLM())
+
+    assert result.validation.is_valid
+    assert result.meta.method == "layout_zones"
+    assert result.meta.layout_template == "tforce_straight_bol"
+    assert result.meta.llm_skipped
+    assert result.data.bol_number == "TF-20240314"
+    assert result.data.shipper.name == "Acme Widgets"
+    assert result.data.shipment_date.isoformat() == "2024-03-14"
+    assert {"layout_match_ms", "layout_zones_ms"} <= set(result.meta.timings_ms)
+    assert "pdf_text_ms" not in result.meta.timings_ms
+
+
+def test_no_templates_skips_the_fingerprint(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.LAYOUT_TEMPLATES", LayoutTemplateRegistry([]))
+    llm = RecordingLLM({"bol_number": "TF-20240314", "confidence": 0.9})
+
+    result = extract_bol_sync(schema="bol_v1", file_path=_carrier_form(tmp_path / "filled.pdf", VALUES), llm=llm)
+
+    assert result.meta.method == "pdf_text"
+    assert "layout_match_ms" not in result.meta.timings_ms
+
+
+def test_unknown_layout_falls_back_to_the_pipeline(tmp_path, registry):
+    pdf = _other_carrier_form(tmp_path / "other.pdf")
+    llm = RecordingLLM({"bol_number": "X-1", "confidence": 0.9})
+
+    result = extract_bol_sync(schema="bol_v1", file_path=pdf, llm=llm)
+
+    assert len(llm.requests) == 1
+    assert result.meta.method == "pdf_text"
+    assert result.meta.layout_template is None
+
+
+def test_scanned_form_ocrs_only_its_zones(tmp_path, registry, monkeypatch):
+    with fitz.open(_carrier_form(tmp_path / "filled.pdf", VALUES)) as doc:
+        png = doc[0].get_pixmap(dpi=150).tobytes("png")
+
+    class ZoneEngine(OcrEngine):
+        def __init__(self):
+            self.sizes = []
+            self.answers = iter(VALUES.values())
+
+        def image_to_text(self, img, dpi=None):
+            self.sizes.append(img.size)
+            return next(self.answers)
+
+    engine = ZoneEngine()
+    monkeypatch.setattr("backend.core.ocr_extraction.get_ocr_engine", lambda: engine)
+
+    source = InMemoryDocument(data=memoryview(png), suffix=".png")
+    result = extract_bol_sync(schema="bol_v1", source=source, llm=RecordingLLM())
+
+    assert result.meta.method == "layout_zones"
+    assert result.data.bol_number == "TF-20240314"
+    # Three small crops, never the 1275x1650 page
+    assert len(engine.sizes) == 3
+    assert all(w * h < 0.1 * 1275 * 1650 for w, h in engine.sizes)
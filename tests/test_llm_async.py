@@ -0,0 +1,78 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from backend.core.llm.base import LLMClient, LLMExtractRequest, LLMExtractResponse
+from backend.core.llm.mock import MockLLMClient
+from backend.core.pipeline import bol_extract
+from backend.core.pipeline.bol_extract import extract_bol_async
+
+
+class _SyncOnlyClient(LLMClient):
+    def __init__(self):
+        self.threads = []
+
+    def extract_json(self, request):
+        self.threads.append(threading.current_thread())
+        return MockLLMClient().extract_json(request)
+
+
+def test_default_aextract_json_does_not_block_the_loop():
+    client = _SyncOnlyClient()
+    req = LLMExtractRequest(schema="bol_v1", text="BILL OF LADING")
+
+    resp = asyncio.run(client.aextract_json(req))
+
+    assert isinstance(resp, LLMExtractResponse)
+    assert resp.json["bol_number"] == "MOCK-BOL-0001"
+    assert client.threads[0] is not threading.main_thread()
+
+
+def test_mock_aextract_json_matches_sync():
+    req = LLMExtractRequest(schema="bol_v1", text="CONSIGNEE: someone")
+    mock = MockLLMClient()
+
+    assert asyncio.run(mock.aextract_json(req)) == mock.extract_json(req)
+
+
+def test_async_pipeline_keeps_rules_and_validation_off_the_loop(monkeypatch):
+    threads = {}
+
+    def spy(name, fn):
+        def wrapped(*args, **kwargs):
+            threads[name] = threading.current_thread()
+            return fn(*args, **kwargs)
+
+        monkeypatch.setattr(bol_extract, name, wrapped)
+
+    spy("prefill", bol_extract.prefill)
+    spy("_validate_and_build", bol_extract._validate_and_build)
+
+    pdf = str(Path("tests/fixtures/test_bol.pdf"))
+    result = asyncio.run(extract_bol_async(schema="bol_v1", file_path=pdf, llm=MockLLMClient()))
+
+    assert result.validation.is_valid
+    assert set(threads) == {"prefill", "_validate_and_build"}
+    assert all(t is not threading.main_thread() for t in threads.values())
+
+
+@pytest.mark.integration
+def test_async_pipeline_runs_many_documents_concurrently(monkeypatch):
+    def fake_ocr(path: str, *args, **kwargs):
+        return {"text": "BILL OF LADING\nBOL NUMBER: 23", "timings_ms": {"ocr_ms": 5}}
+
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.extract_text_from_file_ocr", fake_ocr)
+    img_path = str(Path("tests/fixtures/sample_image.png"))
+
+    async def main():
+        return await asyncio.gather(
+            *(extract_bol_async(schema="bol_v1", file_path=img_path, llm=MockLLMClient()) for _ in range(20))
+        )
+
+    results = asyncio.run(main())
+
+    assert len({r.meta.request_id for r in results}) == 20
+    assert all(r.meta.method == "ocr" and r.validation.is_valid for r in results)
+    assert all("llm_extract_ms" in r.meta.timings_ms for r in results)
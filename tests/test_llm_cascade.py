@@ -0,0 +1,122 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from backend.core.llm.base import LLMClient, LLMExtractRequest, LLMExtractResponse
+from backend.core.llm.cascade import CascadeLLMClient
+from backend.core.pipeline.bol_extract import extract_bol_sync
+from helpers import text_pdf
+
+FIXTURE = str(Path(__file__).parent / "fixtures" / "test_bol.pdf")
+
+
+class FixedLLM(LLMClient):
+    def __init__(self, json_out=None, error=None):
+        self.json_out = json_out
+        self.error = error
+        self.calls = 0
+
+    def extract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return LLMExtractResponse(schema=request.schema, json=self.json_out)
+
+
+def _payload(bol_number="B-1", confidence=0.9):
+    return {"bol_number": bol_number, "confidence": confidence}
+
+
+def _request():
+    return LLMExtractRequest(schema="bol_v1", text="BILL OF LADING")
+
+
+def test_confident_cheap_tier_is_not_escalated():
+    small, large = FixedLLM(_payload("SMALL")), FixedLLM(_payload("LARGE"))
+    cascade = CascadeLLMClient([("small", small), ("large", large)], min_confidence=0.7)
+
+    resp = cascade.extract_json(_request())
+
+    assert resp.json["bol_number"] == "SMALL"
+    assert resp.model == "small"
+    assert large.calls == 0
+    assert resp.timings_ms["llm_tier"] == 1
+    assert resp.timings_ms["llm_escalations"] == 0
+    assert "llm_tier1_ms" in resp.timings_ms and "llm_tier2_ms" not in resp.timings_ms
+
+
+@pytest.mark.parametrize(
+    "cheap",
+    [
+        FixedLLM(_payload(confidence=0.3)),  # low confidence
+        FixedLLM({"confidence": 0.9}),  # fails BolV1 validation
+        FixedLLM(error=ValueError("bad JSON")),  # call failed
+    ],
+)
+def test_weak_answers_escalate(cheap):
+    cascade = CascadeLLMClient([("small", cheap), ("large", FixedLLM(_payload("LARGE")))])
+
+    resp = asyncio.run(cascade.aextract_json(_request()))
+
+    assert resp.json["bol_number"] == "LARGE"
+    assert resp.timings_ms["llm_tier"] == 2
+    assert resp.timings_ms["llm_escalations"] == 1
+
+
+def test_best_answer_wins_when_no_tier_is_confident():
+    cascade = CascadeLLMClient(
+        [("small", FixedLLM(_payload("SMALL", 0.5))), ("large", FixedLLM(_payload("LARGE", 0.4)))]
+    )
+
+    resp = cascade.extract_json(_request())
+
+    assert resp.json["bol_number"] == "SMALL"
+    assert resp.timings_ms["llm_escalations"] == 1
+
+
+def test_cascade_timings_reach_pipeline_meta():
+    cascade = CascadeLLMClient([("small", FixedLLM({"confidence": 0.9})), ("large", FixedLLM(_payload("LARGE")))])
+
+    result = extract_bol_sync(schema="bol_v1", file_path=FIXTURE, llm=cascade)
+
+    assert result.data.bol_number == "LARGE"
+    assert result.meta.llm_model == "large"
+    assert result.meta.timings_ms["llm_escalations"] == 1
+
+
+def test_chunked_documents_do_not_escalate_line_item_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.CHUNKED_MIN_PAGES", 4)
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.CHUNK_PAGES", 2)
+    pages = []
+    for p in range(6):
+        text = "BILL OF LADING\nBOL #: C-1\n" if p == 0 else f"Continued - page {p + 1}\n"
+        pages.append(text + f"Qty Description Weight\nITEM {p + 1} 1 pallet of machine parts 100 lb\n")
+    pdf = text_pdf(tmp_path / "long.pdf", pages)
+
+    class SmallLLM(FixedLLM):
+        def extract_json(self, request):
+            self.calls += 1
+            payload = {"line_items": [{"description": "pallet"}], "confidence": 0.95}
+            if not request.missing_fields:
+                payload["bol_number"] = "C-1"
+            return LLMExtractResponse(schema=request.schema, json=payload)
+
+    small, large = SmallLLM(), FixedLLM(_payload("LARGE"))
+    cascade = CascadeLLMClient([("small", small), ("large", large)])
+
+    result = extract_bol_sync(schema="bol_v1", file_path=pdf, llm=cascade)
+
+    assert small.calls == 3
+    assert large.calls == 0
+    assert result.meta.timings_ms["llm_escalations"] == 0
+    assert result.data.bol_number == "C-1"
+    assert len(result.data.line_items) == 3
+
+
+def test_invalid_payload_is_reported_not_raised():
+    result = extract_bol_sync(schema="bol_v1", file_path=FIXTURE, llm=FixedLLM({"confidence": 0.9}))
+
+    assert not result.validation.is_valid
+    assert result.validation.errors
+    assert result.data is None
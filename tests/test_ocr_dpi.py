@@ -0,0 +1,90 @@
+import fitz
+
+from backend.core.llm.mock import MockLLMClient
+from backend.core.ocr_engines import OcrEngine
+from backend.core.ocr_extraction import extract_text_from_file_ocr, plan_dpi
+from backend.core.pipeline.bol_extract import extract_bol_sync
+from helpers import text_pdf
+
+
+def _pdf(path, fontsize, lines=12, width=612, height=792):
+    """One page of `lines` text lines at fontsize; fontsize=0 leaves it blank."""
+    text = "\n".join(f"Line {n} handling units and weight" for n in range(lines)) if fontsize else ""
+    return text_pdf(path, [text], fontsize=fontsize or 10, size=(width, height), margin=20)
+
+
+class ScriptedEngine(OcrEngine):
+    """Confidence per call from a script; records the DPI of each call."""
+
+    def __init__(self, confidences):
+        self.confidences = list(confidences)
+        self.dpis = []
+
+    def recognize(self, img, dpi=None):
+        self.dpis.append(dpi)
+        return f"text at {dpi}", self.confidences.pop(0)
+
+    def image_to_text(self, img, dpi=None):
+        return self.recognize(img, dpi)[0]
+
+
+def test_planned_dpi_follows_glyph_size(tmp_path):
+    with fitz.open(_pdf(tmp_path / "large.pdf", fontsize=36, lines=6, width=1224, height=1584)) as doc:
+        large = plan_dpi(doc[0])
+    with fitz.open(_pdf(tmp_path / "normal.pdf", fontsize=10)) as doc:
+        normal = plan_dpi(doc[0])
+    with fitz.open(_pdf(tmp_path / "tiny.pdf", fontsize=5)) as doc:
+        tiny = plan_dpi(doc[0])
+    with fitz.open(_pdf(tmp_path / "blank.pdf", fontsize=0)) as doc:
+        blank = plan_dpi(doc[0])
+
+    assert large == 150
+    assert 200 <= normal <= 300
+    assert tiny >= 400
+    assert blank == 300  # nothing to measure: OCR_DEFAULT_DPI
+
+
+def test_low_confidence_retries_one_step_higher(tmp_path, monkeypatch):
+    engine = ScriptedEngine([40.0, 85.0])
+    monkeypatch.setattr("backend.core.ocr_extraction.get_ocr_engine", lambda: engine)
+    pdf = _pdf(tmp_path / "bol.pdf", fontsize=10)
+
+    out = extract_text_from_file_ocr(pdf, parallel=False)
+
+    first, second = engine.dpis
+    assert second > first
+    assert out["page_dpis"] == [second]
+    assert out["page_confidences"] == [85.0]
+    assert out["page_texts"] == [f"text at {second}"]
+    assert out["timings_ms"]["ocr_dpi_retries"] == 1
+    assert "ocr_dpi_plan_ms" in out["timings_ms"]
+
+
+def test_confident_pages_are_read_once(tmp_path, monkeypatch):
+    engine = ScriptedEngine([92.0])
+    monkeypatch.setattr("backend.core.ocr_extraction.get_ocr_engine", lambda: engine)
+
+    out = extract_text_from_file_ocr(_pdf(tmp_path / "bol.pdf", fontsize=10), parallel=False)
+
+    assert len(engine.dpis) == 1
+    assert out["timings_ms"]["ocr_dpi_retries"] == 0
+
+
+def test_ocr_dpi_is_reported_in_page_decisions(tmp_path, monkeypatch):
+    def fake_ocr(source, *args, **kwargs):
+        return {
+            "text": "BILL OF LADING\nBOL NUMBER: 23",
+            "page_texts": ["BILL OF LADING\nBOL NUMBER: 23"],
+            "page_sources": ["rendered"],
+            "page_dpis": [200],
+            "page_confidences": [88.5],
+            "timings_ms": {"ocr_ms": 5, "ocr_dpi_plan_ms": 1},
+        }
+
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.extract_text_from_file_ocr", fake_ocr)
+
+    result = extract_bol_sync(schema="bol_v1", file_path=_pdf(tmp_path / "scan.pdf", fontsize=0), llm=MockLLMClient())
+
+    decision = result.meta.page_decisions[0]
+    assert (decision.source, decision.ocr_dpi, decision.ocr_confidence) == ("ocr", 200, 88.5)
+    assert result.meta.timings_ms["ocr_dpi_plan_ms"] == 1
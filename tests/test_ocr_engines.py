@@ -0,0 +1,84 @@
+import sys
+import threading
+import time
+import types
+
+import pytest
+from PIL import Image
+
+from backend.core.ocr_engines import OcrEngine, PytesseractEngine, TesserocrEngine, create_ocr_engine
+
+
+class FakeTessAPI:
+    created = 0
+
+    def __init__(self, lang="eng"):
+        if lang != "eng":
+            raise RuntimeError("Failed to init API, possibly an invalid tessdata path")
+        FakeTessAPI.created += 1
+        self.image = None
+        self.dpi = None
+
+    def SetImage(self, img):
+        self.image = img
+
+    def SetSourceResolution(self, dpi):
+        self.dpi = dpi
+
+    def GetUTF8Text(self):
+        time.sleep(0.01)
+        return f"{self.image.width}px@{self.dpi}"
+
+    def Clear(self):
+        self.image = None
+        self.dpi = None
+
+    def End(self):
+        pass
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    FakeTessAPI.created = 0
+    monkeypatch.setitem(sys.modules, "tesserocr", types.SimpleNamespace(PyTessBaseAPI=FakeTessAPI))
+
+
+def test_tesserocr_handles_are_reused_across_pages(fake_tesserocr):
+    engine = TesserocrEngine(pool_size=2)
+
+    texts = [engine.image_to_text(Image.new("L", (100 + n, 10)), 300) for n in range(5)]
+
+    assert texts == [f"{100 + n}px@300" for n in range(5)]
+    assert FakeTessAPI.created == 1  # sequential pages share one initialized handle
+
+
+def test_tesserocr_pool_is_bounded_under_concurrency(fake_tesserocr):
+    engine = TesserocrEngine(pool_size=2)
+    img = Image.new("L", (50, 10))
+
+    threads = [threading.Thread(target=engine.image_to_text, args=(img,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert engine.handles_created == 2
+
+
+def test_auto_falls_back_to_pytesseract(monkeypatch, fake_tesserocr):
+    # Language data that won't load
+    assert isinstance(create_ocr_engine("auto", lang="xyz"), PytesseractEngine)
+    # Library not installed
+    monkeypatch.setitem(sys.modules, "tesserocr", None)
+    assert isinstance(create_ocr_engine("auto"), PytesseractEngine)
+    with pytest.raises(ImportError):
+        create_ocr_engine("tesserocr")
+
+
+def test_incomplete_engine_fails_when_created():
+    class ConfidenceOnly(OcrEngine):
+        def recognize(self, img, dpi=None):
+            return "", None
+
+    with pytest.raises(TypeError):
+        ConfidenceOnly()
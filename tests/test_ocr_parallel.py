@@ -0,0 +1,93 @@
+import io
+import time
+
+import fitz
+import pytest
+from PIL import Image
+
+from backend.core.executor import PipelineExecutor
+from backend.core.ocr_extraction import extract_text_from_file_ocr
+
+
+@pytest.fixture
+def scan_pdf(tmp_path):
+    """4-page PDF whose page n is n*100pt wide, so a render reveals its page number."""
+    path = tmp_path / "scan.pdf"
+    doc = fitz.open()
+    for n in range(1, 5):
+        doc.new_page(width=100 * n, height=50)
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def fake_tesseract(monkeypatch):
+    seen = []
+
+    def image_to_string(img, lang="eng", config=""):
+        page = img.width // 100  # rendered at 72 DPI
+        seen.append(img.mode)
+        # Later pages finish first, so ordering can't come from completion order.
+        time.sleep(0.001 * (4 - page))
+        return f"text of page {page}"
+
+    monkeypatch.setattr("pytesseract.image_to_string", image_to_string)
+    return seen
+
+
+def test_pdf_ocr_returns_pages_in_order_with_per_page_timings(scan_pdf, fake_tesseract):
+    out = extract_text_from_file_ocr(scan_pdf, dpi=72)
+
+    assert out["page_texts"] == [f"text of page {n}" for n in range(1, 5)]
+    assert out["text"] == "\n\n".join(out["page_texts"])
+    assert {f"ocr_page_{n}_ms" for n in range(1, 5)} <= set(out["timings_ms"])
+    assert "ocr_ms" in out["timings_ms"]
+    assert set(fake_tesseract) == {"L"}  # grayscale render
+    assert out["page_sources"] == ["rendered"] * 4
+
+
+def test_pdf_ocr_only_runs_requested_pages(scan_pdf, fake_tesseract):
+    out = extract_text_from_file_ocr(scan_pdf, dpi=72, pages=[3, 1], parallel=False)
+
+    assert out["page_texts"] == ["text of page 1", "text of page 3"]
+    assert "ocr_page_2_ms" not in out["timings_ms"]
+
+
+def test_scanned_pages_reuse_the_embedded_image(tmp_path, monkeypatch):
+    jpeg = io.BytesIO()
+    Image.new("L", (400, 200), 255).save(jpeg, "JPEG")
+
+    doc = fitz.open()
+    scan = doc.new_page(width=200, height=100)
+    scan.insert_image(scan.rect, stream=jpeg.getvalue())
+    mixed = doc.new_page(width=200, height=100)
+    mixed.insert_image(mixed.rect, stream=jpeg.getvalue())
+    mixed.draw_line((0, 50), (200, 50))
+    path = tmp_path / "scan.pdf"
+    doc.save(path)
+    doc.close()
+
+    calls = []
+    # Compare the images as chosen, before preprocessing crops them
+    monkeypatch.setattr("backend.core.ocr_extraction.OCR_PREPROCESS", False)
+    monkeypatch.setattr(
+        "pytesseract.image_to_string",
+        lambda img, lang="eng", config="": calls.append((img.size, config)) or "",
+    )
+
+    out = extract_text_from_file_ocr(str(path), dpi=72, parallel=False)
+
+    assert out["page_sources"] == ["embedded", "rendered"]
+    # native 400x200 pixels at 144 DPI, instead of a 200x100 render at 72 DPI
+    assert calls == [((400, 200), "--dpi 144"), ((200, 100), "--dpi 72")]
+
+
+def test_process_pool_keeps_input_order_and_recycles_workers():
+    ex = PipelineExecutor(io_workers=1, cpu_workers=2, max_queue=0, retry_after_seconds=1, max_tasks_per_child=1)
+    try:
+        results = ex.map_cpu(divmod, [(n, 3) for n in range(6)])
+    finally:
+        ex.shutdown()
+
+    assert results == [divmod(n, 3) for n in range(6)]
@@ -0,0 +1,70 @@
+import io
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from backend.core.document_source import InMemoryDocument
+from backend.core.ocr_extraction import extract_text_from_file_ocr
+from backend.core.ocr_preprocess import preprocess, skew_angle
+
+
+def _page(line_height=30, lines=8, border=0, size=(1200, 900), background=(235, 225, 200)):
+    """Color "photo" of a page: dark bars as text lines, optionally framed by a black border."""
+    img = Image.new("RGB", size, background)
+    draw = ImageDraw.Draw(img)
+    for i in range(lines):
+        top = 150 + i * line_height * 2
+        draw.rectangle((200, top, 900, top + line_height), fill=(20, 20, 30))
+    if border:
+        draw.rectangle((0, 0, size[0] - 1, size[1] - 1), outline=(0, 0, 0), width=border)
+    return img
+
+
+def test_skew_is_measured_and_removed():
+    skewed = _page().rotate(3, expand=True, fillcolor=(235, 225, 200))
+
+    pre = preprocess(skewed, 300)
+
+    assert abs(pre.skew_deg + 3) <= 0.2
+    assert skew_angle(np.asarray(pre.image) < 128) == 0.0
+    assert pre.image.mode == "L"
+    assert set(np.unique(np.asarray(pre.image))) <= {0, 255}
+
+
+def test_border_and_margins_are_cropped():
+    pre = preprocess(_page(border=40))
+
+    # Content spans x 200..900 and 8 lines from y 150, plus a 10 px margin
+    assert pre.image.size == (721, 30 * 15 + 21)
+
+
+def test_large_text_is_downscaled_to_target_x_height():
+    big = _page(line_height=100, lines=8, size=(1600, 2000))
+
+    pre = preprocess(big, 600, target_x_height=25)
+
+    assert abs(pre.scale - 0.5) < 0.01  # 100 px bands ~ 50 px x-height
+    assert abs(pre.dpi - 300) <= 3
+    assert set(pre.timings_ms) == {"gray", "binarize", "deskew", "crop", "scale"}
+
+
+def test_normal_text_is_not_rescaled():
+    pre = preprocess(_page(line_height=40), 300)
+
+    assert pre.scale == 1.0
+    assert pre.dpi == 300
+
+
+def test_image_ocr_gets_preprocessed_input(monkeypatch):
+    seen = []
+    monkeypatch.setattr(
+        "pytesseract.image_to_string",
+        lambda img, lang="eng", config="": seen.append((img.mode, img.size)) or "text",
+    )
+    buf = io.BytesIO()
+    _page(border=40).save(buf, "PNG")
+
+    out = extract_text_from_file_ocr(InMemoryDocument(data=memoryview(buf.getvalue()), suffix=".png"))
+
+    assert seen == [("L", (721, 471))]
+    assert {"ocr_prep_binarize_ms", "ocr_prep_deskew_ms"} <= set(out["timings_ms"])
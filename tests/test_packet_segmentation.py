@@ -0,0 +1,142 @@
+import re
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.core.llm.base import LLMClient, LLMExtractRequest, LLMExtractResponse
+from backend.core.pipeline.bol_extract import extract_packet_sync
+from backend.core.pipeline.segmentation import segment_pages
+from backend.main import app
+from helpers import text_pdf
+
+
+FILLER = "Handling units, weights and descriptions as tendered by the shipper.\n" * 4
+
+PACKET = [
+    f"STRAIGHT BILL OF LADING\nBOL #: 1001\nPage 1 of 2\nShipper: Acme\n{FILLER}",
+    f"BOL #: 1001\nPage 2 of 2\nLine items continued\n{FILLER}",
+    f"STRAIGHT BILL OF LADING\nBOL #: 2002\nShipper: Globex\n{FILLER}",
+    f"BILL OF LADING - SHORT FORM\nBOL #: 3003\nShipper: Initech\n{FILLER}",
+]
+
+
+class EchoLLM(LLMClient):
+    """Answers with the BOL number found in the prompt text."""
+
+    model_name = "echo"
+
+    def extract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
+        m = re.search(r"BOL #: (\d+)", request.text)
+        return LLMExtractResponse(
+            schema=request.schema,
+            json={"bol_number": m.group(1) if m else None, "confidence": 0.9},
+        )
+
+
+def test_page_markers_split_documents():
+    segments = segment_pages(["Page 1 of 2", "Page 2 of 2", "Page 1 of 1"])
+
+    assert [s.pages for s in segments] == [[0, 1], [2]]
+    assert [s.reason for s in segments] == ["first", "page_of"]
+
+
+def test_bol_number_change_starts_a_document():
+    segments = segment_pages(["BOL #: 1001\nShipper", "BOL #: 1001\nmore items", "BOL #: 2002\nShipper"])
+
+    assert [s.pages for s in segments] == [[0, 1], [2]]
+    assert segments[1].reason == "bol_number"
+
+
+def test_continued_page_beats_title():
+    segments = segment_pages(["BILL OF LADING\nitems", "BILL OF LADING (continued)\nitems", "Bill of Lading\nitems"])
+
+    assert [s.pages for s in segments] == [[0, 1], [2]]
+    assert segments[1].reason == "title"
+
+
+def test_layout_change_with_header_block_starts_a_document():
+    pages = ["Shipper: A\nConsignee: B\nCarrier: C", "line items", "Shipper: D\nConsignee: E\nCarrier: F"]
+
+    segments = segment_pages(pages, [(612, 792), (612, 792), (595, 842)])
+
+    assert [s.pages for s in segments] == [[0, 1], [2]]
+    assert segments[1].reason == "layout"
+
+
+def test_packet_yields_one_result_per_document(tmp_path):
+    pdf = text_pdf(tmp_path / "packet.pdf", PACKET)
+
+    packet = extract_packet_sync(schema="bol_v1", file_path=pdf, llm=EchoLLM())
+
+    assert packet.page_count == 4
+    assert [d.meta.pages for d in packet.documents] == [[1, 2], [3], [4]]
+    assert [d.data.bol_number for d in packet.documents] == ["1001", "2002", "3003"]
+    assert len({d.meta.request_id for d in packet.documents} | {packet.request_id}) == 4
+    assert "segmentation_ms" in packet.timings_ms
+
+
+def test_packet_documents_run_at_most_batch_concurrency_at_once(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.BATCH_CONCURRENCY", 2)
+
+    class SlowEchoLLM(EchoLLM):
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.running = self.peak = 0
+
+        def extract_json(self, request):
+            with self.lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            time.sleep(0.05)
+            with self.lock:
+                self.running -= 1
+            return super().extract_json(request)
+
+    llm = SlowEchoLLM()
+    result = extract_packet_sync(schema="bol_v1", file_path=text_pdf(tmp_path / "packet.pdf", PACKET), llm=llm)
+
+    assert len(result.documents) == 3
+    assert llm.peak == 2
+
+
+def test_split_packets_endpoint(tmp_path):
+    pdf = text_pdf(tmp_path / "packet.pdf", PACKET)
+
+    with open(pdf, "rb") as f:
+        r = TestClient(app).post(
+            "/v1/extractions?split_packets=true",
+            data={"schema_name": "bol_v1"},
+            files={"file": ("packet.pdf", f, "application/pdf")},
+        )
+
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["status"] == "completed"
+    assert body["meta"]["page_count"] == 4
+    assert [d["meta"]["pages"] for d in body["documents"]] == [[1, 2], [3], [4]]
+
+
+def test_packet_with_an_invalid_document_is_still_answered_and_cached(tmp_path, monkeypatch):
+    class OneBadLLM(EchoLLM):
+        def extract_json(self, request):
+            resp = super().extract_json(request)
+            if resp.json["bol_number"] == "2002":
+                return LLMExtractResponse(schema=request.schema, json={**resp.json, "line_items": "unreadable"})
+            return resp
+
+    monkeypatch.setattr("backend.api.routes.extractions.LLM", OneBadLLM())
+    pdf = text_pdf(tmp_path / "packet.pdf", [page.replace("Acme", "Acme Partial") for page in PACKET])
+
+    def post():
+        with open(pdf, "rb") as f:
+            return TestClient(app).post(
+                "/v1/extractions?split_packets=true",
+                data={"schema_name": "bol_v1"},
+                files={"file": ("packet.pdf", f, "application/pdf")},
+            )
+
+    r = post()
+    assert r.status_code == 200, r.text
+    assert [d["validation"]["is_valid"] for d in r.json()["documents"]] == [True, False, True]
+    assert post().headers["X-Cache"] == "HIT"
@@ -0,0 +1,152 @@
+import re
+
+import fitz
+import pytest
+
+from backend.core.llm.base import LLMClient, LLMExtractRequest, LLMExtractResponse
+from backend.core.ocr_engines import OcrEngine
+from backend.core.ocr_extraction import extract_text_from_file_ocr
+from backend.core.page_cache import page_digest
+from backend.core.pipeline.bol_extract import extract_bol_sync
+from backend.core.result_cache import ResultCache
+from helpers import text_pdf
+
+
+def _scanned_pdf(path, marks):
+    """One text-less page per mark: a box at a mark-dependent spot, so pages differ only in what they draw."""
+    doc = fitz.open()
+    for mark in marks:
+        page = doc.new_page(width=612, height=792)
+        page.draw_rect(fitz.Rect(50 + 10 * mark, 100, 250 + 10 * mark, 160), color=(0, 0, 0), fill=(0, 0, 0))
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+class CountingEngine(OcrEngine):
+    def __init__(self):
+        self.calls = 0
+
+    def recognize(self, img, dpi=None):
+        self.calls += 1
+        return f"ocr call {self.calls}", 90.0
+
+    def image_to_text(self, img, dpi=None):
+        return self.recognize(img, dpi)[0]
+
+
+class ItemsLLM(LLMClient):
+    """One line item per "ITEM n" line; header fields from the page with the BOL header."""
+
+    model_name = "items"
+
+    def __init__(self):
+        self.requests = []
+
+    def extract_json(self, request: LLMExtractRequest) -> LLMExtractResponse:
+        self.requests.append(request)
+        items = [
+            {"description": f"Item {n}", "pieces": 1, "weight_lb": 10.0}
+            for n in re.findall(r"ITEM (\w+)", request.text)
+        ]
+        payload = {"line_items": items, "confidence": 0.9, "warnings": []}
+        if "BOL #" in request.text:
+            payload["bol_number"] = "PC-1"
+        return LLMExtractResponse(schema=request.schema, json=payload, usage={"prompt_tokens": 10})
+
+
+def _bol_pages(changed_item=None):
+    pages = []
+    for p in range(8):
+        text = "STRAIGHT BILL OF LADING\nBOL #: PC-1\n" if p == 0 else f"Continued - page {p + 1}\n"
+        second = changed_item if (changed_item and p == 6) else str(2 * p + 2)
+        pages.append(text + f"Qty Description Weight\nITEM {2 * p + 1} 1 pallet 10 lb\nITEM {second} 1 pallet 10 lb\n")
+    return pages
+
+
+@pytest.fixture
+def page_cache(monkeypatch):
+    cache = ResultCache(max_memory_bytes=1 << 20)
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.PAGE_CACHE", cache)
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.PAGE_CACHE_ENABLED", True)
+    return cache
+
+
+def test_page_digest_follows_page_content_not_file(tmp_path):
+    first = _scanned_pdf(tmp_path / "a.pdf", [1, 2, 3])
+    corrected = _scanned_pdf(tmp_path / "b.pdf", [1, 9, 3])
+
+    with fitz.open(first) as a, fitz.open(corrected) as b:
+        assert page_digest(a, 1) == page_digest(b, 1)
+        assert page_digest(a, 3) == page_digest(b, 3)
+        assert page_digest(a, 2) != page_digest(b, 2)
+        assert page_digest(a, 1) != page_digest(a, 2)
+
+
+def test_page_digest_ignores_object_numbering(tmp_path):
+    def annotated(path, cover_pages):
+        doc = fitz.open()
+        for _ in range(cover_pages):
+            doc.new_page().insert_text((72, 72), "Fax cover sheet")
+        page = doc.new_page(width=612, height=792)
+        page.insert_text((72, 72), "BOL #: 1001")
+        page.add_text_annot((300, 72), "Received short 2 pallets")
+        doc.save(str(path))
+        doc.close()
+        return str(path)
+
+    # The cover pages shift every object number of the BOL page and its annotation
+    with fitz.open(annotated(tmp_path / "a.pdf", 0)) as a, fitz.open(annotated(tmp_path / "b.pdf", 2)) as b:
+        assert page_digest(a, 1) == page_digest(b, 3)
+
+
+def test_page_cache_keeps_its_own_table(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    results = ResultCache(max_memory_bytes=0, db_path=path)
+    pages = ResultCache(max_memory_bytes=0, db_path=path, table="pages")
+
+    results.set("k", {"v": "result"})
+    pages.set("k", {"v": "page"})
+
+    assert results.get("k") == {"v": "result"}
+    assert pages.get("k") == {"v": "page"}
+
+
+def test_resubmission_only_ocrs_changed_pages(tmp_path, monkeypatch):
+    engine = CountingEngine()
+    monkeypatch.setattr("backend.core.ocr_extraction.get_ocr_engine", lambda: engine)
+    cache = ResultCache(max_memory_bytes=1 << 20)
+
+    first = extract_text_from_file_ocr(_scanned_pdf(tmp_path / "a.pdf", [1, 2, 3]), parallel=False, cache=cache)
+    again = extract_text_from_file_ocr(_scanned_pdf(tmp_path / "b.pdf", [1, 9, 3]), parallel=False, cache=cache)
+
+    assert engine.calls == 4
+    assert first["timings_ms"]["ocr_cache_hits"] == 0
+    assert again["timings_ms"]["ocr_cache_hits"] == 2
+    assert again["page_texts"] == ["ocr call 1", "ocr call 4", "ocr call 3"]
+    assert set(k for k in again["timings_ms"] if k.startswith("ocr_page_")) == {"ocr_page_2_ms"}
+
+
+def test_resubmission_only_re_extracts_changed_page_group(tmp_path, monkeypatch, page_cache):
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.CHUNKED_MIN_PAGES", 4)
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.CHUNK_PAGES", 2)
+    llm = ItemsLLM()
+
+    first = extract_bol_sync(schema="bol_v1", file_path=text_pdf(tmp_path / "a.pdf", _bol_pages()), llm=llm)
+    assert len(llm.requests) == 4
+    assert first.meta.timings_ms["llm_chunk_cache_hits"] == 0
+
+    corrected = text_pdf(tmp_path / "b.pdf", _bol_pages(changed_item="14B"))
+    result = extract_bol_sync(schema="bol_v1", file_path=corrected, llm=llm)
+
+    # Only the group holding page 7 goes to the LLM again; the others are merged from the cache
+    assert len(llm.requests) == 5
+    assert "ITEM 14B" in llm.requests[-1].text
+    assert result.meta.timings_ms["llm_chunk_cache_hits"] == 3
+    assert result.data.bol_number == "PC-1"
+    assert [i.description for i in result.data.line_items][12:14] == ["Item 13", "Item 14B"]
+    assert len(result.data.line_items) == 16
+    assert result.meta.tokens["prompt_tokens"] == 10
+
+    extract_bol_sync(schema="bol_v1", file_path=corrected, llm=llm, page_cache=False)
+    assert len(llm.requests) == 9
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+from backend.core.pipeline.bol_extract import extract_bol_sync
+from backend.core.prompt_compaction import compact_pages, count_tokens, normalize
+from helpers import RecordingLLM
+
+FIXTURE = str(Path(__file__).parent / "fixtures" / "test_bol.pdf")
+
+HEADER_PAGE = """STRAIGHT BILL OF LADING
+BOL #: 7781-22     Ship Date: 03/14/2024
+Shipper: Acme Widgets      Consignee: Globex Corp
+Qty  Description            Weight
+10   Palletized Electronics 1200 lb
+Shipper Signature: ______________________"""
+
+TERMS = (
+    "RECEIVED, subject to the classifications and tariffs in effect on the date of the issue of this "
+    "Bill of Lading, the property described above in apparent good order, except as noted. The carrier "
+    "shall not be liable, and liability limitation applies pursuant to the terms and conditions herein, "
+    "which are hereby agreed to by the shipper."
+)
+
+
+def _llm():
+    return RecordingLLM({"bol_number": "B-1", "confidence": 0.9}, usage={"prompt_tokens": 321, "completion_tokens": 45})
+
+
+def test_normalize_collapses_whitespace_and_signature_rules():
+    assert normalize("Carrier:   TForce\t\tFreight\n\n\n\nSignature: _______") == "Carrier: TForce Freight\n\nSignature:"
+
+
+def test_duplicate_pages_and_boilerplate_are_dropped():
+    out = compact_pages([HEADER_PAGE + "\n\n" + TERMS, "  " + HEADER_PAGE.replace("  ", " ")])
+
+    assert "Palletized Electronics" in out.text
+    assert "apparent good order" not in out.text
+    assert out.pages_deduped == 1
+    assert out.tokens_after < out.tokens_before
+
+
+def test_budget_keeps_opening_and_most_relevant_blocks():
+    filler = "\n\n".join(f"Remarks paragraph number {n} with some notes about handling." for n in range(40))
+    items = "Qty Description Weight Class\n5 Pallets 800 lb 70\n3 Crates 400 lb 85"
+    out = compact_pages([HEADER_PAGE, filler + "\n\n" + items], max_tokens=150)
+
+    assert out.tokens_after <= 150
+    assert out.text.startswith("STRAIGHT BILL OF LADING")
+    assert "5 Pallets 800 lb 70" in out.text
+    assert 0 < out.blocks_cut <= out.blocks_dropped
+
+
+def test_header_is_kept_verbatim():
+    out = compact_pages(["BOL #: 1"], header="FORM FIELDS:\n- BOL_NO: 1\n")
+
+    assert out.text == "FORM FIELDS:\n- BOL_NO: 1\n\nBOL #: 1"
+    assert count_tokens(out.text) == out.tokens_after
+
+
+def test_pipeline_reports_token_counts():
+    llm = _llm()
+
+    result = extract_bol_sync(schema="bol_v1", file_path=FIXTURE, llm=llm)
+
+    tokens = result.meta.tokens
+    assert tokens["prompt_tokens"] == 321 and tokens["completion_tokens"] == 45
+    assert tokens["prompt_text_tokens"] <= tokens["document_tokens"]
+    assert "____" not in llm.requests[0].text
+    assert "prompt_compaction_ms" in result.meta.timings_ms
+
+
+def test_pipeline_warns_when_the_budget_cuts_blocks(monkeypatch):
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.PROMPT_MAX_TOKENS", 40)
+
+    result = extract_bol_sync(schema="bol_v1", file_path=FIXTURE, llm=_llm())
+
+    assert result.meta.timings_ms["prompt_blocks_cut"] > 0
+    assert any("PROMPT_MAX_TOKENS=40" in w for w in result.validation.warnings)
+
+
+def test_no_budget_by_default():
+    result = extract_bol_sync(schema="bol_v1", file_path=FIXTURE, llm=_llm())
+
+    assert result.meta.timings_ms["prompt_blocks_cut"] == 0
+    assert result.validation.warnings == []
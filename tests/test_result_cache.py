@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.core.result_cache import ResultCache, make_cache_key
+from backend.core.text_extraction import extract_text_from_pdf
+from backend.main import app
+
+client = TestClient(app)
+FIXTURE = Path(__file__).parent / "fixtures" / "test_bol.pdf"
+
+
+def test_memory_tier_evicts_least_recently_used_by_size():
+    cache = ResultCache(max_memory_bytes=60)
+    cache.set("a", {"v": "x" * 20})
+    cache.set("b", {"v": "y" * 20})
+    assert cache.get("a") is not None  # "a" is now most recently used
+
+    cache.set("c", {"v": "z" * 20})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": "x" * 20}
+    assert cache.get("c") == {"v": "z" * 20}
+    assert cache.memory_bytes <= 60
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    db = str(tmp_path / "cache.sqlite")
+    ResultCache(max_memory_bytes=1024, db_path=db).set("k", {"status": "completed"})
+
+    fresh = ResultCache(max_memory_bytes=1024, db_path=db)
+    assert fresh.get("k") == {"status": "completed"}
+
+    fresh.invalidate("k")
+    assert ResultCache(max_memory_bytes=1024, db_path=db).get("k") is None
+
+
+def test_cache_key_covers_model_and_pipeline_version():
+    base = dict(content_sha256="abc", schema="bol_v1", model="mock", pipeline_version="1")
+    assert make_cache_key(**base) == make_cache_key(**base)
+    assert make_cache_key(**base) != make_cache_key(**{**base, "model": "gpt-4o"})
+    assert make_cache_key(**base) != make_cache_key(**{**base, "pipeline_version": "2"})
+
+
+@pytest.mark.integration
+def test_resubmitted_file_is_served_from_cache(monkeypatch):
+    calls = []
+
+    def fake_ocr(*args, **kwargs):
+        return {"text": "", "timings_ms": {"ocr_ms": 0}}
+
+    def counting_pdf_text(path):
+        calls.append(path)
+        return extract_text_from_pdf(path)
+
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.extract_text_from_file_ocr", fake_ocr)
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.extract_text_from_pdf", counting_pdf_text)
+
+    def post(query: str):
+        with FIXTURE.open("rb") as f:
+            files = {"file": ("test_bol.pdf", f, "application/pdf")}
+            return client.post(f"/v1/extractions{query}", data={"schema_name": "bol_v1"}, files=files)
+
+    first = post("?refresh_cache=true")
+    assert first.status_code == 200, first.text
+    assert first.headers["X-Cache"] == "MISS"
+
+    second = post("")
+    assert second.status_code == 200, second.text
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json()["meta"]["timings_ms"]["cache_hit"] == 1
+    assert second.json()["data"] == first.json()["data"]
+    assert len(calls) == 1
+
+    third = post("?no_cache=true")
+    assert third.headers["X-Cache"] == "MISS"
+    assert len(calls) == 2
@@ -0,0 +1,93 @@
+from backend.core.pipeline.bol_extract import extract_bol_sync
+from backend.core.rules import extract_rules, fill_freight_class
+from helpers import RecordingLLM, text_pdf
+
+
+TEXT = """STRAIGHT BILL OF LADING
+BOL #: 7781-22        PRO No. 554433221
+Ship Date: 03/14/2024     Date: 03/15/2024
+P.O. # 4500123, PO: 4500124
+SHIP FROM
+Acme Widgets
+12 Main St, Dallas, TX 75201
+SHIP TO
+Globex Corp
+Saint Paul, MN 55101-1234
+Qty  Description            Weight   Freight Class: 77.5
+"""
+
+
+def test_rules_find_identifiers_dates_and_locations():
+    rules = extract_rules(TEXT)
+
+    assert rules.values["bol_number"] == "7781-22"
+    assert rules.values["pro_number"] == "554433221"
+    assert rules.values["po_numbers"] == ["4500123", "4500124"]
+    # The labelled ship date beats the generic "Date:"
+    assert rules.values["shipment_date"] == "2024-03-14"
+    assert rules.confidences["shipment_date"] >= 0.9
+    assert rules.values["origin"] == {"city": "Dallas", "state": "TX", "postal_code": "75201"}
+    assert rules.values["destination"] == {"city": "Saint Paul", "state": "MN", "postal_code": "55101"}
+    assert rules.freight_classes == ["77.5"]
+
+
+def test_weak_and_conflicting_hits_fall_below_threshold():
+    rules = extract_rules("BOL-889977\nBOL #: A-1\nBOL #: B-2\nDallas, TX 75201", min_confidence=0.8)
+
+    # Bare token, two conflicting labels, and an address outside any section
+    assert rules.values == {}
+
+
+def test_single_freight_class_fills_line_items():
+    rules = extract_rules("Class: 85")
+    payload = {"line_items": [{"description": "Pallets"}, {"description": "Crates", "freight_class": "70"}]}
+
+    filled = fill_freight_class(payload, rules)
+
+    assert [i["freight_class"] for i in filled["line_items"]] == ["85", "70"]
+
+
+def test_rules_narrow_the_llm_prompt(tmp_path):
+    pdf = text_pdf(tmp_path / "bol.pdf", [TEXT])
+    llm = RecordingLLM(
+        {
+            "bol_number": "WRONG",
+            "shipper": {"name": "Acme Widgets"},
+            "line_items": [{"description": "Widgets"}],
+            "confidence": 0.8,
+        }
+    )
+
+    result = extract_bol_sync(schema="bol_v1", file_path=pdf, llm=llm)
+
+    request = llm.requests[0]
+    assert request.known_fields["bol_number"] == "7781-22"
+    assert "bol_number" not in request.missing_fields
+    assert "shipper" in request.missing_fields
+    assert result.data.bol_number == "7781-22"
+    assert result.data.shipper.name == "Acme Widgets"
+    assert result.data.line_items[0].freight_class == "77.5"
+    assert result.meta.rule_fields["pro_number"] == 0.9
+    assert "rules_ms" in result.meta.timings_ms
+
+
+def test_rule_lists_add_to_llm_lists(tmp_path):
+    pdf = text_pdf(tmp_path / "bol.pdf", [TEXT.replace(", PO: 4500124", "")])
+    llm = RecordingLLM({"bol_number": "7781-22", "po_numbers": ["4500120", "4500123", "4500125"], "confidence": 0.8})
+
+    result = extract_bol_sync(schema="bol_v1", file_path=pdf, llm=llm)
+
+    assert llm.requests[0].known_fields["po_numbers"] == ["4500123"]
+    assert result.data.po_numbers == ["4500120", "4500123", "4500125"]
+
+
+def test_covered_required_fields_skip_the_llm(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.core.pipeline.prefill.RULES_REQUIRED_FIELDS", ("bol_number", "shipment_date"))
+    pdf = text_pdf(tmp_path / "bol.pdf", [TEXT])
+
+    result = extract_bol_sync(schema="bol_v1", file_path=pdf, llm=RecordingLLM())
+
+    assert result.validation.is_valid
+    assert result.meta.llm_skipped
+    assert result.data.bol_number == "7781-22"
+    assert result.data.confidence == 0.85  # lowest rule confidence
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import fitz
+import pytest
+
+from backend.core.llm.mock import MockLLMClient
+from backend.core.pipeline.bol_extract import extract_bol_sync
+from backend.core.text_quality import score_page_text
+
+FIXTURE = Path(__file__).parent / "fixtures" / "test_bol.pdf"
+
+GOOD_PAGE = "STRAIGHT BILL OF LADING\nShipper: ABC Logistics\nConsignee: XYZ Retail\nCarrier: TForce\nWeight 1200 lb\n"
+GARBAGE_PAGE = "ÃÂ¾Ã¸Â Ã¢â‚¬Å“ ÃÂ© qzxwvt ##%%&& ��  " * 8
+
+
+def test_text_layer_of_fixture_passes():
+    with fitz.open(FIXTURE) as doc:
+        page = doc[0]
+        q = score_page_text(page.get_text(), page=1, page_size=(page.rect.width, page.rect.height))
+
+    assert q.passed
+    assert q.keyword_hits >= 3
+
+
+@pytest.mark.parametrize("text", [" ", "ok", GARBAGE_PAGE])
+def test_empty_or_garbage_text_layers_fail(text):
+    q = score_page_text(text, page=1, page_size=(612, 792))
+    assert not q.passed
+
+
+@pytest.mark.integration
+def test_only_failing_pages_are_ocrd(monkeypatch, tmp_path):
+    def fake_pdf_text(path: str):
+        return {
+            "text": "",
+            "page_count": 3,
+            "method": "pdf_text",
+            "page_texts": [GOOD_PAGE, " ", GARBAGE_PAGE],
+            "page_sizes": [(612, 792)] * 3,
+            "timings_ms": {"text_extraction_ms": 1},
+        }
+
+    ocr_calls = []
+
+    def fake_ocr(path: str, *, pages=None, **kwargs):
+        ocr_calls.append(pages)
+        return {
+            "text": "",
+            "page_texts": [f"OCR PAGE {n}" for n in pages],
+            "page_sources": ["embedded"] * len(pages),
+            "timings_ms": {"ocr_ms": 5},
+        }
+
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.extract_text_from_pdf", fake_pdf_text)
+    monkeypatch.setattr("backend.core.pipeline.bol_extract.extract_text_from_file_ocr", fake_ocr)
+
+    pdf_path = tmp_path / "sample.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 fake")
+    result = extract_bol_sync(schema="bol_v1", file_path=str(pdf_path), llm=MockLLMClient())
+
+    assert ocr_calls == [[2, 3]]
+    assert result.meta.method == "pdf_text+ocr"
+    assert [(d.page, d.source, d.ocr_source) for d in result.meta.page_decisions] == [
+        (1, "pdf_text", None),
+        (2, "ocr", "embedded"),
+        (3, "ocr", "embedded"),
+    ]
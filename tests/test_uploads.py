@@ -0,0 +1,61 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.middleware import RequestSizeLimitMiddleware
+from backend.core.uploads import EmptyUpload, UploadTooLarge, spool_stream
+from backend.main import app
+
+
+def test_spool_stream_hashes_while_copying(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.core.uploads.UPLOAD_SPOOL_DIR", str(tmp_path))
+    payload = b"%PDF-1.4 " + b"x" * (3 * 1024 * 1024)  # several chunks
+
+    upload = asyncio.run(spool_stream(io.BytesIO(payload), suffix=".pdf", max_bytes=len(payload)))
+
+    assert upload.path.startswith(str(tmp_path)) and upload.path.endswith(".pdf")
+    assert upload.size == len(payload)
+    assert upload.sha256 == hashlib.sha256(payload).hexdigest()
+    with open(upload.path, "rb") as f:
+        assert f.read() == payload
+
+
+def test_spool_stream_stops_at_limit_and_leaves_nothing_behind(tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.core.uploads.UPLOAD_SPOOL_DIR", str(tmp_path))
+
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(spool_stream(io.BytesIO(b"x" * (2 * 1024 * 1024 + 1)), suffix=".pdf", max_bytes=2 * 1024 * 1024))
+    with pytest.raises(EmptyUpload):
+        asyncio.run(spool_stream(io.BytesIO(b""), suffix=".pdf", max_bytes=1024))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_extraction_rejects_upload_over_limit(monkeypatch):
+    monkeypatch.setattr("backend.api.routes.extractions.MAX_UPLOAD_MB", 1)
+    files = {"file": ("big.pdf", b"x" * (1024 * 1024 + 1), "application/pdf")}
+
+    r = TestClient(app).post("/v1/extractions", files=files)
+
+    assert r.status_code == 413
+    assert "max 1MB" in r.json()["detail"]
+
+
+def test_size_limit_middleware_rejects_on_content_length():
+    reached = []
+    small = FastAPI()
+    small.add_middleware(RequestSizeLimitMiddleware, limits={"/upload": 1024})
+
+    @small.post("/upload")
+    async def upload():
+        reached.append(True)
+        return {}
+
+    client = TestClient(small)
+    assert client.post("/upload", content=b"x" * 2048).status_code == 413
+    assert client.post("/upload", content=b"x" * 512).status_code == 200
+    assert reached == [True]
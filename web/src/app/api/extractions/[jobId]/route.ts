@@ -7,13 +7,17 @@ function getBackendUrl(): string {
   return process.env.BACKEND_URL ?? "http://127.0.0.1:8000";
 }
 
-export async function GET(_req: Request, ctx: { params: Promise<{ jobId: string }> }) {
+export async function GET(req: Request, ctx: { params: Promise<{ jobId: string }> }) {
   const backendUrl = getBackendUrl();
   const { jobId } = await ctx.params;
 
+  // Forward ?wait= so long-polls are held by the backend, not by this proxy
+  const wait = new URL(req.url).searchParams.get("wait");
+  const query = wait ? `?wait=${encodeURIComponent(wait)}` : "";
+
   let upstream: Response;
   try {
-    upstream = await fetch(`${backendUrl}/v1/extractions/${encodeURIComponent(jobId)}`, {
+    upstream = await fetch(`${backendUrl}/v1/extractions/${encodeURIComponent(jobId)}${query}`, {
       method: "GET",
       headers: { accept: "application/json" },
     });
@@ -52,8 +52,9 @@ export async function startExtraction({ schemaName, file, asyncMode }: StartExtr
   return { mode: "sync", response: json as ExtractionResponse, requestId };
 }
 
-export async function getExtractionJob(jobId: string): Promise<JobGetResponse> {
-  const r = await fetch(`/api/extractions/${encodeURIComponent(jobId)}`, {
+export async function getExtractionJob(jobId: string, waitSeconds = 0): Promise<JobGetResponse> {
+  const query = waitSeconds > 0 ? `?wait=${encodeURIComponent(waitSeconds)}` : "";
+  const r = await fetch(`/api/extractions/${encodeURIComponent(jobId)}${query}`, {
     method: "GET",
     cache: "no-store",
   });
@@ -67,20 +68,27 @@ export async function getExtractionJob(jobId: string): Promise<JobGetResponse> {
   return json as JobGetResponse;
 }
 
+/**
+ * Wait for a job using long-polling: each request is held by the backend
+ * (`?wait=`) until the job completes or fails, so a finished job is seen
+ * immediately with a handful of requests instead of a tight poll loop.
+ */
 export async function pollExtractionJob(
   jobId: string,
   opts?: {
     timeoutMs?: number;
-    intervalMs?: number;
+    waitSeconds?: number;
     onStatus?: (status: JobStatus) => void;
   },
 ): Promise<ExtractionResponse> {
   const timeoutMs = opts?.timeoutMs ?? 25_000;
-  const intervalMs = opts?.intervalMs ?? 750;
+  const waitSeconds = opts?.waitSeconds ?? 20;
   const start = Date.now();
 
   for (;;) {
-    const rec = await getExtractionJob(jobId);
+    const remainingMs = timeoutMs - (Date.now() - start);
+    const wait = Math.max(0, Math.min(waitSeconds, Math.floor(remainingMs / 1000)));
+    const rec = await getExtractionJob(jobId, wait);
     opts?.onStatus?.(rec.status);
 
     if (rec.status === "failed") {
@@ -98,7 +106,10 @@ export async function pollExtractionJob(
       throw new Error("Timed out waiting for extraction job");
     }
 
-    await sleep(intervalMs);
+    if (wait === 0) {
+      // Less than a second left: one last short pause before the final check
+      await sleep(250);
+    }
   }
 }
 
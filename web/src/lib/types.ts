@@ -4,11 +4,21 @@ export type APIValidation = {
   warnings: string[];
 };
 
+export type APIPageDecision = {
+  page: number;
+  score: number;
+  source: "pdf_text" | "ocr";
+  ocr_source: string | null;
+  ocr_dpi?: number | null;
+  ocr_confidence?: number | null;
+};
+
 export type APIMeta = {
   request_id: string;
   method: string;
   page_count: number | null;
   timings_ms: Record<string, number>;
+  page_decisions?: APIPageDecision[] | null;
 };
 
 export type ExtractionResponse = {